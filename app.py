@@ -1,10 +1,20 @@
 import streamlit as st
 from utils.favicon import set_config
 from utils.menu import menu
+from mydb import create_table
+
+
+@st.cache_resource
+def init_database():
+    """Cria/migra o banco uma vez por processo do servidor (ver run.py)."""
+    create_table()
+
 
 # Configurar a página inicial
 set_config(title="Home")
 
+init_database()
+
 # Inicializar variáveis de sessão (para compatibilidade com código existente)
 if "role" not in st.session_state:
     st.session_state.role = "user"
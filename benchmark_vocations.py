@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Benchmark da resolução/filtragem de vocações com itens sintéticos.
+
+Compara o laço antigo das páginas (iterrows + df.at para os padrões por
+categoria e apply(is_allowed_for_vocation) no filtro) com a versão
+vetorizada de utils.vocation sobre a máscara de vocações
+(resolve_vocation_masks + vocation_mask, um AND bit a bit).
+
+Uso:
+    python benchmark_vocations.py [--sizes 10000 100000] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from utils.vocation import (
+    ALL_VOCATIONS, vocations_to_mask, mask_to_vocations,
+    resolve_vocation_masks, vocation_mask,
+)
+
+CATEGORIES = [
+    "Helmets", "Armors", "Legs", "Boots", "Shields", "Spellbooks",
+    "Amulets_and_Necklaces", "Rings", "Quivers", "Wands", "Rods",
+    "Axes", "Clubs", "Swords", "Fist_Fighting_Weapons", "Throwing_Weapons",
+]
+
+
+def synthetic_items(size, seed=0):
+    """
+    DataFrame com item_name, category, vocations (metade sem requisito) e a
+    vocation_mask correspondente (no app ela é calculada na escrita do item).
+    """
+    rng = random.Random(seed)
+    names, categories, vocations = [], [], []
+    for i in range(size):
+        category = rng.choice(CATEGORIES)
+        names.append(f"{'Quiver' if rng.random() < 0.02 else 'Item'} {i}")
+        categories.append(category)
+        if rng.random() < 0.5:
+            vocations.append([])
+        else:
+            vocations.append(sorted(rng.sample(ALL_VOCATIONS, rng.randint(1, 2))))
+    return pd.DataFrame({
+        "item_name": names, "category": categories, "vocations": vocations,
+        "vocation_mask": [vocations_to_mask(vocs) for vocs in vocations],
+    })
+
+
+def legacy_resolve(df):
+    """Laço antigo de itens_por_level (padrões por categoria, linha a linha)."""
+    df = df.copy()
+    for idx, row in df.iterrows():
+        if row['vocations']:
+            continue
+        category = row['category']
+        if 'quiver' in row['item_name'].lower() or category == 'Quivers':
+            df.at[idx, 'vocations'] = ['paladins']
+        elif category in ['Clubs', 'Axes', 'Swords']:
+            df.at[idx, 'vocations'] = ['knights']
+        elif category == 'Rods':
+            df.at[idx, 'vocations'] = ['druids']
+        elif category == 'Wands':
+            df.at[idx, 'vocations'] = ['sorcerers']
+        elif category == 'Throwing_Weapons':
+            df.at[idx, 'vocations'] = ['paladins']
+        elif category == 'Fist_Fighting_Weapons':
+            df.at[idx, 'vocations'] = ['monks']
+    return df
+
+
+def legacy_filter(df, vocation):
+    """Filtro antigo de itens_por_level: apply com uma função Python por linha."""
+    def is_allowed_for_vocation(vocations_list, vocation):
+        if not vocations_list or len(vocations_list) == 0:
+            return True
+        try:
+            if vocation in vocations_list:
+                return True
+            vocation_singular = vocation[:-1] if vocation.endswith('s') else vocation
+            for voc in vocations_list:
+                if voc == vocation:
+                    return True
+                if voc == vocation_singular:
+                    return True
+                if voc + 's' == vocation:
+                    return True
+            return False
+        except Exception:
+            return True
+    return df[df['vocations'].apply(lambda x: is_allowed_for_vocation(x, vocation))]
+
+
+def vectorized_resolve(df):
+    df = df.copy()
+    df['vocation_mask'] = resolve_vocation_masks(df['vocation_mask'], df['item_name'], df['category'])
+    return df
+
+
+def vectorized_filter(df, vocation):
+    return df[vocation_mask(df['vocation_mask'], vocation)]
+
+
+def best_of(func, repeat):
+    """Menor tempo (s) de 'repeat' execuções e o último resultado."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'itens':>8} {'etapa':<10} {'antigo':>10} {'vetorizado':>11} {'ganho':>7}")
+    for size in args.sizes:
+        df = synthetic_items(size)
+
+        old_time, old_df = best_of(lambda: legacy_resolve(df), args.repeat)
+        new_time, new_df = best_of(lambda: vectorized_resolve(df), args.repeat)
+        expected = [vocs or ALL_VOCATIONS for vocs in old_df['vocations']]
+        decoded = [mask_to_vocations(mask) for mask in new_df['vocation_mask']]
+        assert [sorted(v) for v in expected] == [sorted(v) for v in decoded], "resultados diferentes"
+        print(f"{size:>8} {'resolver':<10} {old_time * 1000:>8.1f}ms {new_time * 1000:>9.1f}ms {old_time / new_time:>6.1f}x")
+
+        old_time, old_filtered = best_of(lambda: legacy_filter(old_df, 'knights'), args.repeat)
+        new_time, new_filtered = best_of(lambda: vectorized_filter(new_df, 'knights'), args.repeat)
+        assert old_filtered.index.equals(new_filtered.index), "filtros diferentes"
+        print(f"{size:>8} {'filtrar':<10} {old_time * 1000:>8.1f}ms {new_time * 1000:>9.1f}ms {old_time / new_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -190,7 +190,7 @@ def fix_scraping():
                         st.write("  - Processado e salvo com sucesso!")
                     
                     # Contar imagens reutilizadas
-                    if image_exists(item_name):
+                    if image_exists(item_name, category=cat):
                         images_skipped += 1
                 except Exception as e:
                     st.error(f"Erro ao salvar {item_name}: {str(e)}")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+Manutenção do store de sprites (static/sprites).
+
+Uso:
+    python maintain_sprites.py migrate [--workers N]
+        Coloca no store todos os sprites das pastas antigas, troca as cópias
+        repetidas por hard links e atualiza o banco numa única transação.
+    python maintain_sprites.py verify [--workers N] [--repair]
+        Confere o hash de todos os arquivos do manifesto.
+    python maintain_sprites.py gc [--workers N] [--dry-run] [--legacy]
+        Remove do store os arquivos que nenhum item/criatura usa.
+        Com --legacy, remove também as imagens sem uso das pastas antigas.
+    python maintain_sprites.py atlas [--force]
+        Atualiza as folhas do atlas de sprites (static/atlas).
+    python maintain_sprites.py thumbs [--workers N] [--sizes 32 128]
+        Gera de uma vez as miniaturas dos sprites (static/thumbs).
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mydb import (
+    create_table, read_all_items, read_all_creatures, read_all_sprites,
+    read_referenced_sprite_hashes, apply_sprite_changes,
+)
+from services.sprite_atlas import build_atlas
+from utils.image_index import (
+    IMAGE_ROOT, LEGACY_CREATURE_IMAGE_ROOT, IMAGE_EXTENSIONS,
+    find_image, item_image_folders, creature_image_folders, invalidate_image_index,
+)
+from utils.core import data_url_to_binary
+from utils.thumbnails import generate_thumbnails
+from utils.sprite_store import (
+    put_bytes, put_file, file_hash, dedupe_into_store, verify_file, iter_store_files,
+)
+
+# Arquivos do store mais novos que isso não são considerados órfãos pelo gc
+# (podem ter acabado de ser gravados por um scraping em andamento)
+ORPHAN_GRACE_SECONDS = 60 * 60
+
+
+def legacy_image_files():
+    """Lista todas as imagens das pastas antigas (utils/img e utils/creature_img)."""
+    files = []
+    for root in (IMAGE_ROOT, LEGACY_CREATURE_IMAGE_ROOT):
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS:
+                    files.append(os.path.join(dirpath, filename))
+    return files
+
+
+def _ingest_record(record):
+    """
+    Coloca no store o sprite de um registro (item ou criatura).
+    Retorna (hash, caminho no store, tamanho, novo image_path) ou None.
+    """
+    image_path = record.get("image_path") or ""
+
+    if image_path.startswith("data:"):
+        # O conteúdo do data URL vai para o store e o banco passa a
+        # guardar só o caminho (servido como arquivo estático)
+        content, ext = data_url_to_binary(image_path)
+        if not content:
+            return None
+        digest, path = put_bytes(content, ext)
+        return digest, path, len(content), path
+
+    source = image_path if image_path and os.path.exists(image_path) else None
+    if source is None:
+        if record["kind"] == "item":
+            source = find_image(record["name"], item_image_folders(record.get("category")))
+        else:
+            source = find_image(record["name"], creature_image_folders())
+    if source is None:
+        return None
+
+    digest, path = put_file(source)
+    return digest, path, os.path.getsize(path), path
+
+
+def _dedupe_legacy_file(src):
+    """Liga um arquivo antigo ao store. Retorna (hash, caminho no store, bytes liberados)."""
+    digest, path = put_file(src)
+    already_shared = os.path.samefile(src, path)
+    if dedupe_into_store(src, path) and not already_shared:
+        return digest, path, os.path.getsize(path)
+    return digest, path, 0
+
+
+def migrate(workers):
+    create_table()
+    records = (
+        [{"kind": "item", "name": i["item_name"], **i} for i in read_all_items()]
+        + [{"kind": "creature", "name": c["creature_name"], **c} for c in read_all_creatures()]
+    )
+    print(f"Migrando sprites de {len(records)} registros...")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        ingested = list(pool.map(_ingest_record, records))
+        legacy_files = legacy_image_files()
+        deduped = list(pool.map(_dedupe_legacy_file, legacy_files))
+
+    sprites = {}
+    item_updates, creature_updates = [], []
+    missing = 0
+    for record, result in zip(records, ingested):
+        if result is None:
+            missing += 1
+            continue
+        digest, path, size, new_image_path = result
+        sprites[digest] = (digest, path, size)
+        update = (record["name"], digest, new_image_path)
+        (item_updates if record["kind"] == "item" else creature_updates).append(update)
+
+    freed = 0
+    for digest, path, saved in deduped:
+        sprites.setdefault(digest, (digest, path, os.path.getsize(path)))
+        freed += saved
+
+    apply_sprite_changes(
+        sprites=sprites.values(),
+        item_updates=item_updates,
+        creature_updates=creature_updates,
+    )
+    invalidate_image_index()
+
+    print(f"\nMigração concluída!")
+    print(f"Sprites únicos no store: {len(sprites)}")
+    print(f"Itens atualizados: {len(item_updates)}")
+    print(f"Criaturas atualizadas: {len(creature_updates)}")
+    print(f"Registros sem imagem local: {missing}")
+    print(f"Arquivos antigos ligados ao store: {len(legacy_files)} ({freed / 1024:.1f} KB liberados)")
+
+
+def verify(workers, repair=False):
+    sprites = read_all_sprites()
+    print(f"Verificando {len(sprites)} sprites...")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statuses = list(pool.map(lambda s: verify_file(s["path"], s["hash"]), sprites))
+
+    broken = [(s, status) for s, status in zip(sprites, statuses) if status != "ok"]
+    for sprite, status in broken:
+        print(f"[{status.upper()}] {sprite['hash']} -> {sprite['path']}")
+
+    if repair and broken:
+        # Remove os arquivos corrompidos; o próximo scraping baixa de novo
+        for sprite, status in broken:
+            if status == "corrupt":
+                os.remove(sprite["path"])
+        apply_sprite_changes(removed_hashes=[sprite["hash"] for sprite, _ in broken])
+        print(f"{len(broken)} sprites retirados do manifesto.")
+
+    print(f"\nVerificação concluída: {len(sprites) - len(broken)} ok, {len(broken)} com problema.")
+    return not broken
+
+
+def gc(workers, dry_run=False, legacy=False):
+    referenced = read_referenced_sprite_hashes()
+    manifest = {s["hash"]: s["path"] for s in read_all_sprites()}
+    now = time.time()
+
+    to_delete = []
+    unreferenced = [digest for digest in manifest if digest not in referenced]
+    to_delete.extend(manifest[digest] for digest in unreferenced)
+
+    # Arquivos no store que nem estão no manifesto
+    for digest, path in iter_store_files():
+        if digest not in manifest and now - os.path.getctime(path) > ORPHAN_GRACE_SECONDS:
+            to_delete.append(path)
+
+    if legacy and _has_unmigrated_records():
+        print("Há registros sem sprite_hash: rode 'migrate' antes de usar --legacy.")
+        legacy = False
+
+    if legacy:
+        # Imagens antigas cujo conteúdo nenhum registro usa
+        legacy_files = legacy_image_files()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hashes = list(pool.map(file_hash, legacy_files))
+        to_delete.extend(path for path, digest in zip(legacy_files, hashes) if digest not in referenced)
+
+    freed = sum(os.path.getsize(path) for path in to_delete if os.path.exists(path))
+    for path in to_delete:
+        print(f"[GC] {'(simulação) ' if dry_run else ''}{path}")
+
+    if not dry_run:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_remove_quietly, to_delete))
+        apply_sprite_changes(removed_hashes=unreferenced)
+        invalidate_image_index()
+
+    print(f"\nColeta concluída: {len(to_delete)} arquivos, até {freed / 1024:.1f} KB.")
+
+
+def _has_unmigrated_records():
+    """Verifica se algum registro com imagem ainda não tem sprite_hash."""
+    records = read_all_items() + read_all_creatures()
+    return any(r.get("image_path") and not r.get("sprite_hash") for r in records)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção do store de sprites")
+    parser.add_argument("command", choices=["migrate", "verify", "gc", "atlas", "thumbs"])
+    parser.add_argument("--workers", type=int, default=8, help="Threads usadas em paralelo")
+    parser.add_argument("--repair", action="store_true", help="verify: retira do manifesto os sprites com problema")
+    parser.add_argument("--dry-run", action="store_true", help="gc: só lista o que seria removido")
+    parser.add_argument("--legacy", action="store_true", help="gc: inclui as imagens sem uso das pastas antigas")
+    parser.add_argument("--force", action="store_true", help="atlas: refaz todas as folhas do zero")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32], help="thumbs: tamanhos em pixels")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        migrate(args.workers)
+    elif args.command == "verify":
+        if not verify(args.workers, repair=args.repair):
+            raise SystemExit(1)
+    elif args.command == "gc":
+        gc(args.workers, dry_run=args.dry_run, legacy=args.legacy)
+    elif args.command == "atlas":
+        atlas = build_atlas(force=args.force)
+        print(f"Atlas com {len(atlas['sprites'])} sprites em {len(atlas['sheets'])} folhas.")
+    else:
+        paths = [sprite["path"] for sprite in read_all_sprites()]
+        count = generate_thumbnails(paths, args.sizes, workers=args.workers)
+        print(f"{count} miniaturas prontas.")
+
+
+if __name__ == "__main__":
+    main()
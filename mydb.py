@@ -1,11 +1,94 @@
 import sqlite3
 import json
 import os
-import requests
+import time
 from urllib.parse import urlparse
+from utils.config import (
+    IMAGE_HEDGE_DELAY, IMAGE_FETCH_DEADLINE, IMAGE_FETCH_TIMEOUT,
+    NEGATIVE_CACHE_BASE_TTL, NEGATIVE_CACHE_MAX_TTL, SPRITE_STORE_DIR,
+)
+from utils.image_fetch import hedged_fetch
+from utils.image_index import register_image, find_image
+from utils.sprite_store import put_file, put_bytes
+from utils.field_stats import item_fields, apply_item_fields, stats_row, stats_entry
+from utils.postings import item_postings
+from utils.records import RESISTANCE_ELEMENTS, parse_number
+from utils.vocation import VOCATION_BITS, item_vocation_mask
 
 DB_NAME = "mydb.db"
 
+# Tabelas com contador de geração (ver get_data_generation); os itens usam
+# o feed item_changes
+GENERATION_TABLES = ("criaturas",)
+
+# Quantas alterações o feed de itens (item_changes) guarda
+ITEM_CHANGES_KEEP = 50000
+
+
+def _level_number(value):
+    """Level a partir do valor do infobox (só os dígitos, como extract_level)."""
+    digits = ''.join(c for c in str(value) if c.isdigit())
+    return int(digits) if digits else None
+
+
+def _int_number(value):
+    """Inteiro a partir do valor do infobox ("2,300 gp" -> 2300)."""
+    return parse_number(value, int)
+
+
+def _float_number(value):
+    """Número real a partir do valor do infobox ("108.00 oz" -> 108.0)."""
+    return parse_number(value, float)
+
+
+# Campos do infobox projetáveis com json_extract (ver read_all_items):
+# nome -> (caminhos JSON em ordem de preferência, conversão do valor lido).
+# Vale o primeiro caminho cujo valor tem algum dígito, como nos extratores
+# em Python (extract_level...)
+ITEM_FIELDS = {
+    "level": ((
+        '$."General Properties".Level', '$."Required Level"', '$.Requirements.Level', '$.Lvl', '$.Level',
+    ), _level_number),
+    "armor": (('$."Combat Properties".Armor', '$."Combat Properties".Arm'), _int_number),
+    "attack": (('$."Combat Properties".Attack',), _int_number),
+    "defense": (('$."Combat Properties".Defense',), _int_number),
+    "weight": (('$."General Properties".Weight',), _float_number),
+    "trade_value": ((
+        '$."Trade Properties"."Sell Value"', '$."Trade Properties".Value',
+    ), _int_number),
+    "buy_value": ((
+        '$."Trade Properties"."Bought For"', '$."Trade Properties"."Sold For"',
+    ), _int_number),
+    **{
+        f"res_{element}": ((
+            f'$."Combat Properties".Resists.{element}',
+            f'$."Combat Properties".Resists.{element.capitalize()}',
+        ), _int_number)
+        for element in RESISTANCE_ELEMENTS
+    },
+}
+
+
+def item_field_sql(field):
+    """
+    Expressão SQL que lê o campo do data_json como está gravado (número ou
+    texto, ex.: "108.00 oz"), do primeiro caminho com algum dígito ("None"
+    ou "" passam para o próximo caminho). JSON inválido vira NULL.
+    """
+    paths, _convert = ITEM_FIELDS[field]
+    cases = " ".join(
+        f"WHEN json_extract(data_json, '{path}') GLOB '*[0-9]*' THEN json_extract(data_json, '{path}')"
+        for path in paths
+    )
+    return f"(CASE WHEN json_valid(data_json) THEN (CASE {cases} END) END)"
+
+
+def _typed_field(field, value):
+    """Valor projetado já convertido (None se ausente ou sem número)."""
+    if value is None:
+        return None
+    return ITEM_FIELDS[field][1](value)
+
 
 # ------------------------------------------------------------------------------
 # A) Conexão e (Re)Criação da Tabela
@@ -40,14 +123,328 @@ def create_table():
     )
     """)
 
+    # Estatísticas de sucesso por fonte de imagem (usadas para escolher
+    # qual fonte tentar primeiro no download de sprites)
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS image_sources (
+        source TEXT PRIMARY KEY,
+        successes INTEGER NOT NULL DEFAULT 0,
+        failures INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+
+    # Cache negativo: URLs (imagens e páginas) que falharam recentemente.
+    # 'owner' é o item/criatura que usou a URL e 'source_url' a URL de
+    # origem do registro na época da falha.
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS url_failures (
+        url TEXT PRIMARY KEY,
+        owner TEXT,
+        source_url TEXT,
+        failures INTEGER NOT NULL DEFAULT 0,
+        last_status INTEGER,
+        last_failure REAL,
+        retry_after REAL
+    )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_url_failures_owner ON url_failures(owner)")
+
+    # Manifesto do store de sprites: um registro por conteúdo (hash SHA-256)
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS sprites (
+        hash TEXT PRIMARY KEY,
+        path TEXT NOT NULL,
+        size INTEGER,
+        created_at REAL
+    )
+    """)
+
+    # Bancos antigos não têm a coluna sprite_hash
+    _add_column_if_missing(c, "itens", "sprite_hash", "TEXT")
+    _add_column_if_missing(c, "criaturas", "sprite_hash", "TEXT")
+
+    # URL de origem da imagem (usada no modo de imagens sob demanda)
+    _add_column_if_missing(c, "itens", "image_url", "TEXT")
+    _add_column_if_missing(c, "criaturas", "image_url", "TEXT")
+
+    # Máscara de vocações (utils.vocation), calculada na escrita do item
+    _add_column_if_missing(c, "itens", "vocation_mask", "INTEGER")
+
+    # Contadores de geração: mudam a cada escrita nas tabelas de
+    # GENERATION_TABLES e servem de chave para os caches compartilhados
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    for table in GENERATION_TABLES:
+        c.execute("INSERT OR IGNORE INTO meta (key, value) VALUES (?, 0)", (f"{table}_generation",))
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            c.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_generation_{event.lower()}
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE meta SET value = value + 1 WHERE key = '{table}_generation';
+            END
+            """)
+    # Bancos antigos: o contador de itens foi substituído pelo item_changes
+    for event in ("insert", "update", "delete"):
+        c.execute(f"DROP TRIGGER IF EXISTS itens_generation_{event}")
+    c.execute("DELETE FROM meta WHERE key = 'itens_generation'")
+
+    # Feed de alterações: um registro por item inserido/alterado/removido,
+    # usado pelo catálogo para atualizar só as linhas que mudaram
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS item_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        item_name TEXT NOT NULL,
+        changed_at REAL NOT NULL
+    )
+    """)
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS itens_changes_{event.lower()}
+        AFTER {event} ON itens
+        BEGIN
+            INSERT INTO item_changes (item_name, changed_at)
+            VALUES ({row}.item_name, strftime('%s', 'now'));
+        END
+        """)
+    # Um UPDATE que troca o nome também precisa avisar do nome antigo
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS itens_changes_rename
+    AFTER UPDATE OF item_name ON itens
+    WHEN OLD.item_name IS NOT NEW.item_name
+    BEGIN
+        INSERT INTO item_changes (item_name, changed_at)
+        VALUES (OLD.item_name, strftime('%s', 'now'));
+    END
+    """)
+
+    # Itens gravados antes da coluna (ou por fora do mydb) ficam sem máscara
+    _backfill_vocation_masks(c)
+
+    # Índices de expressão antigos (level/armor): nenhuma consulta filtra por
+    # eles (as faixas de level são resolvidas no catálogo em memória) e toda
+    # escrita pagava para mantê-los
+    c.execute("DROP INDEX IF EXISTS idx_itens_level")
+    c.execute("DROP INDEX IF EXISTS idx_itens_armor")
+
+    # Índice invertido de atributos e proteções (utils.postings): um registro
+    # por (termo, item), gravado junto com o item pelo create/update
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS item_postings (
+        term TEXT NOT NULL,
+        item_name TEXT NOT NULL,
+        value REAL,
+        PRIMARY KEY (term, item_name)
+    )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_item_postings_value ON item_postings(term, value DESC)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_item_postings_item ON item_postings(item_name)")
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS itens_postings_delete
+    AFTER DELETE ON itens
+    BEGIN
+        DELETE FROM item_postings WHERE item_name = OLD.item_name;
+    END
+    """)
+    _backfill_item_postings(c)
+
+    # Mapa de campos dos itens (utils.field_stats), atualizado pelo
+    # create/update/delete de itens; lido pela análise da página de itens
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS field_stats (
+        path TEXT PRIMARY KEY,
+        type TEXT,
+        depth INTEGER,
+        examples TEXT,
+        category_counts TEXT,
+        items INTEGER NOT NULL DEFAULT 0,
+        type_counts TEXT
+    )
+    """)
+    if _add_column_if_missing(c, "field_stats", "type_counts", "TEXT"):
+        # Mapas gravados sem a contagem por tipo são refeitos
+        c.execute("UPDATE meta SET value = 0 WHERE key = 'field_stats_built'")
+    _backfill_field_stats(c)
+
+    # Poda o feed (sempre sobram as ITEM_CHANGES_KEEP alterações mais recentes)
+    c.execute(
+        "DELETE FROM item_changes WHERE seq <= (SELECT MAX(seq) FROM item_changes) - ?",
+        (ITEM_CHANGES_KEEP,)
+    )
+
     conn.commit()
     conn.close()
 
 
+def _add_column_if_missing(cursor, table, column, definition):
+    """Adiciona uma coluna à tabela caso ela ainda não exista (True se adicionou)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+    return False
+
+
+def _backfill_vocation_masks(cursor):
+    """Calcula a máscara de vocações dos itens que ainda não a têm."""
+    cursor.execute("SELECT item_name, category, data_json FROM itens WHERE vocation_mask IS NULL")
+    rows = cursor.fetchall()
+    if not rows:
+        return
+    updates = []
+    for item_name, category, data_json in rows:
+        try:
+            data_dict = json.loads(data_json) if data_json else {}
+        except ValueError:
+            data_dict = {}
+        updates.append((item_vocation_mask(item_name, category, data_dict), item_name))
+    cursor.executemany("UPDATE itens SET vocation_mask = ? WHERE item_name = ?", updates)
+    print(f"[DEBUG DB] Máscara de vocações calculada para {len(updates)} itens")
+
+
+def _write_item_postings(cursor, item_name, data_dict):
+    """Substitui os termos do item no índice invertido (utils.postings)."""
+    cursor.execute("DELETE FROM item_postings WHERE item_name = ?", (item_name,))
+    cursor.executemany(
+        "INSERT INTO item_postings (term, item_name, value) VALUES (?, ?, ?)",
+        [(term, item_name, value) for term, value in item_postings(data_dict)]
+    )
+
+
+def _backfill_item_postings(cursor):
+    """Monta o índice invertido (uma vez) para os itens gravados antes dele."""
+    cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('item_postings_built', 0)")
+    cursor.execute("SELECT value FROM meta WHERE key = 'item_postings_built'")
+    if cursor.fetchone()[0]:
+        return
+    cursor.execute("SELECT item_name, data_json FROM itens")
+    rows = cursor.fetchall()
+    for item_name, data_json in rows:
+        try:
+            data_dict = json.loads(data_json) if data_json else {}
+        except ValueError:
+            data_dict = {}
+        _write_item_postings(cursor, item_name, data_dict)
+    cursor.execute("UPDATE meta SET value = 1 WHERE key = 'item_postings_built'")
+    print(f"[DEBUG DB] Índice invertido de atributos montado para {len(rows)} itens")
+
+
+def _load_data_json(data_json):
+    """data_json -> dict (vazio se ausente ou inválido)."""
+    try:
+        return json.loads(data_json) if data_json else {}
+    except ValueError:
+        return {}
+
+
+def _update_field_stats(cursor, changes):
+    """
+    Aplica ao mapa de campos as alterações [(categoria, data_dict, delta)]
+    (delta 1 = item gravado, -1 = versão antiga/item removido), lendo e
+    regravando só os caminhos envolvidos.
+    """
+    paths = set()
+    for _, data_dict, _ in changes:
+        paths.update(item_fields(data_dict))
+    if not paths:
+        return
+    paths = list(paths)
+    placeholders = ", ".join("?" for _ in paths)
+    cursor.execute(f"""
+        SELECT path, type, depth, examples, category_counts, items, type_counts
+        FROM field_stats WHERE path IN ({placeholders})
+    """, paths)
+    stats = dict(stats_entry(row) for row in cursor.fetchall())
+    for category, data_dict, delta in changes:
+        apply_item_fields(stats, category, data_dict, delta)
+
+    removed = [(path,) for path in paths if path not in stats]
+    cursor.executemany("DELETE FROM field_stats WHERE path = ?", removed)
+    cursor.executemany("""
+        INSERT INTO field_stats (path, type, depth, examples, category_counts, items, type_counts)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            type = excluded.type,
+            depth = excluded.depth,
+            examples = excluded.examples,
+            category_counts = excluded.category_counts,
+            items = excluded.items,
+            type_counts = excluded.type_counts
+    """, [stats_row(path, entry) for path, entry in stats.items()])
+
+
+def _discount_deleted_items(cursor, where, params):
+    """
+    Desconta do mapa de campos os itens que o DELETE com 'where' vai remover.
+    Chamar dentro da transação de escrita (BEGIN IMMEDIATE) do DELETE.
+    """
+    cursor.execute(f"SELECT category, data_json FROM itens WHERE {where}", params)
+    _update_field_stats(cursor, [
+        (category, _load_data_json(data_json), -1) for category, data_json in cursor.fetchall()
+    ])
+
+
+def _backfill_field_stats(cursor):
+    """Monta o mapa de campos (uma vez) a partir dos itens já gravados."""
+    cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('field_stats_built', 0)")
+    cursor.execute("SELECT value FROM meta WHERE key = 'field_stats_built'")
+    if cursor.fetchone()[0]:
+        return
+    cursor.execute("SELECT category, data_json FROM itens")
+    rows = cursor.fetchall()
+    stats = {}
+    for category, data_json in rows:
+        apply_item_fields(stats, category, _load_data_json(data_json), 1)
+    cursor.execute("DELETE FROM field_stats")
+    cursor.executemany(
+        "INSERT INTO field_stats (path, type, depth, examples, category_counts, items, type_counts) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [stats_row(path, entry) for path, entry in stats.items()]
+    )
+    cursor.execute("UPDATE meta SET value = 1 WHERE key = 'field_stats_built'")
+    print(f"[DEBUG DB] Mapa de campos montado para {len(rows)} itens ({len(stats)} campos)")
+
+
+def read_field_stats():
+    """
+    Mapa de campos dos itens, dos campos mais comuns para os menos comuns.
+
+    Returns:
+        list: dicionários {"path", "type", "depth", "examples", "categories"
+        ({categoria: itens}), "types" ({tipo: itens}), "items"}
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("""
+        SELECT path, type, depth, examples, category_counts, items, type_counts
+        FROM field_stats ORDER BY items DESC, path
+    """)
+    rows = c.fetchall()
+    conn.close()
+    return [{"path": path, **entry} for path, entry in map(stats_entry, rows)]
+
+
+def get_data_generation(table="criaturas"):
+    """
+    Retorna o contador de geração da tabela (ver GENERATION_TABLES).
+    O valor só muda quando a tabela é alterada (triggers em create_table).
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT value FROM meta WHERE key = ?", (f"{table}_generation",))
+    row = c.fetchone()
+    conn.close()
+    return row[0] if row else 0
+
+
 # ------------------------------------------------------------------------------
 # B) CRUD (Create, Read, Update, Delete)
 # ------------------------------------------------------------------------------
-def create_item(item_name, category, image_path, data_dict):
+def create_item(item_name, category, image_path, data_dict, vocation_mask=None):
     """
     Insere um novo item na tabela 'itens'.
     - item_name: Nome do item (PK).
@@ -55,17 +452,24 @@ def create_item(item_name, category, image_path, data_dict):
     - image_path: caminho local da imagem.
     - data_dict: dicionário com outros dados do item (será armazenado em JSON).
       ex.: {"Def": "2", "Arm": "1", "Weight": "42.0"}
+    - vocation_mask: máscara de vocações já calculada (ex.: ItemRecord);
+      se None, é calculada a partir de data_dict.
     """
     conn = create_connection()
     c = conn.cursor()
 
     data_json = json.dumps(data_dict, ensure_ascii=False)
+    if vocation_mask is None:
+        vocation_mask = item_vocation_mask(item_name, category, data_dict)
 
     # INSERT simples. Caso o item_name já exista, gera erro de chave primária.
     c.execute("""
-        INSERT OR IGNORE INTO itens (item_name, category, image_path, data_json)
-        VALUES (?, ?, ?, ?)
-    """, (item_name, category, image_path, data_json))
+        INSERT OR IGNORE INTO itens (item_name, category, image_path, data_json, vocation_mask)
+        VALUES (?, ?, ?, ?, ?)
+    """, (item_name, category, image_path, data_json, vocation_mask))
+    if c.rowcount:
+        _write_item_postings(c, item_name, data_dict)
+        _update_field_stats(c, [(category, data_dict, 1)])
 
     conn.commit()
     conn.close()
@@ -74,13 +478,13 @@ def create_item(item_name, category, image_path, data_dict):
 def read_item(item_name):
     """
     Lê e retorna um registro com item_name específico.
-    Retorna um dicionário: {"item_name", "category", "image_path", "data_json"}
+    Retorna um dicionário: {"item_name", "category", "image_path", "data_json", "sprite_hash", "image_url", "vocation_mask"}
     ou None se não existir.
     """
     conn = create_connection()
     c = conn.cursor()
 
-    c.execute("SELECT item_name, category, image_path, data_json FROM itens WHERE item_name = ?", (item_name,))
+    c.execute("SELECT item_name, category, image_path, data_json, sprite_hash, image_url, vocation_mask FROM itens WHERE item_name = ?", (item_name,))
     row = c.fetchone()
     conn.close()
 
@@ -90,18 +494,25 @@ def read_item(item_name):
             "category":  row[1],
             "image_path": row[2],
             "data_json": row[3],
+            "sprite_hash": row[4],
+            "image_url": row[5],
+            "vocation_mask": row[6],
         }
     return None
 
 
-def update_item(item_name, category=None, image_path=None, data_dict=None):
+def update_item(item_name, category=None, image_path=None, data_dict=None, vocation_mask=None):
     """
     Atualiza os campos de um item existente, exceto o nome, que é a PK.
     Se algum parâmetro for None, não atualiza aquele campo.
+    vocation_mask: máscara já calculada para a nova categoria/dados; se None,
+    é recalculada quando categoria ou dados mudam.
     Retorna o número de linhas afetadas (0 se não encontrado).
     """
     fields = []
     values = []
+    # Dados novos: o índice invertido do item é regravado na mesma transação
+    new_data = data_dict
 
     if category is not None:
         fields.append("category = ?")
@@ -119,24 +530,53 @@ def update_item(item_name, category=None, image_path=None, data_dict=None):
     if not fields:
         return 0  # Nada a atualizar
 
+    # Categoria e dados definem a máscara de vocações: recalcula se mudaram
+    if vocation_mask is not None:
+        fields.append("vocation_mask = ?")
+        values.append(vocation_mask)
+    elif category is not None or data_dict is not None:
+        existing = read_item(item_name)
+        if existing is not None:
+            if category is None:
+                category = existing["category"]
+            if data_dict is None:
+                data_dict = json.loads(existing["data_json"]) if existing["data_json"] else {}
+            fields.append("vocation_mask = ?")
+            values.append(item_vocation_mask(item_name, category, data_dict))
+
     query_set = ", ".join(fields)
     query = f"UPDATE itens SET {query_set} WHERE item_name = ?"
     values.append(item_name)
 
     conn = create_connection()
     c = conn.cursor()
+    # Transação de escrita antes de ler a versão anterior e o mapa de
+    # campos: outro processo não altera as mesmas contagens no meio
+    c.execute("BEGIN IMMEDIATE")
+    # Versão anterior (categoria e dados) para descontar do mapa de campos
+    c.execute("SELECT category, data_json FROM itens WHERE item_name = ?", (item_name,))
+    previous = c.fetchone()
     c.execute(query, tuple(values))
-    conn.commit()
     affected = c.rowcount
+    if affected and new_data is not None:
+        _write_item_postings(c, item_name, new_data)
+    if affected and previous is not None and (new_data is not None or category is not None):
+        old_category, old_data = previous[0], _load_data_json(previous[1])
+        _update_field_stats(c, [
+            (old_category, old_data, -1),
+            (category if category is not None else old_category,
+             new_data if new_data is not None else old_data, 1),
+        ])
+    conn.commit()
     conn.close()
 
     return affected
 
 
-def upsert_item(item_name, category, image_path, data_dict):
+def upsert_item(item_name, category, image_path, data_dict, vocation_mask=None):
     """
     upsert_item: insere (create) se não existir, ou atualiza (update) se já existir
-    e tiver diferenças.
+    e tiver diferenças. vocation_mask: máscara já calculada (opcional).
     """
     # Verificação de segurança: não permite itens com nome inválido
     if not item_name or not item_name.strip() or item_name.lower() == "none":
@@ -147,7 +587,7 @@ def upsert_item(item_name, category, image_path, data_dict):
 
     if existing is None:
         # Se não existe, faz CREATE
-        create_item(item_name, category, image_path, data_dict)
+        create_item(item_name, category, image_path, data_dict, vocation_mask)
         print(f"[CREATE] Novo item criado: {item_name}")
     else:
         # Já existe. Vamos verificar se houve alteração.
@@ -174,7 +614,7 @@ def upsert_item(item_name, category, image_path, data_dict):
             need_update = True
         
         if need_update:
-            update_item(item_name, category, image_path, data_dict)
+            update_item(item_name, category, image_path, data_dict, vocation_mask)
             print(f"[UPDATE] Item '{item_name}' foi modificado e atualizado.")
         else:
             print(f"[NO CHANGE] Item '{item_name}' está igual. Não foi atualizado.")
@@ -187,6 +627,8 @@ def delete_item(item_name):
     """
     conn = create_connection()
     c = conn.cursor()
+    c.execute("BEGIN IMMEDIATE")  # lê e desconta o mapa de campos na mesma transação
+    _discount_deleted_items(c, "item_name = ?", (item_name,))
     c.execute("DELETE FROM itens WHERE item_name = ?", (item_name,))
     conn.commit()
     deleted = c.rowcount
@@ -194,25 +636,156 @@ def delete_item(item_name):
     return deleted
 
 
-def read_all_items():
+def _item_rows(cursor, fields):
+    """Linhas de _item_select(fields) como dicionários (campos já convertidos)."""
+    results = []
+    for row in cursor.fetchall():
+        item = {
+            "item_name": row[0],
+            "category":  row[1],
+            "image_path": row[2],
+            "data_json": row[3],
+            "sprite_hash": row[4],
+            "image_url": row[5],
+            "vocation_mask": row[6],
+        }
+        for field, value in zip(fields, row[7:]):
+            item[field] = _typed_field(field, value)
+        results.append(item)
+    return results
+
+
+def _item_select(fields):
+    """SELECT das colunas de item, com os campos de ITEM_FIELDS pedidos."""
+    columns = ["item_name", "category", "image_path", "data_json", "sprite_hash", "image_url", "vocation_mask"]
+    columns += [item_field_sql(field) for field in fields]
+    return f"SELECT {', '.join(columns)} FROM itens"
+
+
+def read_all_items(fields=()):
     """
     Retorna todos os itens cadastrados, em forma de lista de dicionários.
+    fields: campos de ITEM_FIELDS lidos junto (json_extract), já convertidos.
     """
+    fields = tuple(fields)
     conn = create_connection()
     c = conn.cursor()
-    c.execute("SELECT item_name, category, image_path, data_json FROM itens")
-    rows = c.fetchall()
+    c.execute(_item_select(fields))
+    results = _item_rows(c, fields)
     conn.close()
+    return results
 
+
+def read_items(item_names, fields=()):
+    """
+    Retorna os itens com os nomes informados (mesmo formato de read_all_items).
+    Nomes que não existem no banco são ignorados.
+    """
+    item_names = list(item_names)
+    fields = tuple(fields)
     results = []
-    for row in rows:
-        results.append({
+    conn = create_connection()
+    c = conn.cursor()
+    # Em blocos, para não passar do limite de parâmetros do SQLite
+    for start in range(0, len(item_names), 500):
+        chunk = item_names[start:start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        c.execute(f"{_item_select(fields)} WHERE item_name IN ({placeholders})", chunk)
+        results.extend(_item_rows(c, fields))
+    conn.close()
+    return results
+
+
+def read_posting_terms():
+    """Termos do índice invertido e quantos itens dão cada um: [(termo, itens)]."""
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT term, COUNT(*) FROM item_postings GROUP BY term ORDER BY term")
+    terms = c.fetchall()
+    conn.close()
+    return terms
+
+
+def read_top_items_for_term(term, limit=20, category=None, vocation=None):
+    """
+    Itens que dão o atributo/proteção 'term' (utils.postings), do maior
+    valor para o menor (itens sem valor numérico por último).
+
+    Args:
+        term (str): termo normalizado (ex.: "attr:magic level", "res:earth")
+        limit (int): máximo de itens (top-k)
+        category (str, optional): só itens da categoria
+        vocation (str, optional): só itens usáveis pela vocação (ex.: "knights")
+
+    Returns:
+        list: dicionários {"item_name", "category", "image_path", "image_url",
+        "vocation_mask", "value"}
+    """
+    conditions, params = ["p.term = ?"], [term]
+    if category is not None:
+        conditions.append("i.category = ?")
+        params.append(category)
+    if vocation is not None:
+        conditions.append("(i.vocation_mask & ?) != 0")
+        params.append(VOCATION_BITS[vocation])
+    params.append(limit)
+
+    conn = create_connection()
+    c = conn.cursor()
+    # Percorre idx_item_postings_value na ordem do valor e para no limite
+    c.execute(f"""
+        SELECT p.item_name, i.category, i.image_path, i.image_url, i.vocation_mask, p.value
+        FROM item_postings p JOIN itens i ON i.item_name = p.item_name
+        WHERE {' AND '.join(conditions)}
+        ORDER BY p.value DESC
+        LIMIT ?
+    """, params)
+    rows = c.fetchall()
+    conn.close()
+    return [
+        {
             "item_name": row[0],
-            "category":  row[1],
+            "category": row[1],
             "image_path": row[2],
-            "data_json": row[3],
-        })
-    return results
+            "image_url": row[3],
+            "vocation_mask": row[4],
+            "value": row[5],
+        }
+        for row in rows
+    ]
+
+
+def read_latest_item_change():
+    """Número (seq) da alteração mais recente no feed de itens (0 se vazio)."""
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT COALESCE(MAX(seq), 0) FROM item_changes")
+    latest = c.fetchone()[0]
+    conn.close()
+    return latest
+
+
+def read_item_changes(since_seq, until_seq):
+    """
+    Nomes dos itens alterados entre since_seq (exclusive) e until_seq
+    (inclusive). Retorna None se o feed já foi podado além de since_seq
+    (quem chamou precisa reler tudo).
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT MIN(seq) FROM item_changes")
+    oldest = c.fetchone()[0]
+    if oldest is None or oldest > since_seq + 1:
+        conn.close()
+        return None
+
+    c.execute(
+        "SELECT DISTINCT item_name FROM item_changes WHERE seq > ? AND seq <= ?",
+        (since_seq, until_seq)
+    )
+    names = [row[0] for row in c.fetchall()]
+    conn.close()
+    return names
 
 
 def delete_none_items():
@@ -222,6 +795,8 @@ def delete_none_items():
     """
     conn = create_connection()
     c = conn.cursor()
+    c.execute("BEGIN IMMEDIATE")  # lê e desconta o mapa de campos na mesma transação
+    _discount_deleted_items(c, "item_name IS NULL", ())
     c.execute("DELETE FROM itens WHERE item_name IS NULL")
     conn.commit()
     deleted = c.rowcount
@@ -240,6 +815,8 @@ def delete_items_by_category(category):
     """
     conn = create_connection()
     c = conn.cursor()
+    c.execute("BEGIN IMMEDIATE")  # lê e desconta o mapa de campos na mesma transação
+    _discount_deleted_items(c, "category = ?", (category,))
     c.execute("DELETE FROM itens WHERE category = ?", (category,))
     conn.commit()
     deleted = c.rowcount
@@ -274,14 +851,14 @@ def create_creature(creature_name, category, subcategory, image_path, data_dict)
 def read_creature(creature_name):
     """
     Lê e retorna um registro com creature_name específico.
-    Retorna um dicionário: {"creature_name", "category", "subcategory", "image_path", "data_json"}
+    Retorna um dicionário: {"creature_name", "category", "subcategory", "image_path", "data_json", "sprite_hash", "image_url"}
     ou None se não existir.
     """
     conn = create_connection()
     c = conn.cursor()
 
     c.execute("""
-        SELECT creature_name, category, subcategory, image_path, data_json 
+        SELECT creature_name, category, subcategory, image_path, data_json, sprite_hash, image_url
         FROM criaturas 
         WHERE creature_name = ?
     """, (creature_name,))
@@ -295,6 +872,8 @@ def read_creature(creature_name):
             "subcategory": row[2],
             "image_path": row[3],
             "data_json": row[4],
+            "sprite_hash": row[5],
+            "image_url": row[6],
         }
     return None
 
@@ -414,7 +993,7 @@ def read_all_creatures():
     conn = create_connection()
     c = conn.cursor()
     c.execute("""
-        SELECT creature_name, category, subcategory, image_path, data_json 
+        SELECT creature_name, category, subcategory, image_path, data_json, sprite_hash, image_url
         FROM criaturas
     """)
     rows = c.fetchall()
@@ -428,6 +1007,8 @@ def read_all_creatures():
             "subcategory": row[2],
             "image_path": row[3],
             "data_json": row[4],
+            "sprite_hash": row[5],
+            "image_url": row[6],
         })
     return results
 
@@ -450,6 +1031,299 @@ def delete_creatures_by_category(category):
     return deleted
 
 
+def rank_image_sources(candidates):
+    """
+    Ordena as fontes de imagem pela taxa de sucesso observada.
+    - candidates: lista de tuplas (fonte, url) na ordem padrão.
+    Usa suavização de Laplace ((s + 1) / (s + f + 2)), então fontes sem
+    histórico ficam no meio da tabela e a ordem padrão desempata.
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT source, successes, failures FROM image_sources")
+    stats = {row[0]: (row[1], row[2]) for row in c.fetchall()}
+    conn.close()
+
+    def success_rate(candidate):
+        successes, failures = stats.get(candidate[0], (0, 0))
+        return (successes + 1) / (successes + failures + 2)
+
+    return sorted(candidates, key=success_rate, reverse=True)
+
+
+def record_image_source_results(results):
+    """
+    Registra o resultado das tentativas de download por fonte.
+    - results: dicionário {fonte: True/False/None}, como devolvido por
+      hedged_fetch. True conta como sucesso e False (404/410 ou conteúdo
+      inválido) como falha; falhas transitórias (None: timeout, 5xx, 429,
+      erro de conexão) não contam, para uma fonte rápida não cair no
+      ranking por um soluço.
+      Fontes que perderam a corrida nem aparecem em results.
+    """
+    counted = {source: ok for source, ok in (results or {}).items() if ok is not None}
+    if not counted:
+        return
+
+    conn = create_connection()
+    c = conn.cursor()
+    for source, ok in counted.items():
+        c.execute("""
+            INSERT INTO image_sources (source, successes, failures)
+            VALUES (?, ?, ?)
+            ON CONFLICT(source) DO UPDATE SET
+                successes = successes + excluded.successes,
+                failures = failures + excluded.failures
+        """, (source, 1 if ok is True else 0, 0 if ok is True else 1))
+    conn.commit()
+    conn.close()
+
+
+# ------------------------------------------------------------------------------
+# Cache negativo de URLs
+# ------------------------------------------------------------------------------
+def is_url_blocked(url):
+    """
+    Verifica se a URL falhou recentemente e ainda está no período de espera.
+    Retorna True se não devemos tentar acessá-la agora.
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT retry_after FROM url_failures WHERE url = ?", (url,))
+    row = c.fetchone()
+    conn.close()
+    return bool(row and row[0] and row[0] > time.time())
+
+
+def record_url_failure(url, status=None, owner=None, source_url=None):
+    """
+    Registra uma falha de acesso à URL.
+    A cada falha consecutiva o período de espera dobra, começando em
+    NEGATIVE_CACHE_BASE_TTL e limitado a NEGATIVE_CACHE_MAX_TTL.
+    Retorna o número de falhas acumuladas.
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT failures FROM url_failures WHERE url = ?", (url,))
+    row = c.fetchone()
+    failures = (row[0] if row else 0) + 1
+
+    now = time.time()
+    ttl = min(NEGATIVE_CACHE_BASE_TTL * (2 ** (failures - 1)), NEGATIVE_CACHE_MAX_TTL)
+
+    c.execute("""
+        INSERT OR REPLACE INTO url_failures
+            (url, owner, source_url, failures, last_status, last_failure, retry_after)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (url, owner, source_url, failures, status, now, now + ttl))
+    conn.commit()
+    conn.close()
+    return failures
+
+
+def clear_url_failure(url):
+    """Remove a URL do cache negativo (ex.: depois de um acesso bem-sucedido)."""
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("DELETE FROM url_failures WHERE url = ?", (url,))
+    conn.commit()
+    conn.close()
+
+
+def reset_url_failures_for_source(owner, source_url):
+    """
+    Limpa as falhas registradas para 'owner' quando a URL de origem do
+    registro mudou: as URLs derivadas da origem antiga não valem mais.
+    Retorna o número de entradas removidas.
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute(
+        "DELETE FROM url_failures WHERE owner = ? AND source_url IS NOT ?",
+        (owner, source_url)
+    )
+    conn.commit()
+    deleted = c.rowcount
+    conn.close()
+    return deleted
+
+
+# ------------------------------------------------------------------------------
+# Store de sprites (manifesto e referências)
+# ------------------------------------------------------------------------------
+def register_sprite(digest, path, size=None):
+    """Registra no manifesto um arquivo do store de sprites."""
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("""
+        INSERT OR IGNORE INTO sprites (hash, path, size, created_at)
+        VALUES (?, ?, ?, ?)
+    """, (digest, path, size, time.time()))
+    conn.commit()
+    conn.close()
+
+
+def read_sprite_path(digest):
+    """Retorna o caminho no store de um hash, ou None se não estiver no manifesto."""
+    if not digest:
+        return None
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT path FROM sprites WHERE hash = ?", (digest,))
+    row = c.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def read_all_sprites():
+    """Retorna todo o manifesto do store, em forma de lista de dicionários."""
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("SELECT hash, path, size FROM sprites")
+    rows = c.fetchall()
+    conn.close()
+    return [{"hash": row[0], "path": row[1], "size": row[2]} for row in rows]
+
+
+def read_referenced_sprite_hashes():
+    """
+    Hashes usados por algum item ou criatura, seja pela coluna sprite_hash
+    ou por um image_path que aponta para dentro do store.
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("""
+        SELECT sprite_hash, image_path FROM itens
+        UNION ALL
+        SELECT sprite_hash, image_path FROM criaturas
+    """)
+    rows = c.fetchall()
+    conn.close()
+
+    store_prefix = os.path.normpath(SPRITE_STORE_DIR) + os.sep
+    referenced = set()
+    for digest, image_path in rows:
+        if digest:
+            referenced.add(digest)
+        if image_path and os.path.normpath(image_path).startswith(store_prefix):
+            referenced.add(os.path.splitext(os.path.basename(image_path))[0])
+    return referenced
+
+
+def read_sprite_assignments():
+    """
+    Retorna (nome, hash, caminho no store) de todos os itens e criaturas que
+    têm sprite no store, sem carregar o data_json.
+    """
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("""
+        SELECT i.item_name, i.sprite_hash, s.path
+        FROM itens i JOIN sprites s ON s.hash = i.sprite_hash
+        UNION ALL
+        SELECT c.creature_name, c.sprite_hash, s.path
+        FROM criaturas c JOIN sprites s ON s.hash = c.sprite_hash
+    """)
+    rows = c.fetchall()
+    conn.close()
+    return rows
+
+
+def set_image_source(name, image_url):
+    """Guarda a URL de origem da imagem de um item ou criatura com este nome."""
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("UPDATE itens SET image_url = ? WHERE item_name = ?", (image_url, name))
+    c.execute("UPDATE criaturas SET image_url = ? WHERE creature_name = ?", (image_url, name))
+    conn.commit()
+    conn.close()
+
+
+def read_missing_image_sources(limit=None):
+    """
+    Registros que têm URL de origem mas ainda não têm imagem local.
+    Retorna tuplas (tipo, nome, categoria, url), com tipo "item" ou "creature".
+    """
+    query = """
+        SELECT 'item', item_name, category, image_url FROM itens
+        WHERE COALESCE(image_path, '') = '' AND COALESCE(image_url, '') != ''
+        UNION ALL
+        SELECT 'creature', creature_name, category, image_url FROM criaturas
+        WHERE COALESCE(image_path, '') = '' AND COALESCE(image_url, '') != ''
+    """
+    params = ()
+    if limit:
+        query += " LIMIT ?"
+        params = (limit,)
+
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute(query, params)
+    rows = c.fetchall()
+    conn.close()
+    return rows
+
+
+def set_sprite_hash(name, digest):
+    """Atualiza o sprite_hash de um item ou criatura com este nome."""
+    conn = create_connection()
+    c = conn.cursor()
+    c.execute("UPDATE itens SET sprite_hash = ? WHERE item_name = ?", (digest, name))
+    c.execute("UPDATE criaturas SET sprite_hash = ? WHERE creature_name = ?", (digest, name))
+    conn.commit()
+    conn.close()
+
+
+def apply_sprite_changes(sprites=(), item_updates=(), creature_updates=(), removed_hashes=()):
+    """
+    Aplica, numa única transação, as mudanças da manutenção do store:
+    - sprites: tuplas (hash, caminho, tamanho) a registrar no manifesto;
+    - item_updates / creature_updates: tuplas (nome, hash, novo image_path ou None);
+    - removed_hashes: hashes a retirar do manifesto (e das linhas que os usam).
+    Se algo falhar, nada é gravado.
+    """
+    conn = create_connection()
+    try:
+        with conn:
+            now = time.time()
+            conn.executemany("""
+                INSERT OR REPLACE INTO sprites (hash, path, size, created_at)
+                VALUES (?, ?, ?, ?)
+            """, [(digest, path, size, now) for digest, path, size in sprites])
+            conn.executemany("""
+                UPDATE itens SET sprite_hash = ?, image_path = COALESCE(?, image_path)
+                WHERE item_name = ?
+            """, [(digest, path, name) for name, digest, path in item_updates])
+            conn.executemany("""
+                UPDATE criaturas SET sprite_hash = ?, image_path = COALESCE(?, image_path)
+                WHERE creature_name = ?
+            """, [(digest, path, name) for name, digest, path in creature_updates])
+
+            removed = [(digest,) for digest in removed_hashes]
+            conn.executemany("DELETE FROM sprites WHERE hash = ?", removed)
+            conn.executemany("UPDATE itens SET sprite_hash = NULL WHERE sprite_hash = ?", removed)
+            conn.executemany("UPDATE criaturas SET sprite_hash = NULL WHERE sprite_hash = ?", removed)
+    finally:
+        conn.close()
+
+
+def store_sprite(local_path):
+    """
+    Coloca um arquivo local no store de sprites (hard link, sem duplicar
+    espaço) e registra no manifesto. Retorna (hash, caminho no store).
+    """
+    digest, path = put_file(local_path)
+    register_sprite(digest, path, os.path.getsize(path))
+    return digest, path
+
+
+def store_sprite_bytes(data, ext=None):
+    """Como store_sprite, mas a partir do conteúdo em memória."""
+    digest, path = put_bytes(data, ext)
+    register_sprite(digest, path, len(data))
+    return digest, path
+
+
 # ------------------------------------------------------------------------------
 # C) Função para baixar imagem, atualizando o registro se mudar o caminho
 # ------------------------------------------------------------------------------
@@ -537,52 +1411,91 @@ def download_image_if_needed(name: str, img_url: str, folder: str = "utils/img",
     local_path = os.path.join(folder, filename)
     print(f"[DEBUG DOWNLOAD] Caminho local: {local_path}")
 
+    # O sprite pode já existir na pasta com outro nome de arquivo
+    # (ex.: URL de origem diferente); consulta o índice antes de baixar
+    if not os.path.exists(local_path):
+        indexed_path = find_image(name, [folder])
+        if indexed_path:
+            print(f"[DEBUG DOWNLOAD] Encontrado no índice: {indexed_path}")
+            local_path = indexed_path
+
     # Se ainda não existe, faz o download
     if not os.path.exists(local_path):
         print(f"[DEBUG DOWNLOAD] Arquivo não existe, tentando download...")
         
-        # List of URLs to try
-        urls_to_try = [img_url]
-        
+        # Fontes a tentar, na forma (fonte, url)
+        candidates = [("original", img_url)]
+
         # Add alternative URLs for creatures
         if "creatures" in folder:
             # Add static Tibia URLs for creatures
             clean_name = sanitized_name.lower()
             static_url = f"https://static.tibia.com/images/library/{clean_name}.gif"
-            if static_url not in urls_to_try:
-                urls_to_try.append(static_url)
-                
+            if static_url != img_url:
+                candidates.append(("static", static_url))
+
             # Try fandom wiki URL
             wiki_url = f"https://tibia.fandom.com/wiki/Special:FilePath/{sanitized_name}.gif"
-            if wiki_url not in urls_to_try:
-                urls_to_try.append(wiki_url)
-        
-        # Try downloading from each URL
-        for url in urls_to_try:
-            try:
-                print(f"[DEBUG DOWNLOAD] Tentando URL: {url}")
-                resp = requests.get(url, timeout=10)
-                if resp.status_code == 200:
-                    print(f"[DEBUG DOWNLOAD] Resposta com sucesso: {resp.status_code}")
-                    with open(local_path, "wb") as f:
-                        content = resp.content
-                        print(f"[DEBUG DOWNLOAD] Tamanho do conteúdo: {len(content)} bytes")
-                        f.write(content)
-                        print(f"Downloaded: {filename}")
-                    # Success, exit the loop
-                    break
-                else:
-                    print(f"[DEBUG DOWNLOAD] Status {resp.status_code} ao tentar {url}")
-            except Exception as e:
-                print(f"[DEBUG DOWNLOAD] Erro: {e} ao tentar {url}")
-        
+            if wiki_url not in (img_url, static_url):
+                candidates.append(("filepath", wiki_url))
+
+        # Se a URL de origem mudou, as falhas antigas deste registro não valem mais
+        reset_url_failures_for_source(name, img_url)
+
+        # Pular URLs que falharam há pouco (cache negativo)
+        candidates = [(src, url) for src, url in candidates if not is_url_blocked(url)]
+        if not candidates:
+            print(f"[DEBUG DOWNLOAD] Todas as URLs de {name} falharam recentemente. Pulando.")
+            return ""
+
+        if len(candidates) > 1:
+            # Várias fontes: a que mais acerta vai primeiro e as outras
+            # entram na corrida se ela demorar
+            candidates = rank_image_sources(candidates)
+            deadline = IMAGE_FETCH_DEADLINE
+        else:
+            deadline = IMAGE_FETCH_TIMEOUT
+
+        source, url, content, results, statuses = hedged_fetch(
+            candidates, hedge_delay=IMAGE_HEDGE_DELAY, deadline=deadline
+        )
+        # Só houve corrida (e ranking a atualizar) com mais de uma fonte
+        if len(candidates) > 1:
+            record_image_source_results(results)
+
+        # Atualizar o cache negativo: só falhas definitivas (404/410 ou
+        # conteúdo inválido) entram nele; 5xx, 429 e erros de conexão não
+        urls_by_source = dict(candidates)
+        for src, ok in results.items():
+            if ok is False:
+                record_url_failure(
+                    urls_by_source[src], status=statuses.get(src), owner=name, source_url=img_url
+                )
+            elif ok is True:
+                clear_url_failure(urls_by_source[src])
+
         # Check if download succeeded
-        if not os.path.exists(local_path):
+        if content is None:
             print(f"ERRO: Não foi possível baixar a imagem de nenhuma URL")
             return ""
+
+        print(f"[DEBUG DOWNLOAD] Resposta com sucesso de {source}: {url}")
+        with open(local_path, "wb") as f:
+            print(f"[DEBUG DOWNLOAD] Tamanho do conteúdo: {len(content)} bytes")
+            f.write(content)
+            print(f"Downloaded: {filename}")
+        register_image(local_path)
     else:
         print(f"[DEBUG DOWNLOAD] Arquivo já existe: {local_path}")
 
+    # Guarda no store endereçado por conteúdo: o registro passa a apontar
+    # para o arquivo do store, identificado pelo hash e não pelo nome
+    try:
+        digest, local_path = store_sprite(local_path)
+        set_sprite_hash(name, digest)
+    except OSError as e:
+        print(f"[DEBUG DOWNLOAD] Não foi possível guardar {local_path} no store: {e}")
+
     # Determinar se estamos lidando com um item ou uma criatura
     # e atualizar o respectivo registro
     item = read_item(name)
@@ -2,8 +2,12 @@ import streamlit as st
 from utils.menu import menu_with_redirect
 from utils.favicon import set_config
 from utils.config import is_development
-from mydb import read_all_creatures, read_creature, create_table
+from utils.core import image_url
+from mydb import read_creature, create_table, get_data_generation
 from services.creature_scraping import scrap_all_creatures_from_subcategory, update_creature_details
+from services.catalog import get_creature_catalog, publish_creature_catalog
+from services.sprite_atlas import ensure_atlas, sprite_html
+from services.sprite_prefetch import display_image
 import json
 import pandas as pd
 import os
@@ -194,15 +198,16 @@ def verify_image_path(img_path):
         return img_path
     
     # Se for um caminho local, verificar se existe
+    # (sprites do store viram URL estática; os demais, data URL)
     if os.path.exists(img_path):
-        return img_path
+        return image_url(img_path)
     
     # Se o caminho não existir mas parece ser um caminho para utils/creature_img
     if 'utils/creature_img' in img_path:
         # Tentar caminho alternativo na nova estrutura
         new_path = img_path.replace('utils/creature_img', 'utils/img/creatures')
         if os.path.exists(new_path):
-            return new_path
+            return image_url(new_path)
     
     # Verificar se é uma URL absoluta
     if img_path.startswith(('http://', 'https://')):
@@ -249,14 +254,14 @@ with tab1:
     # Garantir que a tabela existe antes de tentar lê-la
     create_table()
     
-    # Buscar todas as criaturas do banco
-    creatures = read_all_creatures()
+    # Buscar todas as criaturas (snapshot publicado ou, sem ele, o banco)
+    creatures = get_creature_catalog().to_dict('records')
     
     # Debug: Exibir informações sobre as primeiras criaturas para diagnóstico
     st.write("### Debug: Informações de imagens")
     
-    # Buscar todas as criaturas do banco para debug
-    all_creatures = read_all_creatures()
+    # Mesmos registros do catálogo (sem reler e decodificar o banco a cada rerun)
+    all_creatures = creatures
     
     if all_creatures:
         st.write(f"Total de criaturas no banco: {len(all_creatures)}")
@@ -382,21 +387,20 @@ with tab1:
             
             # Verificar e possivelmente corrigir caminho da imagem
             image_path = verify_image_path(image_path)
+            if not image_path:
+                # Sprite ainda não baixado (modo sob demanda): URL de origem
+                image_path = display_image("", creature.get('image_url'), creature_name, kind="creature")
             
-            # Extrair a seção da criatura dos dados JSON
-            data_json = creature.get('data_json', '{}')
-            try:
-                data_dict = json.loads(data_json) if isinstance(data_json, str) else data_json
-                section = data_dict.get('Section', '')
-            except json.JSONDecodeError:
-                section = ''
+            # Seção da criatura (já extraída do data_json no catálogo)
+            section = creature.get('section') or ''
             
             df_data.append({
                 'Nome': creature_name,
                 'Categoria': category,
                 'Subcategoria': subcategory,
                 'Divisão': format_section_name(section),
-                'image_path': image_path  # Usar image_path, mesmo nome usado na página de itens
+                'image_path': image_path,  # Usar image_path, mesmo nome usado na página de itens
+                'sprite_hash': creature.get('sprite_hash')
             })
         
         # Criar DataFrame
@@ -514,6 +518,10 @@ with tab1:
                 st.session_state.selected_creature = selected_creature_name
         else:  # Grid de imagens
             # Exibir criaturas em formato de grade de imagens
+            # Os sprites vêm recortados das folhas do atlas: o navegador
+            # baixa poucas imagens grandes em vez de uma por criatura
+            atlas = ensure_atlas("criaturas", get_data_generation("criaturas"))
+
             # Criar uma grade de 4 colunas
             cols = st.columns(4)
             
@@ -525,11 +533,17 @@ with tab1:
                     img_path = row['image_path']
                     # Verificar e possivelmente corrigir caminho da imagem
                     img_path = verify_image_path(img_path)
+                    atlas_html = sprite_html(atlas, row['sprite_hash'], size=100, title=row['Nome'])
                     
-                    if img_path:
-                        if img_path.startswith('data:'):
-                            # Se for um data URL, exibir diretamente
+                    if atlas_html:
+                        st.markdown(atlas_html, unsafe_allow_html=True)
+                    elif img_path:
+                        if img_path.startswith(('data:', 'http://', 'https://')):
+                            # Se for um data URL (ou a URL de origem), exibir diretamente
                             st.image(img_path, width=100)
+                        elif img_path.startswith('app/static/'):
+                            # Sprite servido como arquivo estático (cache no navegador)
+                            st.markdown(f'<img src="{img_path}" width="100">', unsafe_allow_html=True)
                         elif os.path.exists(img_path):
                             # Se for um caminho de arquivo, abrir e exibir
                             with open(img_path, "rb") as f:
@@ -563,9 +577,12 @@ with tab1:
                     img_path = verify_image_path(img_path)
                     
                     if img_path:
-                        if img_path.startswith('data:'):
-                            # Se for um data URL, exibir diretamente
+                        if img_path.startswith(('data:', 'http://', 'https://')):
+                            # Se for um data URL (ou a URL de origem), exibir diretamente
                             st.image(img_path, width=150)
+                        elif img_path.startswith('app/static/'):
+                            # Sprite servido como arquivo estático (cache no navegador)
+                            st.markdown(f'<img src="{img_path}" width="150">', unsafe_allow_html=True)
                         elif os.path.exists(img_path):
                             # Se for um caminho de arquivo, abrir e exibir
                             with open(img_path, "rb") as f:
@@ -639,6 +656,7 @@ with tab1:
                     if "error" in result:
                         st.error(result["error"])
                     else:
+                        publish_creature_catalog()
                         st.success("Detalhes atualizados com sucesso!")
                         # Atualizar dados na sessão para exibir imediatamente
                         creature_data = read_creature(st.session_state.selected_creature)
@@ -832,8 +850,8 @@ with tab2:
         if st.button("Atualizar Detalhes de Todas as Criaturas no Banco", key="btn_update_all"):
             st.warning("Atenção: Este processo pode levar muito tempo!")
             
-            # Buscar todas as criaturas do banco
-            all_creatures = read_all_creatures()
+            # Todas as criaturas do catálogo (só os nomes são usados)
+            all_creatures = get_creature_catalog().to_dict('records')
             
             if not all_creatures:
                 st.error("Não há criaturas no banco de dados!")
@@ -866,6 +884,7 @@ with tab2:
                     # Atualizar barra de progresso
                     progress_bar.progress((i + 1) / total_creatures)
                 
+                publish_creature_catalog()
                 st.success(f"Atualização concluída! {updated_count} criaturas atualizadas com sucesso, {error_count} com erros.")
                 
                 if error_count > 0:
@@ -0,0 +1,188 @@
+import streamlit as st
+import pandas as pd
+import time
+from utils.menu import menu_with_redirect
+from utils.favicon import set_config
+from utils.config import is_development
+from utils.postings import term_label
+from utils.item_query import (
+    QUERY_FIELDS, OPERATORS, query_columns, compile_item_query, describe_item_query, run_item_query,
+)
+from utils.query_cache import cached_query
+from utils.vocation import ALL_VOCATIONS
+from mydb import read_posting_terms, read_top_items_for_term
+from services.catalog import get_item_catalog_snapshot
+from services.item_display import get_vocations_display
+from services.sprite_prefetch import item_image_urls
+
+# Máximo de linhas exibidas na tabela de resultados
+MAX_RESULT_ROWS = 500
+
+set_config(title="Filtro Avançado de Itens", layout="wide")
+
+# Exibe o menu de navegação
+menu_with_redirect()
+
+st.title("Filtro Avançado de Itens")
+
+# Catálogo colunar compartilhado entre as sessões; as colunas numéricas
+# viram arrays NumPy uma vez por versão do catálogo
+df, level_index, generation = get_item_catalog_snapshot()
+if df.empty:
+    st.warning("Nenhum item encontrado no banco de dados.")
+    st.stop()
+columns = cached_query(generation, ("filtro_itens", "columns"), lambda: query_columns(df))
+
+categories = cached_query(
+    generation, ("filtro_itens", "categories"),
+    lambda: sorted(df['category'].dropna().unique())
+)
+
+
+def attribute_filter_section():
+    """Filtro por faixas de atributos sobre o catálogo colunar."""
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_category = st.selectbox("Categoria:", ["Todas"] + categories, key="filter_category")
+    with col2:
+        selected_vocation = st.selectbox("Vocação:", ["Todas"] + ALL_VOCATIONS, key="filter_vocation")
+
+    level_range = st.slider("Level:", min_value=0, max_value=600, value=(0, 600), step=1)
+
+    # Predicados sobre atributos e proteções: um operador e um valor por campo
+    attribute_fields = [field for field in QUERY_FIELDS if field != 'level']
+    selected_fields = st.multiselect(
+        "Filtrar por atributos:",
+        attribute_fields,
+        format_func=lambda field: QUERY_FIELDS[field],
+    )
+
+    predicates = [('level', '>=', level_range[0])]
+    if level_range[1] < 600:
+        predicates.append(('level', '<=', level_range[1]))
+    for field in selected_fields:
+        op_col, value_col = st.columns([1, 3])
+        with op_col:
+            operator = st.selectbox(QUERY_FIELDS[field], list(OPERATORS), key=f"op_{field}")
+        with value_col:
+            value = st.number_input("Valor", value=0.0, step=1.0, key=f"value_{field}")
+        predicates.append((field, operator, value))
+
+    sort_col, order_col = st.columns([3, 1])
+    with sort_col:
+        sort_by = st.selectbox("Ordenar por:", list(QUERY_FIELDS), format_func=lambda field: QUERY_FIELDS[field])
+    with order_col:
+        descending = st.radio("Ordem:", ["Crescente", "Decrescente"]) == "Decrescente"
+
+    query = compile_item_query(
+        predicates,
+        vocation=None if selected_vocation == "Todas" else selected_vocation,
+        category=None if selected_category == "Todas" else selected_category,
+        sort_by=sort_by,
+        descending=descending,
+    )
+    start = time.perf_counter()
+    positions, steps = run_item_query(query, level_index, columns)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    st.subheader(f"Resultados ({len(positions)} itens)")
+
+    if is_development():
+        st.caption(f"Consulta executada em {elapsed_ms:.2f} ms")
+        with st.expander("Plano da consulta", expanded=False):
+            st.code(describe_item_query(query), language="text")
+            st.dataframe(
+                pd.DataFrame(steps, columns=["Etapa", "Linhas", "Tempo (ms)"]),
+                hide_index=True,
+            )
+
+    if len(positions) == 0:
+        st.info("Nenhum item atende aos filtros selecionados.")
+        return
+
+    # Só as linhas exibidas são montadas (sprites e textos de exibição)
+    shown = df.iloc[positions[:MAX_RESULT_ROWS]]
+    result_columns = ['level'] + list(selected_fields) + (
+        [sort_by] if sort_by != 'level' and sort_by not in selected_fields else []
+    )
+    result_df = pd.DataFrame({
+        'image_path': item_image_urls(shown, size=32),
+        'item_name': shown['item_name'].to_numpy(),
+        'category': shown['category'].astype(str).to_numpy(),
+        'Vocações': shown['vocation_mask'].map(get_vocations_display).to_numpy(),
+    })
+    for field in result_columns:
+        result_df[QUERY_FIELDS[field]] = shown[field].array
+
+    if len(positions) > MAX_RESULT_ROWS:
+        st.caption(f"Mostrando os primeiros {MAX_RESULT_ROWS} de {len(positions)} itens.")
+
+    st.dataframe(
+        result_df,
+        column_config={
+            "image_path": st.column_config.ImageColumn("Imagem", width="small"),
+            "item_name": "Item",
+            "category": "Categoria",
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+@st.fragment
+def postings_section():
+    """Quais itens dão um atributo/proteção: top-k pelo índice invertido (item_postings)."""
+    terms = cached_query(generation, ("filtro_itens", "posting_terms"), read_posting_terms)
+    if not terms:
+        st.info("Nenhum atributo ou proteção indexado.")
+        return
+    counts = dict(terms)
+
+    selected_term = st.selectbox(
+        "Atributo ou proteção:",
+        list(counts),
+        format_func=lambda term: f"{term_label(term)} ({counts[term]} itens)",
+    )
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        selected_category = st.selectbox("Categoria:", ["Todas"] + categories, key="postings_category")
+    with col2:
+        selected_vocation = st.selectbox("Vocação:", ["Todas"] + ALL_VOCATIONS, key="postings_vocation")
+    with col3:
+        limit = st.number_input("Top:", min_value=1, max_value=MAX_RESULT_ROWS, value=20, step=5)
+
+    category = None if selected_category == "Todas" else selected_category
+    vocation = None if selected_vocation == "Todas" else selected_vocation
+    rows = cached_query(
+        generation, ("filtro_itens", "postings", selected_term, category, vocation, limit),
+        lambda: read_top_items_for_term(selected_term, limit=limit, category=category, vocation=vocation)
+    )
+    if not rows:
+        st.info("Nenhum item atende aos filtros selecionados.")
+        return
+
+    top_df = pd.DataFrame(rows)
+    st.dataframe(
+        pd.DataFrame({
+            'image_path': item_image_urls(top_df, size=32),
+            'item_name': top_df['item_name'],
+            'category': top_df['category'],
+            'Vocações': top_df['vocation_mask'].map(get_vocations_display),
+            'value': top_df['value'],
+        }),
+        column_config={
+            "image_path": st.column_config.ImageColumn("Imagem", width="small"),
+            "item_name": "Item",
+            "category": "Categoria",
+            "value": term_label(selected_term),
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+filter_tab, postings_tab = st.tabs(["Filtro por Atributos", "Quais Itens Dão..."])
+with filter_tab:
+    attribute_filter_section()
+with postings_tab:
+    postings_section()
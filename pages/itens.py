@@ -2,9 +2,14 @@ import streamlit as st
 from utils.menu import menu_with_redirect
 from utils.favicon import set_config
 import pandas as pd
+import json
 
 # Importa as funções do nosso arquivo de banco
-from mydb import read_all_items, delete_items_by_category
+from mydb import delete_items_by_category, read_field_stats
+from services.catalog import get_item_catalog_snapshot
+from services.sprite_prefetch import item_image_urls
+from utils.query_cache import cached_query
+from utils.field_stats import COMBAT_PROPERTIES, combat_property_name
 from services.scraping import scrap, scrap_missing_items
 
 set_config(title="Itens")
@@ -21,14 +26,18 @@ st.header("Dados do Banco")
 st.info("Para visualizar detalhes completos de um item, acesse a página "
         "[Detalhes do Item](/Detalhes_Item)")
 
-# Exemplo: ler tudo e agrupar por categoria
-all_items = read_all_items()
+# Catálogo de itens compartilhado entre as sessões (já com data_dict);
+# só é remontado quando a tabela de itens muda
+df, _, generation = get_item_catalog_snapshot()
+all_items = not df.empty
 if not all_items:
     st.warning("Sem itens no banco! Use os controles de atualização abaixo para adicionar itens.")
 else:
-    # Converter para DataFrame
-    df = pd.DataFrame(all_items)
-    df = df[['image_path', 'item_name', 'category', 'data_json']]
+    # Sprites referenciados por URL estática (em vez de base64 embutido),
+    # já em miniatura de 32px para as células da tabela. Sprites ainda não
+    # baixados aparecem pela URL de origem e entram na fila de download.
+    df['image_path'] = item_image_urls(df, size=32)
+    df = df[['image_path', 'item_name', 'category', 'data_dict']]
 
     # Mostra estatísticas
     col1, col2 = st.columns(2)
@@ -47,8 +56,14 @@ else:
     
     # Exibe o DataFrame original em um expander
     with st.expander("Ver todos os itens registrados", expanded=False):
+        # O catálogo não guarda o JSON bruto: o texto é montado para exibição
+        # (uma vez por versão do catálogo)
+        data_json = cached_query(
+            generation, ("itens", "data_json"),
+            lambda: [json.dumps(data, ensure_ascii=False) for data in df['data_dict']],
+        )
         st.dataframe(
-            df,
+            df[['image_path', 'item_name', 'category']].assign(data_json=data_json),
             column_config={
                 "image_path": st.column_config.ImageColumn(
                     "Imagem",
@@ -151,195 +166,57 @@ with st.expander("🔄 Gerenciar Banco de Dados de Itens", expanded=False):
 if all_items:
     # Seção de análise avançada com abas em vez de expanders aninhados
     st.header("📊 Análise Avançada de Propriedades")
-    
-    # Converter strings JSON para dicionários
-    import json
-    df['data_dict'] = df['data_json'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
-    
-    # Função para extrair todas as propriedades de combate de forma recursiva
-    def extract_combat_properties(data_dict):
-        combat_props = {}
-        if not isinstance(data_dict, dict):
-            return combat_props
-            
-        # Verificar se existe Combat Properties no nível principal
-        if 'Combat Properties' in data_dict and isinstance(data_dict['Combat Properties'], dict):
-            return data_dict['Combat Properties']
-            
-        # Procurar em todas as seções
-        for key, value in data_dict.items():
-            if isinstance(value, dict):
-                if key == 'Combat Properties':
-                    return value
-                # Procurar recursivamente
-                sub_props = extract_combat_properties(value)
-                if sub_props:
-                    return sub_props
-                    
-        return combat_props
-    
-    # Função para analisar estrutura de propriedades e criar um mapa completo de todos os campos
-    def analyze_property_structure(items_df):
-        # Dicionário para armazenar todos os campos e subcampos encontrados
-        all_fields = {}
-        
-        # Para cada item, extrair e analisar suas propriedades
-        for idx, row in items_df.iterrows():
-            item_data = row['data_dict']
-            category = row['category']
-            item_name = row['item_name']
-            
-            # Função recursiva para explorar campos e subcampos
-            def explore_fields(data, path="", parent_key=""):
-                if not isinstance(data, dict):
-                    # Se não for um dicionário, registra o valor escalar
-                    full_path = f"{path}.{parent_key}" if path else parent_key
-                    if full_path not in all_fields:
-                        all_fields[full_path] = {
-                            'type': type(data).__name__,
-                            'examples': [],
-                            'categories': set(),
-                            'items': set()
-                        }
-                    
-                    # Limitar o número de exemplos para não sobrecarregar
-                    if len(all_fields[full_path]['examples']) < 5:
-                        all_fields[full_path]['examples'].append(str(data))
-                    
-                    all_fields[full_path]['categories'].add(category)
-                    all_fields[full_path]['items'].add(item_name)
-                    return
-                
-                # Se for um dicionário, explorar recursivamente
-                for key, value in data.items():
-                    new_path = f"{path}.{key}" if path else key
-                    
-                    # Registrar o próprio campo como existente
-                    if new_path not in all_fields:
-                        all_fields[new_path] = {
-                            'type': 'dict' if isinstance(value, dict) else type(value).__name__,
-                            'examples': [],
-                            'categories': set(),
-                            'items': set()
-                        }
-                    
-                    all_fields[new_path]['categories'].add(category)
-                    all_fields[new_path]['items'].add(item_name)
-                    
-                    # Se for um valor não-dicionário, registrar exemplo
-                    if not isinstance(value, dict):
-                        if len(all_fields[new_path]['examples']) < 5:
-                            all_fields[new_path]['examples'].append(str(value))
-                    
-                    # Explorar recursivamente se for dicionário
-                    if isinstance(value, dict):
-                        explore_fields(value, new_path, "")
-                    elif isinstance(value, list):
-                        # Para listas, registrar como tipo lista
-                        all_fields[new_path]['type'] = 'list'
-                        if value and len(all_fields[new_path]['examples']) < 5:
-                            all_fields[new_path]['examples'].append(str(value))
-            
-            # Iniciar exploração dos campos
-            explore_fields(item_data)
-        
-        # Converter para formato mais adequado para exibição
-        result = []
-        for field_path, info in all_fields.items():
-            result.append({
-                'Campo': field_path,
-                'Tipo': info['type'],
-                'Exemplos': ', '.join(info['examples']),
-                'Categorias': ', '.join(info['categories']),
-                'Num_Items': len(info['items']),
-                'Num_Categorias': len(info['categories'])
-            })
-        
-        # Ordenar por frequência (campos mais comuns primeiro)
-        return sorted(result, key=lambda x: x['Num_Items'], reverse=True)
-    
-    # Extrair todas as propriedades de combate de todos os itens
-    all_props = {}
-    category_props = {}
-    
-    # Para cada item, extrair suas propriedades de combate
-    for idx, row in df.iterrows():
-        item_data = row['data_dict']
-        category = row['category']
-        
-        # Inicializar dicionário para a categoria se não existir
-        if category not in category_props:
-            category_props[category] = {}
-            
-        # Extrair propriedades de combate
-        combat_props = extract_combat_properties(item_data)
-        
-        # Registrar todas as propriedades encontradas
-        for prop_name in combat_props.keys():
-            # Atualizar contagem global
-            if prop_name not in all_props:
-                all_props[prop_name] = 0
-            all_props[prop_name] += 1
-            
-            # Atualizar contagem por categoria
-            if prop_name not in category_props[category]:
-                category_props[category][prop_name] = 0
-            category_props[category][prop_name] += 1
-    
-    # Criar DataFrame com todas as propriedades e sua contagem
-    props_df = pd.DataFrame({
-        'Propriedade': list(all_props.keys()),
-        'Contagem': list(all_props.values())
-    })
-    
-    # Ordenar por frequência (mais comum primeiro)
-    props_df = props_df.sort_values('Contagem', ascending=False).reset_index(drop=True)
-    
-    # Criar abas para as diferentes visualizações de análise
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "Filtrar por Propriedade", 
-        "Propriedades Globais", 
-        "Propriedades por Categoria",
-        "Mapa de Campos"
-    ])
-    
-    with tab1:
+
+    # Mapa de campos pronto (tabela field_stats, mantida a cada item gravado):
+    # as abas não percorrem mais os itens
+    field_stats = cached_query(generation, ("itens", "field_stats"), read_field_stats)
+
+    @st.fragment
+    def property_filter_section(df, props_df):
+        """
+        Filtro de itens por propriedade de combate. Fragmento: trocar a
+        propriedade só reexecuta esta aba.
+        """
         st.subheader("Filtrar Itens por Propriedade")
-        
+
         # Criar lista de propriedades ordenadas por frequência
         properties_list = props_df['Propriedade'].tolist()
-        
+
         # Dropdown para selecionar a propriedade
         selected_property = st.selectbox(
             "Selecione uma propriedade de combate:",
             options=properties_list,
             index=0 if properties_list else None
         )
-        
+
         # Mostrar itens que têm a propriedade selecionada
         if selected_property:
-            # Filtrar itens que têm a propriedade selecionada
-            items_with_property = []
-            
-            for idx, row in df.iterrows():
-                combat_props = extract_combat_properties(row['data_dict'])
-                
-                if selected_property in combat_props:
-                    items_with_property.append({
-                        'Item': row['item_name'],
-                        'Categoria': row['category'],
-                        'Imagem': row['image_path'],
-                        'Valor': combat_props[selected_property],
-                        'Wiki': f"https://tibia.fandom.com/wiki/{row['item_name'].replace(' ', '_')}"
-                    })
-            
-            # Converter para DataFrame
-            if items_with_property:
-                items_df = pd.DataFrame(items_with_property)
-                
+            # Posições dos itens com a propriedade (uma vez por versão do catálogo)
+            positions = cached_query(
+                generation, ("itens", "property", selected_property),
+                lambda: [
+                    i for i, data in enumerate(df['data_dict'])
+                    if isinstance(data, dict) and isinstance(data.get(COMBAT_PROPERTIES), dict)
+                    and selected_property in data[COMBAT_PROPERTIES]
+                ]
+            )
+
+            if positions:
+                shown = df.iloc[positions]
+                items_df = pd.DataFrame({
+                    'Item': shown['item_name'].to_numpy(),
+                    'Categoria': shown['category'].astype(str).to_numpy(),
+                    'Imagem': shown['image_path'].to_numpy(),
+                    'Valor': [data[COMBAT_PROPERTIES][selected_property] for data in shown['data_dict']],
+                    'Wiki': [
+                        f"https://tibia.fandom.com/wiki/{name.replace(' ', '_')}"
+                        for name in shown['item_name']
+                    ],
+                })
+
                 # Exibir quantidade
                 st.write(f"{len(items_df)} itens encontrados com a propriedade '{selected_property}'")
-                
+
                 # Exibir tabela
                 st.dataframe(
                     items_df,
@@ -360,6 +237,59 @@ if all_items:
                 )
             else:
                 st.info(f"Nenhum item encontrado com a propriedade '{selected_property}'")
+
+    @st.fragment
+    def field_type_filter_section(all_fields_df):
+        """
+        Filtro do mapa de campos por tipo. Fragmento: trocar o tipo só
+        reexecuta este filtro.
+        """
+        # Adicionar filtros para campos específicos
+        st.write("### Filtrar por Tipo de Campo")
+        field_types = sorted(all_fields_df['Tipo'].unique())
+        selected_type = st.selectbox("Selecione um tipo de campo:", options=field_types)
+
+        # Filtrar e mostrar
+        if selected_type:
+            filtered_fields = all_fields_df[all_fields_df['Tipo'] == selected_type]
+            st.dataframe(filtered_fields, use_container_width=True)
+
+    # Propriedades de combate (campos de primeiro nível de Combat Properties)
+    # com a contagem global e por categoria
+    all_props = {}
+    category_props = {}
+    for field in field_stats:
+        prop_name = combat_property_name(field['path'], field['depth'])
+        if prop_name is None:
+            continue
+        all_props[prop_name] = field['items']
+        for category, count in field['categories'].items():
+            category_props.setdefault(category, {})[prop_name] = count
+    # Abas de categoria na ordem do catálogo
+    category_props = {
+        category: category_props[category]
+        for category in pd.unique(df['category'].astype(str)) if category in category_props
+    }
+
+    # Criar DataFrame com todas as propriedades e sua contagem
+    props_df = pd.DataFrame({
+        'Propriedade': list(all_props.keys()),
+        'Contagem': list(all_props.values())
+    })
+    
+    # Ordenar por frequência (mais comum primeiro)
+    props_df = props_df.sort_values('Contagem', ascending=False).reset_index(drop=True)
+    
+    # Criar abas para as diferentes visualizações de análise
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "Filtrar por Propriedade", 
+        "Propriedades Globais", 
+        "Propriedades por Categoria",
+        "Mapa de Campos"
+    ])
+    
+    with tab1:
+        property_filter_section(df, props_df)
     
     with tab2:
         st.subheader("Propriedades de Combate Encontradas em Todos os Itens")
@@ -399,20 +329,20 @@ if all_items:
         st.subheader("Mapa Completo de Todos os Campos")
         st.write("Esta tabela mostra todos os campos encontrados em todos os itens, incluindo subcampos e propriedades aninhadas.")
         
-        # Executar análise detalhada
-        all_fields_df = pd.DataFrame(analyze_property_structure(df))
+        all_fields_df = pd.DataFrame([
+            {
+                'Campo': field['path'],
+                'Tipo': field['type'],
+                'Exemplos': ', '.join(field['examples']),
+                'Categorias': ', '.join(field['categories']),
+                'Num_Items': field['items'],
+                'Num_Categorias': len(field['categories'])
+            }
+            for field in field_stats
+        ], columns=['Campo', 'Tipo', 'Exemplos', 'Categorias', 'Num_Items', 'Num_Categorias'])
         
         # Exibir tabela completa
         st.dataframe(all_fields_df, use_container_width=True)
         
         # Adicionar filtros para campos específicos
-        st.write("### Filtrar por Tipo de Campo")
-        field_types = sorted(all_fields_df['Tipo'].unique())
-        selected_type = st.selectbox("Selecione um tipo de campo:", options=field_types)
-        
-        # Filtrar e mostrar
-        if selected_type:
-            filtered_fields = all_fields_df[all_fields_df['Tipo'] == selected_type]
-            st.dataframe(filtered_fields, use_container_width=True)
-
-st.write("TODO: separar adequadamente as informações da Data para que possam ser utilizadas nos cálculos")
\ No newline at end of file
+        field_type_filter_section(all_fields_df)
@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 import os
-import shutil
 import sqlite3
 from mydb import read_all_items, update_item
+from utils.sprite_store import link_or_copy
 
 def create_connection():
     """Cria uma conexão com o banco de dados SQLite"""
@@ -57,8 +57,10 @@ def reorganize_item_images():
         target_path = os.path.join(target_folder, filename)
         
         try:
-            # Copiar o arquivo para a nova localização
-            shutil.copy2(current_path, target_path)
+            # Criar o arquivo na nova localização (hard link quando possível,
+            # para não duplicar a imagem no disco)
+            if not os.path.exists(target_path):
+                link_or_copy(current_path, target_path)
             
             # Atualizar o caminho no banco de dados
             update_item(item_name, image_path=target_path)
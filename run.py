@@ -15,6 +15,11 @@ def main():
         print("Streamlit não encontrado. Instalando dependências...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
     
+    # Cria/migra o banco (tabelas, colunas e índices novos) antes de subir
+    # o servidor; as páginas só leem
+    from mydb import create_table
+    create_table()
+
     # Inicia o aplicativo
     os.environ["STREAMLIT_SERVER_RUN_ON_SAVE"] = "true"
     subprocess.call([sys.executable, "-m", "streamlit", "run", "app.py"])
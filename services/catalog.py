@@ -0,0 +1,557 @@
+import json
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from mydb import (
+    read_all_items, read_items, read_latest_item_change, read_item_changes, read_all_creatures,
+    get_data_generation,
+)
+from utils.columnar_snapshot import read_snapshot, snapshot_mtime, snapshots_enabled, write_snapshot
+from utils.config import extract_level
+from utils.level_index import build_level_index, update_level_index
+from utils.records import RESISTANCE_ELEMENTS, creature_record_from_row
+from utils.vocation import (
+    extract_vocations_from_data, vocations_to_mask, resolve_vocation_masks, format_vocation_mask,
+)
+
+
+def extract_attributes(data):
+    """
+    Extrai atributos importantes de um item no formato novo de dados.
+    "Vocações" fica vazio aqui: o catálogo preenche com as vocações finais
+    (requisito do item ou padrão da categoria).
+
+    Args:
+        data (dict): Dicionário de dados do item
+
+    Returns:
+        dict: Dicionário com atributos extraídos
+    """
+    result = {}
+
+    if not isinstance(data, dict):
+        return result
+
+    result["Level"] = extract_level(data)
+    result["Vocações"] = "Todas"
+
+    # Propriedades de Combate
+    if "Combat Properties" in data and isinstance(data["Combat Properties"], dict):
+        combat = data["Combat Properties"]
+
+        if "Attack" in combat:
+            result["Ataque"] = combat["Attack"]
+
+        if "Defense" in combat:
+            result["Defesa"] = combat["Defense"]
+
+        if "Armor" in combat:
+            result["Armadura"] = combat["Armor"]
+        elif "Arm" in combat:
+            result["Armadura"] = combat["Arm"]
+
+    # Propriedades Gerais
+    if "General Properties" in data and isinstance(data["General Properties"], dict):
+        general = data["General Properties"]
+
+        if "Weight" in general:
+            result["Peso"] = general["Weight"]
+
+    # Propriedades de Comércio
+    if "Trade Properties" in data and isinstance(data["Trade Properties"], dict):
+        trade = data["Trade Properties"]
+
+        # Value (preço de venda)
+        if "Value" in trade:
+            result["Valor de Venda"] = trade["Value"]
+
+        if "Sell Value" in trade:
+            result["Valor de Venda"] = trade["Sell Value"]
+
+        # Bought for / Sold for
+        if "Bought For" in trade:
+            result["Valor de Compra"] = trade["Bought For"]
+        elif "Sold For" in trade:
+            result["Valor de Compra"] = trade["Sold For"]
+
+    # Atributos (bonuses)
+    if "attributes" in data and isinstance(data["attributes"], dict):
+        result["Atributos"] = data["attributes"]
+    elif "Attributes" in data:
+        result["Atributos"] = data["Attributes"]
+
+    # Resistências
+    if "resistances" in data and isinstance(data["resistances"], dict):
+        result["Resistências"] = data["resistances"]
+    elif "Resistances" in data:
+        result["Resistências"] = data["Resistances"]
+
+    # Peso (campo direto)
+    if "Weight" in data:
+        result["Peso"] = data["Weight"]
+
+    return result
+
+
+def extract_resistances(data):
+    """Extrai proteções elementais como texto (ex.: "Fogo: 5%, Gelo: 3%")."""
+    results = []
+    if isinstance(data, dict):
+        # Elementos possíveis
+        elementos = {
+            'physical': 'Físico',
+            'earth': 'Terra',
+            'fire': 'Fogo',
+            'energy': 'Energia',
+            'ice': 'Gelo',
+            'holy': 'Sagrado',
+            'death': 'Morte'
+        }
+        
+        # Verificar diretamente nos dados (primeira verificação - case sensitive)
+        for eng, ptbr in elementos.items():
+            if eng in data:
+                results.append(f"{ptbr}: {data[eng]}%")
+        
+        # Verificar também com primeira letra maiúscula (segunda verificação)
+        for eng, ptbr in elementos.items():
+            capitalized = eng.capitalize()
+            if capitalized in data:
+                results.append(f"{ptbr}: {data[capitalized]}%")
+                
+        # Verificar em "Protection" (terceira verificação)
+        if "Protection" in data and isinstance(data["Protection"], dict):
+            for eng, ptbr in elementos.items():
+                if eng in data["Protection"]:
+                    results.append(f"{ptbr}: {data['Protection'][eng]}%")
+                # Verificar também com primeira letra maiúscula
+                capitalized = eng.capitalize()
+                if capitalized in data["Protection"]:
+                    results.append(f"{ptbr}: {data['Protection'][capitalized]}%")
+        
+        # Verificar em Combat Properties > Resists (quarta verificação)
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            # Verificar diretamente em Combat Properties (caso raro)
+            for eng, ptbr in elementos.items():
+                if eng in data['Combat Properties']:
+                    results.append(f"{ptbr}: {data['Combat Properties'][eng]}%")
+                # Verificar também com primeira letra maiúscula
+                capitalized = eng.capitalize()
+                if capitalized in data['Combat Properties']:
+                    results.append(f"{ptbr}: {data['Combat Properties'][capitalized]}%")
+            
+            # Verificar em Combat Properties > Resists
+            if 'Resists' in data['Combat Properties'] and isinstance(data['Combat Properties']['Resists'], dict):
+                resists = data['Combat Properties']['Resists']
+                for eng, ptbr in elementos.items():
+                    if eng in resists:
+                        results.append(f"{ptbr}: {resists[eng]}%")
+                    # Verificar também com primeira letra maiúscula
+                    capitalized = eng.capitalize()
+                    if capitalized in resists:
+                        results.append(f"{ptbr}: {resists[capitalized]}%")
+    
+    # Remover possíveis duplicatas
+    unique_results = []
+    seen = set()
+    for item in results:
+        element = item.split(':')[0].strip()
+        if element not in seen:
+            seen.add(element)
+            unique_results.append(item)
+    
+    return ", ".join(unique_results)
+
+
+def parse_gold(value):
+    """
+    Converte um valor de comércio em número ("2,300 gp" -> 2300).
+    Retorna None se o valor não tiver número.
+    """
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str) and any(char.isdigit() for char in value):
+        try:
+            return int(value.replace("gp", "").replace(",", "").strip())
+        except ValueError:
+            return None
+    return None
+
+
+ITEM_COLUMNS = [
+    "item_name", "category", "image_path", "data_json", "sprite_hash", "image_url", "vocation_mask",
+]
+
+# Colunas numéricas do catálogo, projetadas do data_json pelo banco
+# (mydb.ITEM_FIELDS, json_extract): coluna -> dtype nulo. Valores sem número
+# no infobox ficam <NA>; a formatação é feita na exibição.
+ITEM_FIELD_DTYPES = {
+    'level': 'Int16',
+    'armor': 'Int16',
+    'attack': 'Int16',
+    'defense': 'Int16',
+    'weight': 'Float32',
+    **{f"res_{element}": 'Int16' for element in RESISTANCE_ELEMENTS},
+    'trade_value': 'Int64',
+    'buy_value': 'Int64',
+}
+
+
+def item_attributes(data, vocation_mask):
+    """
+    Atributos de exibição de um item (extract_attributes com as vocações
+    finais). Montado na hora, só para os itens exibidos.
+    """
+    attrs = extract_attributes(data)
+    if attrs:
+        attrs["Vocações"] = format_vocation_mask(vocation_mask)
+    return attrs
+
+
+def enrich_items(items):
+    """
+    Monta o catálogo colunar a partir de registros de itens (formato de
+    read_all_items com fields=ITEM_FIELD_DTYPES): item_name (strings
+    internadas), category (categórica), vocation_mask (uint8, ver
+    utils.vocation), data_dict e as colunas de ITEM_FIELD_DTYPES (já vêm
+    convertidas do banco). O data_json é descartado depois de lido.
+    """
+    items = list(items)
+    df = pd.DataFrame(items, columns=ITEM_COLUMNS)
+
+    df['item_name'] = [sys.intern(name) if isinstance(name, str) else name for name in df['item_name']]
+    data_dicts = [json.loads(x) if isinstance(x, str) else x for x in df.pop('data_json')]
+    df.insert(ITEM_COLUMNS.index('data_json'), 'data_dict', data_dicts)
+    for column, dtype in ITEM_FIELD_DTYPES.items():
+        df[column] = pd.array([item.get(column) for item in items], dtype=dtype)
+    # Itens sem level no infobox contam como level 0 (como extract_level)
+    df['level'] = df['level'].fillna(0)
+
+    # A máscara de vocações vem do banco (calculada na escrita); só itens
+    # gravados por fora do mydb precisam ser extraídos aqui
+    masks = df['vocation_mask']
+    if masks.isna().any():
+        masks = pd.Series([
+            vocations_to_mask(extract_vocations_from_data(data)) if pd.isna(mask) else mask
+            for data, mask in zip(df['data_dict'], masks)
+        ], index=df.index, dtype='float64')
+    df['vocation_mask'] = resolve_vocation_masks(masks, df['item_name'], df['category'])
+    df['category'] = df['category'].astype('category')
+    return df
+
+
+def build_item_catalog():
+    """Lê todos os itens do banco e monta o catálogo enriquecido."""
+    return enrich_items(read_all_items(fields=ITEM_FIELD_DTYPES))
+
+
+def publish_item_catalog():
+    """
+    Grava o snapshot colunar do catálogo de itens (utils.columnar_snapshot),
+    marcado com a última alteração do feed já incluída. Chamado no fim de
+    cada scraping; na partida, os processos carregam o snapshot e aplicam só
+    as alterações posteriores do feed. Retorna o caminho gravado (ou None).
+    """
+    if not snapshots_enabled():
+        return None
+    start = time.perf_counter()
+    # Lido antes dos itens: alterações gravadas no meio são reaplicadas na carga
+    generation = read_latest_item_change()
+    df = build_item_catalog()
+    # Dicionários não viram colunas Arrow: o infobox vai como texto JSON
+    frame = df.drop(columns=['data_dict'])
+    frame.insert(
+        df.columns.get_loc('data_dict'), 'data_json',
+        [json.dumps(data, ensure_ascii=False) for data in df['data_dict']],
+    )
+    path = write_snapshot("items", frame, {"generation": generation})
+    print(f"[DEBUG CATALOG] Snapshot de itens publicado em "
+          f"{(time.perf_counter() - start) * 1000:.0f}ms: {len(df)} itens, geração {generation}")
+    return path
+
+
+def _published_item_catalog(latest):
+    """
+    (catálogo, geração) do snapshot publicado, ou (None, 0) se não há
+    snapshot utilizável (sem pyarrow, arquivo ausente ou de outro banco).
+    """
+    loaded = read_snapshot("items")
+    if loaded is None:
+        return None, 0
+    df, metadata = loaded
+    generation = metadata.get("generation")
+    if generation is None or generation > latest:
+        return None, 0
+    df['item_name'] = [sys.intern(name) if isinstance(name, str) else name for name in df['item_name']]
+    position = df.columns.get_loc('data_json')
+    df.insert(position, 'data_dict', [json.loads(x) if isinstance(x, str) else {} for x in df.pop('data_json')])
+    return df, generation
+
+
+def apply_item_changes(df, level_index, changed_names):
+    """
+    Novo catálogo com as linhas de 'changed_names' relidas do banco (itens
+    removidos somem), junto com o seu índice de level. As demais linhas não
+    são reprocessadas e o índice só recebe as linhas alteradas
+    (utils.level_index.update_level_index); o catálogo e o índice antigos
+    não são alterados, porque outras sessões ainda podem estar lendo.
+
+    Returns:
+        tuple: (catálogo, índice de level)
+    """
+    changed_names = set(changed_names)
+    changed = df['item_name'].isin(changed_names).to_numpy()
+    updated = enrich_items(read_items(changed_names, fields=ITEM_FIELD_DTYPES))
+    kept = df[~changed]
+    if updated.empty:
+        df = kept.reset_index(drop=True)
+    else:
+        df = pd.concat([kept, updated], ignore_index=True)
+        # Categorias diferentes dos dois lados viram object no concat
+        df['category'] = df['category'].astype('category')
+    added = np.arange(len(kept), len(df))
+    return df, update_level_index(level_index, np.flatnonzero(changed), df, added)
+
+
+@st.cache_resource(show_spinner=False)
+def _item_catalog_state():
+    """Estado do catálogo compartilhado por todas as sessões do processo."""
+    return {
+        "snapshot": None,                  # (DataFrame, índice de level, geração)
+        "seq": 0,
+        "refreshed_at": None,
+        "refreshing": False,
+        "lock": threading.Lock(),          # uma (re)montagem por vez
+        "refresh_lock": threading.Lock(),  # protege o flag 'refreshing'
+    }
+
+
+def _refresh_item_catalog(state):
+    """
+    Atualiza o catálogo até a última alteração do feed (item_changes):
+    só as linhas alteradas são reprocessadas; o catálogo inteiro é
+    remontado se o feed já foi podado. Na primeira carga, o ponto de
+    partida é o snapshot publicado (publish_item_catalog); sem ele, o
+    catálogo é montado a partir do banco. O índice de level
+    (utils.level_index) é atualizado junto, só nas linhas alteradas.
+
+    O catálogo novo é montado à parte e só então trocado (uma atribuição),
+    então quem lê state["snapshot"] nunca vê um catálogo pela metade nem um
+    índice de outra versão.
+    """
+    latest = read_latest_item_change()
+    snapshot = state["snapshot"]
+    if snapshot is not None and latest <= state["seq"]:
+        return
+
+    start = time.perf_counter()
+    if snapshot is not None:
+        base, base_seq = snapshot[0], state["seq"]
+    else:
+        # Partida do processo: parte do snapshot publicado, se houver
+        base, base_seq = _published_item_catalog(latest)
+    if base is None:
+        changed = None
+    elif base_seq == latest:
+        changed = []
+    else:
+        changed = read_item_changes(base_seq, latest)
+
+    if changed is None:
+        df = build_item_catalog()
+        level_index = build_level_index(df)
+        print(f"[DEBUG CATALOG] Catálogo de itens montado em "
+              f"{time.perf_counter() - start:.2f}s: {len(df)} itens")
+    else:
+        # O índice do snapshot publicado é montado uma vez, na partida
+        level_index = snapshot[1] if snapshot is not None else build_level_index(base)
+        if changed:
+            df, level_index = apply_item_changes(base, level_index, changed)
+        else:
+            df = base
+        origin = "atualizado" if snapshot is not None else "carregado do snapshot"
+        print(f"[DEBUG CATALOG] Catálogo de itens {origin} em "
+              f"{(time.perf_counter() - start) * 1000:.0f}ms: {len(changed)} itens alterados")
+
+    state["snapshot"] = (df, level_index, latest)
+    state["seq"], state["refreshed_at"] = latest, time.time()
+
+
+def _refresh_in_background(state):
+    """Corpo da thread de atualização em segundo plano."""
+    try:
+        with state["lock"]:
+            _refresh_item_catalog(state)
+    except Exception as e:
+        print(f"[DEBUG CATALOG] Erro ao atualizar o catálogo de itens: {e}")
+    finally:
+        with state["refresh_lock"]:
+            state["refreshing"] = False
+
+
+def start_item_catalog_refresh():
+    """
+    Dispara a atualização do catálogo em uma thread (se ainda não houver
+    uma rodando). Enquanto isso, as páginas continuam vendo a versão anterior.
+    """
+    state = _item_catalog_state()
+    with state["refresh_lock"]:
+        if state["refreshing"]:
+            return
+        state["refreshing"] = True
+    threading.Thread(
+        target=_refresh_in_background, args=(state,), name="item-catalog-refresh", daemon=True
+    ).start()
+
+
+def get_item_catalog_snapshot():
+    """
+    Retorna (catálogo, índice de level, geração) da mesma versão. As
+    posições do índice valem para catalog.iloc (ver utils.level_index); a
+    geração é a última alteração do feed já aplicada e serve de chave para
+    caches derivados do catálogo.
+
+    Reruns de widgets apenas leem o catálogo já pronto. Quando o banco muda,
+    a versão anterior continua sendo servida enquanto uma thread aplica as
+    alterações (feed item_changes); o catálogo novo entra no lugar quando
+    fica pronto. Só a primeira carga do processo espera a montagem.
+
+    O DataFrame devolvido é uma visão rasa (copy(deep=False)): a página pode
+    adicionar/substituir colunas e filtrar à vontade, mas não deve alterar
+    os valores no lugar (nem os dicionários de data_dict), que
+    são compartilhados entre as sessões. Reordenar ou filtrar a visão
+    invalida as posições do índice: use-as antes.
+    """
+    state = _item_catalog_state()
+    snapshot = state["snapshot"]
+    if snapshot is None:
+        # Primeira carga: não há versão anterior para servir
+        with state["lock"]:
+            if state["snapshot"] is None:
+                _refresh_item_catalog(state)
+            snapshot = state["snapshot"]
+    elif read_latest_item_change() > state["seq"]:
+        start_item_catalog_refresh()
+    df, level_index, generation = snapshot
+    return df.copy(deep=False), level_index, generation
+
+
+def get_item_catalog_indexed():
+    """(catálogo, índice de level) da mesma versão (ver get_item_catalog_snapshot)."""
+    return get_item_catalog_snapshot()[:2]
+
+
+def get_item_catalog():
+    """Catálogo de itens enriquecido (ver get_item_catalog_snapshot)."""
+    return get_item_catalog_indexed()[0]
+
+
+def item_catalog_status():
+    """
+    Situação do catálogo de itens deste processo: {"seq", "refreshed_at",
+    "refreshing"}, ou None se ele ainda não foi carregado.
+    """
+    state = _item_catalog_state()
+    if state["snapshot"] is None:
+        return None
+    return {
+        "seq": state["seq"],
+        "refreshed_at": state["refreshed_at"],
+        "refreshing": state["refreshing"],
+    }
+
+
+CREATURE_COLUMNS = [
+    "creature_name", "category", "subcategory", "image_path", "data_json", "sprite_hash", "image_url",
+]
+
+
+def enrich_creatures(creatures):
+    """
+    Monta o catálogo colunar de criaturas a partir de registros no formato
+    de read_all_creatures: creature_name (strings internadas), category e
+    subcategory (categóricas), section, hp e exp (inteiros nulos). O
+    data_json continua como texto.
+    """
+    df = pd.DataFrame(creatures, columns=CREATURE_COLUMNS)
+    df['creature_name'] = [sys.intern(name) if isinstance(name, str) else name for name in df['creature_name']]
+
+    records = []
+    for row in df[['creature_name', 'category', 'subcategory', 'data_json']].itertuples(index=False):
+        try:
+            data = json.loads(row.data_json) if isinstance(row.data_json, str) else (row.data_json or {})
+        except json.JSONDecodeError:
+            data = {}
+        records.append(creature_record_from_row(
+            row.creature_name, row.category, row.subcategory, data.get('Section', ''), data
+        ))
+    df['section'] = [record.section for record in records]
+    df['hp'] = pd.array([record.hp for record in records], dtype='Int32')
+    df['exp'] = pd.array([record.exp for record in records], dtype='Int64')
+    df['category'] = df['category'].astype('category')
+    df['subcategory'] = df['subcategory'].astype('category')
+    return df
+
+
+def build_creature_catalog():
+    """Lê todas as criaturas do banco e monta o catálogo colunar."""
+    return enrich_creatures(read_all_creatures())
+
+
+def publish_creature_catalog():
+    """
+    Grava o snapshot colunar do catálogo de criaturas, marcado com a geração
+    da tabela de criaturas. Chamado depois de cada scraping/atualização de
+    criaturas. Retorna o caminho (ou None).
+    """
+    if not snapshots_enabled():
+        return None
+    start = time.perf_counter()
+    # Geração lida antes da leitura: uma escrita no meio deixa o snapshot
+    # com a geração antiga e ele é ignorado, nunca o contrário
+    generation = get_data_generation("criaturas")
+    df = build_creature_catalog()
+    path = write_snapshot("creatures", df, {"generation": generation})
+    print(f"[DEBUG CATALOG] Snapshot de criaturas publicado em "
+          f"{(time.perf_counter() - start) * 1000:.0f}ms: {len(df)} criaturas")
+    return path
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _published_creature_catalog(mtime):
+    """
+    Snapshot de criaturas lido uma vez por versão publicada (mtime do
+    arquivo): (DataFrame, geração) ou (None, None).
+    """
+    loaded = read_snapshot("creatures")
+    if loaded is None:
+        return None, None
+    df, metadata = loaded
+    return df, metadata.get("generation")
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _creature_catalog_from_db(generation):
+    """Catálogo montado a partir do banco, uma vez por geração da tabela."""
+    return build_creature_catalog()
+
+
+def get_creature_catalog():
+    """
+    Catálogo de criaturas, compartilhado entre as sessões do processo: o
+    snapshot publicado, se ele está na geração atual da tabela de criaturas,
+    ou montado a partir do banco. Escritas fora do scraping (sprites,
+    image_url, prefetch) mudam a geração e invalidam o snapshot.
+    Visão rasa, como em get_item_catalog_snapshot.
+    """
+    generation = get_data_generation("criaturas")
+    mtime = snapshot_mtime("creatures")
+    df, published = _published_creature_catalog(mtime) if mtime is not None else (None, None)
+    if df is None or published != generation:
+        df = _creature_catalog_from_db(generation)
+    return df.copy(deep=False)
@@ -2,7 +2,13 @@ import streamlit as st
 import requests
 from bs4 import BeautifulSoup
 import re
-from mydb import upsert_creature, create_table, read_creature, update_creature, download_image_if_needed
+from mydb import (
+    upsert_creature, create_table, read_creature, update_creature, download_image_if_needed,
+    is_url_blocked, record_url_failure, clear_url_failure, set_image_source,
+)
+from utils.config import LAZY_IMAGES
+from utils.records import creature_record_from_row, creature_record_to_data
+from services.catalog import publish_creature_catalog
 import json
 import os
 
@@ -17,7 +23,7 @@ def extract_creatures_from_table(table_soup, category, subcategory, section_name
         section_name: Nome da seção/divisão (ex: "Archers", "Scouts", etc.)
         
     Returns:
-        Lista de dicionários com as informações das criaturas
+        Lista de CreatureRecord com as informações das criaturas
     """
     creatures = []
     
@@ -85,34 +91,22 @@ def extract_creatures_from_table(table_soup, category, subcategory, section_name
             if i != name_index and i < len(cells):
                 creature_data[header] = cells[i].text.strip()
         
-        # Adicionar à lista de criaturas
-        creatures.append({
-            "name": creature_name,
-            "image_url": img_url,
-            "category": category,
-            "subcategory": subcategory,
-            "data": creature_data
-        })
+        # Adicionar à lista de criaturas (registro compacto, sem um
+        # dicionário por criatura para os campos fixos)
+        creatures.append(creature_record_from_row(
+            creature_name, category, subcategory, section_name, creature_data, image=img_url
+        ))
     
     return creatures
 
-def process_creature_image(creature_name, img_url):
+def normalize_creature_image_url(img_url):
     """
-    Processa a imagem da criatura, baixando-a se necessário.
-    
-    Args:
-        creature_name: Nome da criatura
-        img_url: URL da imagem
-        
-    Returns:
-        Caminho para a imagem local ou data URL
+    Corrige e normaliza a URL da imagem de uma criatura.
+    Data URLs são devolvidas como estão.
     """
-    print(f"[DEBUG] Processando imagem para {creature_name}, URL: {img_url}")
-    
     if not img_url:
-        print(f"[DEBUG] URL vazia para {creature_name}")
         return ""
-    
+
     # Corrigir URLs malformadas
     # 1. Se a URL começa com "https:data:" é uma data URL incorreta
     if img_url.startswith("https:data:") or img_url.startswith("http:data:"):
@@ -122,7 +116,6 @@ def process_creature_image(creature_name, img_url):
     
     # 2. Se já for um data URL válido, retornar como está
     if img_url.startswith("data:"):
-        print(f"[DEBUG] Retornando data URL para {creature_name}")
         return img_url
     
     # 3. Certificar que a URL comece com https: se for relativa
@@ -140,6 +133,39 @@ def process_creature_image(creature_name, img_url):
         else:
             img_url += '?format=original'
         print(f"[DEBUG] URL normalizada: {img_url}")
+
+    return img_url
+
+
+def process_creature_image(creature_name, img_url):
+    """
+    Processa a imagem da criatura, baixando-a se necessário.
+    
+    Args:
+        creature_name: Nome da criatura
+        img_url: URL da imagem
+        
+    Returns:
+        Caminho para a imagem local ou data URL
+    """
+    print(f"[DEBUG] Processando imagem para {creature_name}, URL: {img_url}")
+    
+    if not img_url:
+        print(f"[DEBUG] URL vazia para {creature_name}")
+        return ""
+    
+    img_url = normalize_creature_image_url(img_url)
+
+    # Se já for um data URL válido, retornar como está
+    if img_url.startswith("data:"):
+        print(f"[DEBUG] Retornando data URL para {creature_name}")
+        return img_url
+
+    # Modo sob demanda: sem download aqui, só mantém a imagem que já existir
+    # (a URL de origem é gravada junto com o registro)
+    if LAZY_IMAGES:
+        existing = read_creature(creature_name)
+        return (existing.get("image_path") or "") if existing else ""
     
     # Garantir que a pasta de destino existe
     creature_img_folder = "utils/img/creatures"
@@ -196,7 +222,7 @@ def scrap_creatures_from_subcategory(category, subcategory, url):
         url: URL da página da subcategoria
         
     Returns:
-        Lista de criaturas extraídas
+        Lista de criaturas extraídas (CreatureRecord)
     """
     try:
         # Fazer requisição HTTP
@@ -239,7 +265,7 @@ def save_creatures_to_db(creatures):
     Salva as criaturas no banco de dados
     
     Args:
-        creatures: Lista de dicionários com as informações das criaturas
+        creatures: Lista de CreatureRecord (extract_creatures_from_table)
         
     Returns:
         Número de criaturas salvas
@@ -250,19 +276,24 @@ def save_creatures_to_db(creatures):
     for creature in creatures:
         try:
             # Processar a imagem
-            image_path = process_creature_image(creature["name"], creature["image_url"])
+            image_path = process_creature_image(creature.name, creature.image)
             
-            # Salvar no banco de dados
+            # Salvar no banco de dados (de volta ao formato do data_json)
             upsert_creature(
-                creature["name"],
-                creature["category"],
-                creature["subcategory"],
+                creature.name,
+                creature.category,
+                creature.subcategory,
                 image_path,
-                creature["data"]
+                creature_record_to_data(creature)
             )
+
+            # Guardar a URL de origem (usada para baixar o sprite depois, sob demanda)
+            source_url = normalize_creature_image_url(creature.image)
+            if source_url and not source_url.startswith("data:"):
+                set_image_source(creature.name, source_url)
             saved_count += 1
         except Exception as e:
-            print(f"Erro ao salvar criatura {creature['name']}: {str(e)}")
+            print(f"Erro ao salvar criatura {creature.name}: {str(e)}")
     
     return saved_count
 
@@ -296,7 +327,10 @@ def scrap_all_creatures_from_subcategory(category, subcategory, url, progress_ca
     
     if progress_callback:
         progress_callback(f"Salvas {saved_count} criaturas de {subcategory}.")
-    
+
+    # Snapshot colunar lido pelas páginas (services.catalog)
+    publish_creature_catalog()
+
     return saved_count
 
 def extract_creature_details(creature_name):
@@ -312,11 +346,18 @@ def extract_creature_details(creature_name):
     # Formatar URL para a página da criatura
     url = f"https://tibia.fandom.com/wiki/{creature_name.replace(' ', '_')}"
     
+    # Páginas que deram 404 recentemente não são buscadas de novo
+    if is_url_blocked(url):
+        return {"error": f"Página {url} falhou recentemente; nova tentativa adiada"}
+    
     try:
         # Fazer requisição HTTP
         response = requests.get(url, timeout=10)
+        if response.status_code in (404, 410):
+            record_url_failure(url, status=response.status_code)
         if response.status_code != 200:
             return {"error": f"Erro ao acessar a página {url}: HTTP {response.status_code}"}
+        clear_url_failure(url)
         
         # Parsear o HTML
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -514,7 +555,9 @@ def update_creature_details(creature_name):
     image_path = creature.get('image_path', '')
     if "image_url" in new_details:
         img_url = new_details.pop("image_url")  # Remover do dicionário para não duplicar
-        image_path = download_image_if_needed(creature_name, img_url, folder="utils/img/creatures")
+        set_image_source(creature_name, img_url)
+        if not LAZY_IMAGES:
+            image_path = download_image_if_needed(creature_name, img_url, folder="utils/img/creatures")
     
     # Mesclar dados atuais com novos detalhes (novos detalhes têm prioridade)
     updated_data = {**current_data, **new_details}
@@ -1,5 +1,5 @@
 from services.scraping import extract_item_details, process_item_image
-from mydb import read_item, update_item
+from mydb import read_item, update_item, create_table, set_image_source
 import requests
 from bs4 import BeautifulSoup
 
@@ -76,6 +76,9 @@ def force_update_single_item(item_name, update_category=False):
     Returns:
         dict: Dados extraídos do item.
     """
+    # Garante que as tabelas (incluindo as auxiliares de download) existam
+    create_table()
+
     # Prepara a URL para a página do item
     base_url = f"https://tibia.fandom.com/wiki/{item_name.replace(' ', '_')}"
     
@@ -99,9 +102,9 @@ def force_update_single_item(item_name, update_category=False):
     
     # Processar a imagem
     if img_url:
-        image_data_url = process_item_image(item_name, img_url)
+        image_path = process_item_image(item_name, img_url)
     else:
-        image_data_url = ""
+        image_path = ""
     
     # Ler item existente para manter a categoria se necessário
     existing_item = read_item(item_name)
@@ -118,7 +121,9 @@ def force_update_single_item(item_name, update_category=False):
             category = infer_category(item_details, item_name)
             
         # Atualizar o banco de dados com os novos dados
-        update_item(item_name, category, image_data_url, item_details)
+        update_item(item_name, category, image_path, item_details)
+        if img_url:
+            set_image_source(item_name, img_url)
         return item_details
     else:
         # Se o item não existe, criar normalmente usando a função padrão
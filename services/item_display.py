@@ -0,0 +1,658 @@
+import pandas as pd
+import streamlit as st
+
+from services.catalog import extract_resistances
+from services.sprite_prefetch import item_image_urls
+from utils.level_index import items_in, items_in_level_range
+from utils.vocation import mask_to_vocations, ALL_VOCATIONS_MASK
+
+# Tabelas da página Itens por Level: colunas de cada categoria e funções que
+# extraem os valores dos dados do item. Os quadros de exibição por categoria
+# são montados uma vez por geração do catálogo (ver category_display_frame).
+
+
+def get_vocations_display(mask):
+    """Formata a máscara de vocações para exibição na tabela."""
+    if mask == ALL_VOCATIONS_MASK:
+        return "Todas"
+    vocations_list = mask_to_vocations(mask)
+    
+    # Mapeamento para nomes mais amigáveis
+    friendly_names = {
+        'sorcerers': 'Sorcerers',
+        'druids': 'Druids',
+        'knights': 'Knights',
+        'paladins': 'Paladins',
+        'monks': 'Monks'
+    }
+    
+    # Formatar cada vocação
+    formatted = []
+    for voc in vocations_list:
+        if voc in friendly_names:
+            formatted.append(friendly_names[voc])
+        else:
+            formatted.append(voc.capitalize())
+    
+    return ", ".join(formatted)
+
+
+def get_category_config(category):
+    """
+    Obtém a configuração de colunas para uma categoria específica.
+    
+    Args:
+        category (str): Nome da categoria do item.
+        
+    Returns:
+        dict: Configuração com colunas a exibir e funções extratoras.
+    """
+    # CONFIGURAÇÃO DE PROPRIEDADES DE COMBATE POR TIPO DE ITEM
+    # Para adicionar ou remover colunas, basta editar estas listas
+    
+    # Propriedades para armaduras (peças de torso)
+    combat_properties_armors = [
+        "Armor",              # Valor de armadura
+        "Attributes",         # Atributos mágicos
+        "Resistances",        # Proteções elementais
+        "Imbuing Slots",      # Slots de imbuement
+        "Augments",           # Augmentos
+        "Hands",              # Mãos
+        "Mantra",             # Mantra
+        "Resists",            # Proteções elementais
+        "Upgrade Classification"  # Classificação de upgrade
+    ]
+    
+    # Propriedades para capacetes
+    combat_properties_helmets = [
+        "Armor",              # Valor de armadura
+        "Attributes",         # Atributos mágicos
+        "Augments",           # Augmentos
+        "Hands",              # Mãos
+        "Imbuing Slots",      # Slots de imbuement
+        "Mantra",             # Mantra
+        "Resists",            # Proteções elementais
+        "Upgrade Classification"  # Classificação de upgrade
+    ]
+    
+    # Propriedades para perneiras
+    combat_properties_legs = [
+        "Armor",              # Valor de armadura
+        "Attributes",         # Atributos mágicos
+        "Augments",           # Augmentos
+        "Imbuing Slots",      # Slots de imbuement
+        "Mantra",             # Mantra
+        "Resists",            # Proteções elementais
+        "Upgrade Classification"  # Classificação de upgrade
+    ]
+    
+    # Propriedades para botas
+    combat_properties_boots = [
+        "Armor",              # Valor de armadura
+        "Attributes",         # Atributos mágicos
+        "Augments",           # Augmentos
+        "Hands",              # Mãos
+        "Imbuing Slots",      # Slots de imbuement
+        "Mantra",             # Mantra
+        "Resists",            # Proteções elementais
+        "Upgrade Classification"  # Classificação de upgrade
+    ]
+    
+    # Propriedades para amuletos e colares
+    combat_properties_amulets = [
+        "Resists",            # Proteções elementais
+        "Charges",            # Cargas
+        "Armor",              # Valor de armadura
+        "Attributes",         # Atributos mágicos
+        "Mantra",             # Mantra
+    ]
+    
+    # Propriedades para escudos
+    combat_properties_shields = [
+        "Attributes",         # Atributos mágicos
+        "Augments",           # Augmentos
+        "Defense",            # Valor de defesa
+        "Imbuing Slots",      # Slots de imbuement
+        "Resists",            # Proteções elementais
+    ]
+    
+    # Propriedades para armas físicas
+    combat_properties_weapons = [
+        "Hands",              # Mãos
+        "Defense",            # Valor de defesa
+        "Upgrade Classification",  # Classificação de upgrade
+        "Attack",             # Valor de ataque
+        "Imbuing Slots",      # Slots de imbuement
+        "Defense Modifier",   # Modificador de defesa
+        "Attributes",         # Atributos mágicos
+        "Fire Attack",        # Ataque de fogo
+        "Augments",           # Augmentos
+        "Life Leech",         # Life Leech
+        "Critical Hit",       # Critical Hit
+        "Mana Leech",         # Mana Leech
+        "Ice Attack",         # Ataque de gelo
+        "Earth Attack",       # Ataque de terra
+        "Death Attack",       # Ataque de morte
+        "Energy Attack",      # Ataque de energia
+        "Resists",            # Proteções elementais
+    ]
+    
+    # Propriedades para armas mágicas (Wands, Rods)
+    combat_properties_magic_weapons = [
+        "Attributes",         # Atributos mágicos
+        "Augments",           # Augmentos
+        "Charges",            # Cargas
+        "Critical Hit",       # Critical Hit
+        "Damage",             # Dano
+        "Element",            # Elemento
+        "Imbuing Slots",      # Slots de imbuement
+        "Life Leech",         # Life Leech
+        "Mana",              # Mana
+        "Mana Leech",         # Mana Leech
+        "Range",             # Alcance
+        "Resists",            # Proteções elementais
+        "Upgrade Classification"  # Classificação de upgrade
+    ]
+    
+    # Propriedades para anéis
+    combat_properties_rings = [
+        "Attributes",         # Atributos mágicos
+        "Resists",            # Proteções elementais
+        "Armor",              # Valor de armadura
+        "Mana Leech",         # Mana Leech
+        "Charges",            # Cargas
+        "Mantra",             # Mantra
+    ]
+
+    # Propriedades para Quivers
+    combat_properties_quivers = [
+        "Attributes",         # Atributos mágicos
+        "Resistances"         # Proteções elementais
+    ]
+
+    # Propriedades para Throwing Weapons
+    combat_properties_throwing_weapons = [
+        "Hands",
+        "Attack",             # Valor de ataque
+        "Defense",            # Valor de defesa
+        "Range",              # Alcance
+        "Earth Attack",       # Ataque de terra
+        "Fire Attack",        # Ataque de fogo
+    ]
+        
+    # Propriedades para Spellbooks
+    combat_properties_spellbooks = [
+        "Defense",            # Valor de defesa
+        "Attributes",         # Atributos mágicos
+        "Imbuing Slots",      # Slots de imbuement
+        "Resists",            # Proteções elementais
+        "Augments",           # Augmentos
+    ]
+
+
+
+    # FUNÇÕES EXTRATORAS - Não é necessário editar essa parte
+    
+    # Dicionário de funções extratoras para cada propriedade de combate
+    property_extractors = {
+        "Armor": lambda data: _extract_simple_property(data, "Armor"),
+        "Defense": lambda data: _extract_simple_property(data, "Defense"),
+        "Attack": lambda data: _extract_simple_property(data, "Attack"),
+        "Defense Modifier": lambda data: _extract_defense_modifier(data),
+        "Attributes": lambda data: _extract_attributes(data),
+        "Imbuing Slots": lambda data: _extract_imbuing_slots(data),
+        "Range": lambda data: _extract_simple_property(data, "Range"),
+        "Element": lambda data: _extract_element(data),
+        "Damage": lambda data: _extract_damage(data),
+        "Life Leech": lambda data: _extract_leech(data, "Life Leech", "life leech"),
+        "Mana Leech": lambda data: _extract_leech(data, "Mana Leech", "mana leech"),
+        "Mana": lambda data: _extract_mana(data),
+        "Resistances": lambda data: extract_resistances(data),
+        "Charges": lambda data: _extract_charges(data),
+        "Resists": lambda data: _extract_resists(data),
+        "Hands": lambda data: _extract_simple_property(data, "Hands"),
+        "Augments": lambda data: _extract_simple_property(data, "Augments"),
+        "Critical Hit": lambda data: _extract_critical_hit(data),
+        "Mantra": lambda data: _extract_simple_property(data, "Mantra"),
+        "Upgrade Classification": lambda data: _extract_simple_property(data, "Upgrade Classification"),
+        "Fire Attack": lambda data: _extract_simple_property(data, "Fire Attack"),
+        "Ice Attack": lambda data: _extract_simple_property(data, "Ice Attack"),
+        "Energy Attack": lambda data: _extract_simple_property(data, "Energy Attack"),
+        "Earth Attack": lambda data: _extract_simple_property(data, "Earth Attack"),
+        "Death Attack": lambda data: _extract_simple_property(data, "Death Attack")
+    }
+    
+    # Dicionário de nomes de exibição para cada propriedade
+    property_display_names = {
+        "Armor": "Armadura",
+        "Defense": "Defesa",
+        "Attack": "Ataque",
+        "Defense Modifier": "Mod. Defesa",
+        "Attributes": "Atributos",
+        "Imbuing Slots": "Slots de Imbuement",
+        "Range": "Alcance",
+        "Element": "Elemento",
+        "Damage": "Dano",
+        "Life Leech": "Life Leech",
+        "Mana Leech": "Mana Leech",
+        "Mana": "Mana",
+        "Resistances": "Proteções Elementais",
+        "Charges": "Cargas",
+        "Resists": "Proteções",
+        "Hands": "Mãos",
+        "Augments": "Augmentos",
+        "Critical Hit": "Crítico",
+        "Mantra": "Mantra",
+        "Upgrade Classification": "Classificação de Upgrade",
+        "Fire Attack": "Ataque de Fogo",
+        "Ice Attack": "Ataque de Gelo",
+        "Energy Attack": "Ataque de Energia",
+        "Earth Attack": "Ataque de Terra",
+        "Death Attack": "Ataque de Morte"
+    }
+    
+    # Configuração base para todas as categorias
+    config = {
+        'extractors': {},
+        'column_config': {
+            "image_path": st.column_config.ImageColumn(
+                "Imagem",
+                help="Sprite do item",
+                width="small"
+            ),
+            "item_name": st.column_config.TextColumn(
+                "Item",
+                help="Nome do item",
+                width="medium"
+            ),
+            "url": st.column_config.LinkColumn(
+                "Wiki",
+                help="Link para a wiki do Tibia",
+                width="small",
+                display_text="Wiki"
+            ),
+            "Level": "Level",
+            "Vocações": "Vocações"
+        }
+    }
+    
+    # Selecionar as propriedades corretas conforme a categoria
+    selected_properties = []
+    
+    # Detectar qual tipo de item é com base no nome da categoria
+    if category == 'Armors':
+        selected_properties = combat_properties_armors
+    elif category == 'Helmets':
+        selected_properties = combat_properties_helmets
+    elif category == 'Legs':
+        selected_properties = combat_properties_legs
+    elif category == 'Boots':
+        selected_properties = combat_properties_boots
+    elif category == 'Amulets_and_Necklaces':
+        selected_properties = combat_properties_amulets
+    elif category == 'Shields':
+        selected_properties = combat_properties_shields
+    elif category in ['Axes', 'Clubs', 'Swords', 'Distance_Weapons', 'Throwing_Weapons']:
+        selected_properties = combat_properties_weapons
+    elif category in ['Wands', 'Rods']:
+        selected_properties = combat_properties_magic_weapons
+    elif category == 'Rings':
+        selected_properties = combat_properties_rings
+    
+    # Adicionar as propriedades selecionadas à configuração
+    for prop in selected_properties:
+        if prop in property_extractors:
+            # Usar o nome da propriedade como chave para acessar na tabela
+            config['extractors'][prop] = property_extractors[prop]
+            # Usar o nome de exibição para o cabeçalho da coluna
+            config['column_config'][prop] = property_display_names.get(prop, prop)
+    
+    return config
+
+# Funções auxiliares de extração - chamadas pelas funções extratoras
+
+def _extract_simple_property(data, property_name):
+    """Extrai uma propriedade simples das Combat Properties"""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if property_name in data['Combat Properties']:
+                value = data['Combat Properties'][property_name]
+                
+                # Tratar diferentes tipos de valores
+                if isinstance(value, (int, float)):
+                    # Para valores numéricos, mostrar com + para valores positivos
+                    if value > 0:
+                        return f"+{value}"
+                    return str(value)
+                elif isinstance(value, bool):
+                    # Para valores booleanos, mostrar "Sim" ou "Não"
+                    return "Sim" if value else "Não"
+                elif isinstance(value, list):
+                    # Para listas, juntar os valores com vírgula
+                    return ", ".join(str(v) for v in value)
+                else:
+                    # Para outros tipos, converter para string
+                    return str(value)
+    return ""
+
+def _extract_defense_modifier(data):
+    """Extrai modificador de defesa para armas"""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if 'Defense Modifier' in data['Combat Properties']:
+                value = data['Combat Properties']['Defense Modifier']
+                if isinstance(value, int) or isinstance(value, float):
+                    # Se for positivo, adicionar o sinal de +
+                    if value > 0:
+                        return f"+{value}"
+                    return str(value)
+                return str(value)
+    return ""
+
+def _extract_attributes(data):
+    """Extrai atributos mágicos diretamente"""
+    result = ""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if 'Attributes' in data['Combat Properties']:
+                attributes = data['Combat Properties']['Attributes']
+                if attributes:
+                    if isinstance(attributes, dict):
+                        # Iterar por todos os atributos disponíveis
+                        attr_parts = []
+                        for attr_key, attr_value in attributes.items():
+                            # Converter para CamelCase
+                            attr_display = ' '.join(word.capitalize() for word in attr_key.split())
+                            attr_parts.append(f"{attr_display} +{attr_value}")
+                        result = ", ".join(attr_parts)
+                    else:
+                        # Se for um valor simples, exibir de forma genérica
+                        result = f"Atributos +{attributes}"
+    return result
+
+def _extract_imbuing_slots(data):
+    """Extrai os slots de imbuement de um item"""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if 'Imbuing Slots' in data['Combat Properties']:
+                slots = data['Combat Properties']['Imbuing Slots']
+                if isinstance(slots, int):
+                    return str(slots)
+                return str(slots)
+    return "0"
+
+def _extract_element(data):
+    """Extrai elemento de armas mágicas"""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if 'Element' in data['Combat Properties']:
+                return str(data['Combat Properties']['Element']).capitalize()
+    return ""
+
+def _extract_damage(data):
+    """Extrai dano de armas mágicas de forma amigável"""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if 'Damage' in data['Combat Properties']:
+                damage_value = data['Combat Properties']['Damage']
+                
+                # Se for uma string, retornar diretamente
+                if isinstance(damage_value, str):
+                    return damage_value
+                
+                # Se for um número simples, formatar com + se necessário
+                if isinstance(damage_value, (int, float)):
+                    if damage_value > 0:
+                        return f"+{damage_value}"
+                    return str(damage_value)
+                
+                # Se for um range/lista, formatar como "X~Y"
+                if isinstance(damage_value, list) and len(damage_value) == 2:
+                    return f"{damage_value[0]}~{damage_value[1]}"
+                
+                # Se for um dicionário (normalmente elemento + dano)
+                if isinstance(damage_value, dict):
+                    result_parts = []
+                    for element, value in damage_value.items():
+                        # Capitalizar o elemento (ex: fire -> Fire)
+                        element_display = element.capitalize()
+                        
+                        # Formatar o valor, que pode ser um número ou um range
+                        if isinstance(value, (int, float)):
+                            result_parts.append(f"{element_display}: {value}")
+                        elif isinstance(value, list) and len(value) == 2:
+                            result_parts.append(f"{element_display}: {value[0]}~{value[1]}")
+                        else:
+                            result_parts.append(f"{element_display}: {value}")
+                    
+                    return ", ".join(result_parts)
+                
+                # Fallback para qualquer outro formato
+                return str(damage_value)
+    return ""
+
+def _extract_leech(data, property_name, attribute_name):
+    """Extrai valores de leech (life ou mana)"""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if property_name in data['Combat Properties']:
+                value = data['Combat Properties'][property_name]
+                if isinstance(value, (int, float)):
+                    return f"{value}%"
+                return str(value)
+            # Verificar também em Attributes para compatibilidade
+            elif 'Attributes' in data['Combat Properties']:
+                attr = data['Combat Properties']['Attributes']
+                if isinstance(attr, dict) and attribute_name in attr:
+                    return f"{attr[attribute_name]}%"
+    return ""
+
+def _extract_mana(data):
+    """Extrai valor de Mana diretamente das Combat Properties"""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if 'Mana' in data['Combat Properties']:
+                value = data['Combat Properties']['Mana']
+                if isinstance(value, (int, float)) and value > 0:
+                    return f"+{value}"
+                return str(value)
+    return ""
+
+def _extract_resists(data):
+    """Extrai valores de resistências específicas do campo 'Resists'"""
+    if not isinstance(data, dict):
+        return ""
+        
+    if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+        # Se o campo Resists existir diretamente
+        if 'Resists' in data['Combat Properties']:
+            resists = data['Combat Properties']['Resists']
+            
+            # Se for um dicionário, processar cada elemento
+            if isinstance(resists, dict):
+                resist_parts = []
+                
+                # Mapear nomes de elementos em inglês para português
+                elem_map = {
+                    'physical': 'Físico',
+                    'earth': 'Terra',
+                    'fire': 'Fogo',
+                    'ice': 'Gelo',
+                    'energy': 'Energia',
+                    'holy': 'Sagrado',
+                    'death': 'Morte'
+                }
+                
+                # Processar cada resistência
+                for elem, value in resists.items():
+                    # Verificar se é um elemento conhecido (caso sensível)
+                    elem_lower = elem.lower()
+                    if elem_lower in elem_map:
+                        display_name = elem_map[elem_lower]
+                    else:
+                        # Se não for um dos elementos conhecidos, usar o nome como está
+                        display_name = elem.capitalize()
+                    
+                    # Formatar o valor, adicionando % se for um número
+                    if isinstance(value, (int, float)):
+                        resist_parts.append(f"{display_name}: {value}%")
+                    else:
+                        resist_parts.append(f"{display_name}: {value}")
+                
+                return ", ".join(resist_parts)
+            elif isinstance(resists, str):
+                # Se for uma string, retornar diretamente
+                return resists
+            else:
+                # Outros casos, converter para string
+                return str(resists)
+    
+    # Se não encontrarmos o campo Resists, tentar usar a função de resistências gerais
+    return extract_resistances(data)
+
+def _extract_charges(data):
+    """Extrai as cargas de um item (especialmente amuletos)"""
+    if isinstance(data, dict):
+        # Verificar em diversas estruturas possíveis
+        
+        # 1. Verificar diretamente no campo Charges do nível superior
+        if "Charges" in data and (isinstance(data["Charges"], int) or isinstance(data["Charges"], str)):
+            return str(data["Charges"])
+            
+        # 2. Verificar em Combat Properties > Charges
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if 'Charges' in data['Combat Properties']:
+                charges = data['Combat Properties']['Charges']
+                return str(charges)
+                
+        # 3. Verificar em General Properties > Charges
+        if 'General Properties' in data and isinstance(data['General Properties'], dict):
+            if 'Charges' in data['General Properties']:
+                charges = data['General Properties']['Charges']
+                return str(charges)
+                
+        # 4. Procurar em qualquer campo que contenha informações de carga
+        for section_name, section_data in data.items():
+            if isinstance(section_data, dict):
+                if 'Charges' in section_data:
+                    return str(section_data['Charges'])
+                    
+                # Verificar também versões alternativas do nome
+                # (ex: "charge", "max charges", etc.)
+                for key in section_data.keys():
+                    if 'charg' in key.lower():
+                        return str(section_data[key])
+    
+    # Se não encontrou em nenhum lugar
+    return ""
+
+def _extract_critical_hit(data):
+    """Extrai o valor de Critical Hit e formata como porcentagem se necessário"""
+    if isinstance(data, dict):
+        if 'Combat Properties' in data and isinstance(data['Combat Properties'], dict):
+            if 'Critical Hit' in data['Combat Properties']:
+                value = data['Combat Properties']['Critical Hit']
+                
+                # Se for numérico, formatar como porcentagem
+                if isinstance(value, (int, float)):
+                    return f"{value}%"
+                # Se for booleano, converter para "Sim/Não"
+                elif isinstance(value, bool):
+                    return "Sim" if value else "Não"
+                # Outros formatos, retornar como estão
+                return str(value)
+    return ""
+
+
+# Valores que contam como "vazio" ao decidir quais colunas esconder
+EMPTY_VALUES = ["", "0", "0%", "-", "Não"]
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def category_display_frame(generation, category, _catalog, _level_index):
+    """
+    Quadro de exibição de todos os itens de uma categoria, montado uma vez
+    por geração do catálogo: nome, level, vocações, colunas da categoria
+    (get_category_config) e link da wiki. O índice é a posição do item no
+    catálogo (catalog.iloc), o mesmo do índice de level.
+
+    Args:
+        generation (int): geração do catálogo (get_item_catalog_snapshot)
+        category (str): categoria dos itens
+        _catalog (pd.DataFrame): catálogo dessa geração (não entra na chave)
+        _level_index (dict): índice de level dessa geração (não entra na chave)
+
+    Returns:
+        dict: {"frame": quadro completo, "empty": células vazias das colunas
+        extraídas (bool), "column_config": configuração das colunas}.
+        Compartilhado entre as sessões: não altere no lugar.
+    """
+    positions = items_in(_level_index, category=category)
+    items = _catalog.iloc[positions].set_axis(positions)
+    category_config = get_category_config(category)
+
+    frame = pd.DataFrame({
+        'item_name': items['item_name'],
+        'Level': items['level'],
+        'Vocações': items['vocation_mask'].map(get_vocations_display),
+    }, index=items.index)
+    for col_name, extractor_func in category_config['extractors'].items():
+        frame[col_name] = items['data_dict'].map(extractor_func)
+
+    extracted = frame[list(category_config['extractors'])]
+    empty = extracted.isna() | extracted.isin(EMPTY_VALUES)
+
+    # Links para a wiki do Tibia
+    frame['url'] = "https://tibia.fandom.com/wiki/" + items['item_name'].str.replace(' ', '_')
+
+    return {"frame": frame, "empty": empty, "column_config": category_config['column_config']}
+
+
+def category_display(display_frame, positions):
+    """
+    Linhas visíveis (posições do catálogo, vindas do filtro de level e
+    vocação) de um quadro de category_display_frame, sem as colunas
+    extraídas que ficam vazias em todas elas.
+
+    Returns:
+        tuple: (DataFrame para exibição, configuração das colunas)
+    """
+    all_empty = display_frame["empty"].loc[positions].all()
+    cols_to_remove = list(all_empty.index[all_empty])
+    display_df = display_frame["frame"].loc[positions].drop(columns=cols_to_remove)
+    column_config = {
+        col: config for col, config in display_frame["column_config"].items()
+        if col not in cols_to_remove
+    }
+    return display_df, column_config
+
+
+def category_table(catalog, level_index, generation, category, min_level, max_level, vocation):
+    """
+    Tabela de uma categoria para a faixa de level e a vocação: quadro de
+    exibição, configuração das colunas e as linhas do catálogo (para os
+    sprites, ver with_sprite_urls). None se não houver itens.
+    """
+    positions = items_in_level_range(
+        level_index, min_level, max_level, vocation=vocation, category=category
+    )
+    if not len(positions):
+        return None
+    items = catalog.iloc[positions]
+    display_df, column_config = category_display(
+        category_display_frame(generation, category, catalog, level_index), positions
+    )
+    return display_df, column_config, items
+
+
+def with_sprite_urls(display_df, items, size=32):
+    """
+    Quadro de category_table com a coluna de miniaturas na frente. As URLs
+    são pedidas a cada exibição, fora do cache de filtros: uma miniatura
+    apagada pela limpeza do cache volta a ser gerada em vez de virar 404.
+    Sprites ainda não baixados aparecem pela URL de origem e entram na fila
+    de download.
+    """
+    display_df = display_df.copy(deep=False)
+    display_df.insert(0, 'image_path', item_image_urls(items, size=size))
+    return display_df
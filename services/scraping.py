@@ -1,11 +1,19 @@
 import streamlit as st
-from mydb import download_image_if_needed, create_table, upsert_item, read_item
+from mydb import (
+    download_image_if_needed, create_table, upsert_item, read_item,
+    is_url_blocked, record_url_failure, clear_url_failure, read_sprite_path,
+    store_sprite, store_sprite_bytes, set_sprite_hash, set_image_source,
+)
 import requests
 from bs4 import BeautifulSoup
 import time
 import json
 import os
-from utils.core import to_data_url
+from utils.core import data_url_to_binary
+from utils.config import SPRITE_STORE_DIR, LAZY_IMAGES
+from utils.image_index import find_image, item_image_folders
+from utils.vocation import item_vocation_mask
+from services.catalog import publish_item_catalog
 import re
 
 # Lista de categorias conhecidas
@@ -31,13 +39,14 @@ KNOWN_CATEGORIES = {
 }
 
 
-def image_exists(item_name, folder="utils/img"):
+def image_exists(item_name, folder=None, category=None):
     """
     Verifica se a imagem já existe localmente.
     
     Args:
         item_name (str): Nome do item para verificar
-        folder (str): Pasta onde as imagens são armazenadas
+        folder (str): Pasta específica onde procurar (opcional)
+        category (str): Categoria do item, para procurar em utils/img/itens/<categoria>
         
     Returns:
         str: Caminho da imagem se existir, None caso contrário
@@ -50,26 +59,24 @@ def image_exists(item_name, folder="utils/img"):
         # Verificar se o caminho é um data URL ou um caminho de arquivo
         if image_path.startswith("data:"):
             return image_path  # Já é um data URL, não precisa baixar novamente
-        
+
+    # Sprite já guardado no store: localizado pelo hash, sem depender do nome do arquivo
+    if existing_item and existing_item.get("sprite_hash"):
+        sprite_path = read_sprite_path(existing_item["sprite_hash"])
+        if sprite_path and os.path.exists(sprite_path):
+            return sprite_path
+
+    if existing_item and existing_item.get("image_path"):
+        image_path = existing_item["image_path"]
+
         # Se é um caminho de arquivo, verificar se o arquivo existe
         if os.path.exists(image_path):
             return image_path
             
-    # Verificar possíveis nomes de arquivo na pasta de imagens
+    # Procurar pelo nome no índice de arquivos das pastas de imagens
     # (útil caso o item exista mas o caminho no banco esteja incorreto)
-    if os.path.exists(folder):
-        for filename in os.listdir(folder):
-            name_without_ext = os.path.splitext(filename)[0]
-            
-            # Tentar diferentes formatos de nome: original, sem espaços, etc.
-            clean_item_name = item_name.replace(" ", "_").lower()
-            clean_filename = name_without_ext.replace(" ", "_").lower()
-            
-            if clean_item_name == clean_filename:
-                return os.path.join(folder, filename)
-    
-    # Não encontrou imagem existente
-    return None
+    folders = [folder] if folder else item_image_folders(category)
+    return find_image(item_name, folders)
 
 
 def process_special_values(value):
@@ -270,10 +277,19 @@ def extract_item_details(item_url):
     Returns:
         dict: Dicionário com os atributos detalhados do item
     """
+    # Páginas que deram 404 recentemente não são buscadas de novo
+    if is_url_blocked(item_url):
+        print(f"[CACHE NEGATIVO] Pulando página que falhou recentemente: {item_url}")
+        return {}
+
     try:
         response = requests.get(item_url)
+        if response.status_code in (404, 410):
+            record_url_failure(item_url, status=response.status_code)
+            return {}
         if response.status_code != 200:
             return {}
+        clear_url_failure(item_url)
         
         soup = BeautifulSoup(response.text, 'html.parser')
         
@@ -520,25 +536,41 @@ def process_item_image(item_name, img_url, category=None):
         category (str): Categoria do item para organizar em pastas
         
     Returns:
-        str: URL de dados da imagem ou caminho local
+        str: Caminho da imagem no store de sprites (ou o caminho/data URL
+        original, se não for possível guardá-la)
     """
     # Verifica se a imagem já existe
-    existing_image = image_exists(item_name)
+    existing_image = image_exists(item_name, category=category)
     
     if existing_image:
         # Se a imagem já existe, usar o caminho existente
         image_path_local = existing_image
+    elif LAZY_IMAGES:
+        # Modo sob demanda: o sprite é baixado quando alguma página o exibir
+        return ""
     else:
-        # Se não existe, baixar a imagem
+        # Se não existe, baixar a imagem (já volta com o caminho no store)
         image_path_local = download_image_if_needed(item_name, img_url, category=category)
-        
-    # Converter a imagem para data URL se não for um
-    if not existing_image or not existing_image.startswith("data:"):
-        image_data_url = to_data_url(image_path_local)
-    else:
-        image_data_url = existing_image
-        
-    return image_data_url
+
+    if not image_path_local:
+        return ""
+
+    # Registros antigos guardavam a imagem como data URL; o conteúdo vai
+    # para o store e o banco passa a guardar só o caminho do arquivo,
+    # que as páginas servem como arquivo estático
+    try:
+        if image_path_local.startswith("data:"):
+            content, ext = data_url_to_binary(image_path_local)
+            if content:
+                digest, image_path_local = store_sprite_bytes(content, ext)
+                set_sprite_hash(item_name, digest)
+        elif not image_path_local.startswith(SPRITE_STORE_DIR):
+            digest, image_path_local = store_sprite(image_path_local)
+            set_sprite_hash(item_name, digest)
+    except OSError as e:
+        print(f"[DEBUG] Não foi possível guardar a imagem de {item_name} no store: {e}")
+
+    return image_path_local
 
 
 def process_and_save_item(item_name, item_details, category, image_url):
@@ -557,15 +589,23 @@ def process_and_save_item(item_name, item_details, category, image_url):
     # Inferir categoria se não fornecida
     if not category or category == "Unknown":
         category = infer_category(item_details, item_name)
+
+    # Máscara de vocações calculada uma vez, junto com os dados
+    vocation_mask = item_vocation_mask(item_name, category, item_details)
     
     # Processar a imagem
     if image_url:
-        image_data_url = process_item_image(item_name, image_url, category=category)
+        image_path = process_item_image(item_name, image_url, category=category)
     else:
-        image_data_url = ""
+        image_path = ""
     
-    # Atualizar o banco de dados
-    upsert_item(item_name, category, image_data_url, item_details)
+    # Atualizar o banco de dados: os dados vão como vieram do infobox (a
+    # ordem das seções no data_json não muda entre um scraping e outro)
+    upsert_item(item_name, category, image_path, item_details, vocation_mask=vocation_mask)
+
+    # Guardar a URL de origem (usada para baixar o sprite depois, sob demanda)
+    if image_url:
+        set_image_source(item_name, image_url)
     
     return item_details
 
@@ -776,7 +816,7 @@ def scrap(category=None):
                 cat_processed_items += 1
                 
                 # Contar imagens reutilizadas
-                if image_exists(item_name):
+                if image_exists(item_name, category=cat):
                     images_skipped += 1
             else:
                 st.warning("Item ignorado: nome inválido ou vazio")
@@ -803,6 +843,9 @@ def scrap(category=None):
         )
         st.success(msg)
 
+    # Snapshot colunar lido pelas páginas na partida (services.catalog)
+    publish_item_catalog()
+
 
 def scrap_missing_items(category=None):
     """
@@ -899,6 +942,7 @@ def scrap_missing_items(category=None):
             processed_items += 1
             progress_bar.progress((processed_items + skipped_items) / total_items)
     st.success(f"Processo concluído: {processed_items} novos itens adicionados, {skipped_items} já existiam.")
+    publish_item_catalog()
 
 # Adicionando função auxiliar para extração do nome do item
 def extract_item_name(cols, cat):
@@ -0,0 +1,235 @@
+import hashlib
+import html
+import json
+import os
+import threading
+
+from PIL import Image
+
+from mydb import read_sprite_assignments
+from utils.config import SPRITE_ATLAS_DIR
+from utils.core import image_url
+
+# Cada sprite ocupa uma célula de CELL_SIZE x CELL_SIZE pixels (os sprites do
+# Tibia têm 32x32 ou 64x64); cada folha tem ATLAS_COLUMNS x ATLAS_COLUMNS células
+CELL_SIZE = 64
+ATLAS_COLUMNS = 16
+SLOTS_PER_SHEET = ATLAS_COLUMNS * ATLAS_COLUMNS
+
+ATLAS_MAP_FILE = os.path.join(SPRITE_ATLAS_DIR, "atlas.json")
+
+# Mapa carregado em memória, recarregado quando o arquivo muda
+_cached_atlas = None
+_cached_mtime = None
+_build_lock = threading.Lock()
+
+# Geração já conferida por escopo ("itens", "criaturas") e a reconstrução
+# em segundo plano em andamento (ensure_atlas)
+_checked_generations = {}
+_rebuild_thread = None
+_rebuild_lock = threading.Lock()
+
+
+def _empty_atlas():
+    return {"cell": CELL_SIZE, "columns": ATLAS_COLUMNS, "sheets": [], "sprites": {}, "names": {}}
+
+
+def load_atlas():
+    """Lê o mapa do atlas (atlas.json). Retorna um atlas vazio se não existir."""
+    global _cached_atlas, _cached_mtime
+    try:
+        mtime = os.path.getmtime(ATLAS_MAP_FILE)
+    except OSError:
+        return _empty_atlas()
+
+    if _cached_atlas is None or mtime != _cached_mtime:
+        with open(ATLAS_MAP_FILE, "r", encoding="utf-8") as f:
+            _cached_atlas = json.load(f)
+        _cached_mtime = mtime
+    return _cached_atlas
+
+
+def _load_first_frame(path):
+    """Abre o sprite e devolve o primeiro quadro em RGBA, cabendo na célula."""
+    with Image.open(path) as img:
+        img.seek(0)
+        frame = img.convert("RGBA")
+    if frame.width > CELL_SIZE or frame.height > CELL_SIZE:
+        frame.thumbnail((CELL_SIZE, CELL_SIZE))
+    return frame
+
+
+def _render_sheet(index, slots, paths):
+    """
+    Monta uma folha do atlas a partir da lista de slots (hash ou None).
+    Retorna (caminho da folha, {hash: [folha, x, y, w, h]}).
+    """
+    rows = max(1, -(-len(slots) // ATLAS_COLUMNS))
+    sheet = Image.new("RGBA", (ATLAS_COLUMNS * CELL_SIZE, rows * CELL_SIZE), (0, 0, 0, 0))
+    entries = {}
+
+    for slot, digest in enumerate(slots):
+        if digest is None:
+            continue
+        x = (slot % ATLAS_COLUMNS) * CELL_SIZE
+        y = (slot // ATLAS_COLUMNS) * CELL_SIZE
+        try:
+            frame = _load_first_frame(paths[digest])
+        except (OSError, KeyError) as e:
+            print(f"[DEBUG ATLAS] Não foi possível ler o sprite {digest}: {e}")
+            continue
+        sheet.paste(frame, (x, y))
+        entries[digest] = [index, x, y, frame.width, frame.height]
+
+    # A versão entra no nome do arquivo: o navegador pode guardar a folha
+    # em cache indefinidamente e a URL muda quando o conteúdo muda
+    version = hashlib.sha256("|".join(d or "" for d in slots).encode()).hexdigest()[:12]
+    sheet_path = os.path.join(SPRITE_ATLAS_DIR, f"sheet_{index}_{version}.png")
+    if not os.path.exists(sheet_path):
+        tmp = f"{sheet_path}.tmp"
+        sheet.save(tmp, format="PNG", optimize=True)
+        os.replace(tmp, sheet_path)
+    return sheet_path, entries
+
+
+def build_atlas(force=False):
+    """
+    Gera (ou atualiza) as folhas do atlas com todos os sprites de itens e
+    criaturas que estão no store.
+
+    A reconstrução é incremental: sprites que continuam em uso mantêm a
+    posição, os novos ocupam as vagas livres e só as folhas que mudaram
+    são gravadas de novo. Com force=True tudo é refeito do zero.
+
+    Returns:
+        dict: O mapa do atlas (também gravado em atlas.json).
+    """
+    with _build_lock:
+        previous = _empty_atlas() if force else load_atlas()
+        assignments = read_sprite_assignments()
+        names = {name: digest for name, digest, _path in assignments}
+        paths = {digest: path for _name, digest, path in assignments}
+
+        # Slots anteriores de cada folha; sprites que saíram liberam a vaga
+        sheets_slots = [list(sheet["slots"]) for sheet in previous["sheets"]]
+        dirty = set()
+        placed = set()
+        for index, slots in enumerate(sheets_slots):
+            for slot, digest in enumerate(slots):
+                if digest is None:
+                    continue
+                if digest not in paths or digest in placed:
+                    slots[slot] = None
+                    dirty.add(index)
+                else:
+                    placed.add(digest)
+
+        # Sprites novos: primeiro nas vagas livres, depois em folhas novas
+        new_sprites = sorted(digest for digest in paths if digest not in placed)
+        free_slots = [
+            (index, slot)
+            for index, slots in enumerate(sheets_slots)
+            for slot, digest in enumerate(slots) if digest is None
+        ]
+        for digest in new_sprites:
+            if free_slots:
+                index, slot = free_slots.pop(0)
+                sheets_slots[index][slot] = digest
+            else:
+                if not sheets_slots or len(sheets_slots[-1]) >= SLOTS_PER_SHEET:
+                    sheets_slots.append([])
+                sheets_slots[-1].append(digest)
+                index = len(sheets_slots) - 1
+            dirty.add(index)
+
+        if not dirty and not force and previous.get("names") == names:
+            return previous
+
+        os.makedirs(SPRITE_ATLAS_DIR, exist_ok=True)
+        atlas = _empty_atlas()
+        atlas["names"] = names
+        for index, slots in enumerate(sheets_slots):
+            old_sheet = previous["sheets"][index] if index < len(previous["sheets"]) else None
+            if index in dirty or old_sheet is None or not os.path.exists(old_sheet["file"]):
+                sheet_path, entries = _render_sheet(index, slots, paths)
+                print(f"[DEBUG ATLAS] Folha {index} gerada: {sheet_path} ({len(entries)} sprites)")
+            else:
+                sheet_path = old_sheet["file"]
+                entries = {
+                    digest: previous["sprites"][digest]
+                    for digest in slots if digest in previous["sprites"]
+                }
+
+            atlas["sheets"].append({"file": sheet_path, "slots": slots})
+            atlas["sprites"].update(entries)
+
+        tmp = f"{ATLAS_MAP_FILE}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(atlas, f)
+        os.replace(tmp, ATLAS_MAP_FILE)
+
+        # Remove as folhas antigas que o novo mapa não usa mais
+        in_use = {os.path.basename(sheet["file"]) for sheet in atlas["sheets"]}
+        for filename in os.listdir(SPRITE_ATLAS_DIR):
+            if filename.startswith("sheet_") and filename.endswith(".png") and filename not in in_use:
+                os.remove(os.path.join(SPRITE_ATLAS_DIR, filename))
+        return atlas
+
+
+def _rebuild_in_background():
+    """Dispara build_atlas numa thread (uma por vez)."""
+    global _rebuild_thread
+
+    def run():
+        try:
+            build_atlas()
+        except OSError as e:
+            print(f"[DEBUG ATLAS] Não foi possível atualizar o atlas: {e}")
+
+    with _rebuild_lock:
+        if _rebuild_thread is not None and _rebuild_thread.is_alive():
+            return
+        _rebuild_thread = threading.Thread(target=run, name="atlas-rebuild", daemon=True)
+        _rebuild_thread.start()
+
+
+def ensure_atlas(scope, generation):
+    """
+    Atlas para as páginas. A conferência com os sprites do banco é feita uma
+    vez por geração do catálogo de cada escopo ("itens" com a geração do
+    feed, "criaturas" com a da tabela); se faltar algum sprite, as folhas são
+    refeitas em segundo plano e a página usa o atlas atual (sprites fora
+    dele caem no fallback por imagem). O mapa só é relido do disco quando o
+    atlas.json muda (load_atlas).
+    """
+    if _checked_generations.get(scope) != generation:
+        _checked_generations[scope] = generation
+        current = {name: digest for name, digest, _path in read_sprite_assignments()}
+        if current != load_atlas().get("names"):
+            _rebuild_in_background()
+    return load_atlas()
+
+
+def sprite_html(atlas, digest, size=None, title=""):
+    """
+    HTML de um sprite recortado do atlas (background-position).
+    - size: lado, em pixels, em que o sprite deve aparecer (None = tamanho original).
+    Retorna "" se o sprite não estiver no atlas.
+    """
+    entry = atlas["sprites"].get(digest) if digest else None
+    if not entry:
+        return ""
+
+    sheet_index, x, y, w, h = entry
+    sheet = atlas["sheets"][sheet_index]
+    sheet_width = ATLAS_COLUMNS * CELL_SIZE
+    sheet_height = max(1, -(-len(sheet["slots"]) // ATLAS_COLUMNS)) * CELL_SIZE
+    scale = size / max(w, h) if size else 1
+
+    return (
+        f'<div title="{html.escape(title)}" style="display:inline-block;'
+        f'width:{w * scale:g}px;height:{h * scale:g}px;'
+        f"background:url('{image_url(sheet['file'])}') -{x * scale:g}px -{y * scale:g}px no-repeat;"
+        f'background-size:{sheet_width * scale:g}px {sheet_height * scale:g}px;'
+        f'image-rendering:pixelated"></div>'
+    )
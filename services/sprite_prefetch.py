@@ -0,0 +1,105 @@
+import itertools
+import queue
+import threading
+import time
+
+from mydb import download_image_if_needed, read_missing_image_sources
+from utils.config import IMAGE_BACKGROUND_PREFETCH, IMAGE_PREFETCH_DELAY
+from utils.image_index import CREATURE_IMAGE_ROOT
+from utils.thumbnails import thumbnail_url
+
+# Prioridades da fila: sprites que alguém está vendo passam na frente
+VIEW_PRIORITY = 0
+BACKGROUND_PRIORITY = 1
+
+_queue = queue.PriorityQueue()
+_order = itertools.count()
+_pending = {}  # nome -> menor prioridade já enfileirada
+_lock = threading.Lock()
+_worker = None
+_background_started = False
+
+
+def _run():
+    """Baixa os sprites da fila, um de cada vez."""
+    while True:
+        priority, _order_key, name, url, kind, category = _queue.get()
+        try:
+            if kind == "creature":
+                download_image_if_needed(name, url, folder=CREATURE_IMAGE_ROOT)
+            else:
+                download_image_if_needed(name, url, category=category)
+        except Exception as e:
+            print(f"[DEBUG PREFETCH] Erro ao baixar sprite de {name}: {e}")
+        finally:
+            with _lock:
+                if _pending.get(name) == priority:
+                    del _pending[name]
+            _queue.task_done()
+
+        # O prefetch em segundo plano não pode competir com o resto do app
+        if priority == BACKGROUND_PRIORITY:
+            time.sleep(IMAGE_PREFETCH_DELAY)
+
+
+def request_sprite(name, url, kind="item", category=None, priority=VIEW_PRIORITY):
+    """
+    Coloca o download do sprite na fila (sem bloquear quem pediu).
+    Pedidos repetidos são ignorados, a não ser que tenham prioridade maior.
+    """
+    global _worker
+    if not name or not url:
+        return
+
+    with _lock:
+        queued = _pending.get(name)
+        if queued is not None and queued <= priority:
+            return
+        _pending[name] = priority
+
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="sprite-prefetch", daemon=True)
+            _worker.start()
+
+    _queue.put((priority, next(_order), name, url, kind, category))
+
+
+def start_background_prefetch(limit=None):
+    """
+    Enfileira, com prioridade baixa, todos os registros que ainda não têm
+    sprite local. Só roda uma vez por processo.
+    """
+    global _background_started
+    with _lock:
+        if _background_started:
+            return
+        _background_started = True
+
+    for kind, name, category, url in read_missing_image_sources(limit):
+        request_sprite(name, url, kind=kind, category=category, priority=BACKGROUND_PRIORITY)
+
+
+def display_image(image_path, image_url, name, kind="item", category=None, size=32, animated=False):
+    """
+    URL para exibir o sprite de um registro.
+    Com imagem local, usa a miniatura; sem ela, mostra direto a URL de
+    origem e pede o download em segundo plano para as próximas visitas.
+    """
+    if image_path:
+        return thumbnail_url(image_path, size, animated)
+    if image_url:
+        request_sprite(name, image_url, kind=kind, category=category)
+        if IMAGE_BACKGROUND_PREFETCH:
+            start_background_prefetch()
+        return image_url
+    return ""
+
+
+def item_image_urls(df, size=32):
+    """display_image para todas as linhas de um DataFrame de itens."""
+    return [
+        display_image(path, url, name, category=category, size=size)
+        for path, url, name, category in zip(
+            df['image_path'], df['image_url'], df['item_name'], df['category']
+        )
+    ]
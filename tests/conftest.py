@@ -0,0 +1,11 @@
+import pytest
+
+import mydb
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Banco SQLite temporário com o esquema atual (create_table)."""
+    monkeypatch.setattr(mydb, "DB_NAME", str(tmp_path / "test.db"))
+    mydb.create_table()
+    return mydb
@@ -0,0 +1,51 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+pytest.importorskip("streamlit.testing.v1")
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+# As páginas usam st.fragment (streamlit da requirements.txt)
+pytestmark = pytest.mark.skipif(not hasattr(st, "fragment"), reason="streamlit sem st.fragment")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _page(page_path):
+    # Roda a página fora do app multipágina (sem page_link no menu)
+    import runpy
+    from streamlit.delta_generator import DeltaGenerator
+    DeltaGenerator.page_link = lambda *args, **kwargs: None
+    runpy.run_path(page_path, run_name="__main__")
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGBA", (64, 64), (200, 0, 0, 255)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_comparison_renders_stored_sprites(db, tmp_path, monkeypatch):
+    # Store de sprites e miniaturas (caminhos relativos) dentro de tmp_path
+    monkeypatch.syspath_prepend(REPO_ROOT)
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear()
+
+    _digest, sprite_path = db.store_sprite_bytes(_png())
+    data = {"Requirements": {"Level": "20"}, "Combat Properties": {"Armor": "7"}}
+    db.create_item("Crown Helmet", "Helmets", sprite_path, data)
+    db.create_item("Royal Helmet", "Helmets", sprite_path, {**data, "Combat Properties": {"Armor": "9"}})
+
+    at = AppTest.from_function(
+        _page, args=(os.path.join(REPO_ROOT, "pages", "comparador.py"),), default_timeout=60
+    ).run()
+    at.multiselect[0].set_value(at.multiselect[0].options[:1]).run()
+
+    assert not at.exception
+    images = [m.value for m in at.markdown if m.value.startswith("<img")]
+    assert len(images) == 2
+    assert all('src="app/static/thumbs/' in image for image in images)
+    st.cache_resource.clear()
@@ -0,0 +1,108 @@
+from utils.field_stats import apply_item_fields, item_fields
+
+
+def _table(db):
+    return {field["path"]: field for field in db.read_field_stats()}
+
+
+def _rebuilt(db):
+    """field_stats refeito do zero por _backfill_field_stats sobre as mesmas linhas."""
+    conn = db.create_connection()
+    c = conn.cursor()
+    c.execute("UPDATE meta SET value = 0 WHERE key = 'field_stats_built'")
+    db._backfill_field_stats(c)
+    conn.commit()
+    conn.close()
+    return _table(db)
+
+
+def _counts(table):
+    return {path: (field["type"], field["depth"], field["items"], field["categories"], field["types"])
+            for path, field in table.items()}
+
+
+def test_incremental_maintenance_matches_backfill(db):
+    db.create_item("Crown Helmet", "Helmets", "", {
+        "General Properties": {"Level": "60", "Weight": "29.50 oz"},
+        "Combat Properties": {"Armor": 7, "Resists": {"fire": 5}},
+    })
+    db.create_item("Magic Plate Armor", "Armors", "", {
+        "General Properties": {"Level": "0"},
+        "Combat Properties": {"Armor": 17},
+    })
+    db.create_item("Boots of Haste", "Boots", "", {
+        "Combat Properties": {"Attributes": ["speed +20"]},
+    })
+    # Dados novos (campos entram e saem), troca de categoria, remoção
+    db.update_item("Crown Helmet", data_dict={
+        "General Properties": {"Level": "60"},
+        "Combat Properties": {"Armor": 8, "Resists": {"fire": 5, "ice": 3}},
+        "Trade Properties": {"Value": "2,500 gp"},
+    })
+    db.update_item("Magic Plate Armor", category="Legs")
+    db.delete_item("Boots of Haste")
+    db.create_item("Leather Legs", "Legs", "", {"Combat Properties": {"Armor": 1}})
+    db.delete_items_by_category("Armors")  # nenhum item: não mexe no mapa
+
+    incremental = _table(db)
+    assert _counts(incremental) == _counts(_rebuilt(db))
+    assert "Combat Properties.Attributes" not in incremental
+    assert incremental["Combat Properties.Armor"]["categories"] == {"Helmets": 1, "Legs": 2}
+    assert incremental["Combat Properties.Resists.ice"]["items"] == 1
+
+
+def test_field_type_change_matches_backfill(db):
+    db.create_item("Crown Helmet", "Helmets", "", {"Combat Properties": {"Armor": 7, "Resists": {"fire": 5}}})
+    db.create_item("Leather Legs", "Legs", "", {"Combat Properties": {"Armor": 1}})
+    # Número vira texto e dicionário vira lista (os subcampos somem)
+    db.update_item("Crown Helmet", data_dict={"Combat Properties": {"Armor": "7 (+1)"}})
+    db.update_item("Leather Legs", data_dict={"Combat Properties": {"Armor": "1", "Resists": ["fire"]}})
+
+    incremental = _table(db)
+    assert incremental["Combat Properties.Armor"]["type"] == "str"
+    assert incremental["Combat Properties.Resists"]["type"] == "list"
+    assert "Combat Properties.Resists.fire" not in incremental
+    assert _counts(incremental) == _counts(_rebuilt(db))
+
+    # Tipos misturados: vale o de mais itens, qualquer que seja a ordem de gravação
+    for name, armor in (("Steel Helmet", 6), ("Soldier Helmet", 5), ("Chain Helmet", 4)):
+        db.create_item(name, "Helmets", "", {"Combat Properties": {"Armor": armor}})
+    db.update_item("Leather Legs", data_dict={"Combat Properties": {"Armor": 1}})
+    incremental = _table(db)
+    assert incremental["Combat Properties.Armor"]["types"] == {"int": 4, "str": 1}
+    assert incremental["Combat Properties.Armor"]["type"] == "int"
+    assert _counts(incremental) == _counts(_rebuilt(db))
+
+
+def test_delete_by_category_removes_fields(db):
+    db.create_item("Wand of Vortex", "Wands", "", {"Combat Properties": {"Attack": "13"}})
+    db.create_item("Crown Helmet", "Helmets", "", {"Combat Properties": {"Armor": 7}})
+    db.delete_items_by_category("Wands")
+    table = _table(db)
+    assert "Combat Properties.Attack" not in table
+    assert table["Combat Properties"]["categories"] == {"Helmets": 1}
+    assert _counts(table) == _counts(_rebuilt(db))
+
+
+def test_item_fields_paths_types_and_examples():
+    fields = item_fields({"Combat Properties": {"Armor": 7, "Imbuing Slots": ["a", "b"]}, "Weight": 1.5})
+    assert fields == {
+        "Combat Properties": ("dict", 1, None),
+        "Combat Properties.Armor": ("int", 2, "7"),
+        "Combat Properties.Imbuing Slots": ("list", 2, "['a', 'b']"),
+        "Weight": ("float", 1, "1.5"),
+    }
+
+
+def test_apply_item_fields_is_reversible():
+    data = {"Combat Properties": {"Armor": 7}}
+    stats = {}
+    apply_item_fields(stats, "Helmets", data, 1)
+    apply_item_fields(stats, "Legs", data, 1)
+    apply_item_fields(stats, "Legs", data, -1)
+    assert stats["Combat Properties.Armor"]["categories"] == {"Helmets": 1}
+    apply_item_fields(stats, "Helmets", data, -1)
+    assert stats == {}
+    # Descontar um item que não está no mapa não cria entradas
+    apply_item_fields(stats, "Helmets", data, -1)
+    assert stats == {}
@@ -0,0 +1,57 @@
+import time
+
+import requests
+
+from utils import image_fetch
+
+GIF = b"GIF89a" + b"\x00" * 16
+
+# url -> (atraso em segundos, resultado de fetch_image ou exceção)
+RESPONSES = {
+    "fast": (0, (GIF, 200)),
+    "slow": (0.3, (GIF, 200)),
+    "gone": (0, (None, 404)),
+    "html": (0, (None, 200)),
+    "down": (0, (None, 503)),
+    "timeout": (0, requests.exceptions.Timeout()),
+}
+
+
+def fake_fetch(url, timeout):
+    delay, result = RESPONSES[url]
+    time.sleep(delay)
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _sources(db):
+    conn = db.create_connection()
+    rows = {source: (successes, failures) for source, successes, failures in
+            conn.execute("SELECT source, successes, failures FROM image_sources")}
+    conn.close()
+    return rows
+
+
+def test_race_losers_are_left_out(monkeypatch):
+    monkeypatch.setattr(image_fetch, "fetch_image", fake_fetch)
+    source, url, content, results, _statuses = image_fetch.hedged_fetch(
+        [("slow-wiki", "slow"), ("fast-wiki", "fast")], hedge_delay=0.05, deadline=2
+    )
+    assert (source, content) == ("fast-wiki", GIF)
+    assert results == {"fast-wiki": True}
+
+
+def test_results_distinguish_permanent_and_transient_failures(monkeypatch):
+    monkeypatch.setattr(image_fetch, "fetch_image", fake_fetch)
+    candidates = [("a", "gone"), ("b", "html"), ("c", "down"), ("d", "timeout")]
+    source, _url, content, results, statuses = image_fetch.hedged_fetch(candidates, hedge_delay=0.05, deadline=2)
+    assert (source, content) == (None, None)
+    assert results == {"a": False, "b": False, "c": None, "d": None}
+    assert statuses == {"a": 404, "b": 200, "c": 503}
+
+
+def test_ranking_counts_only_successes_and_permanent_failures(db):
+    db.record_image_source_results({"fast": True, "gone": False, "down": None})
+    db.record_image_source_results({"fast": None})
+    assert _sources(db) == {"fast": (1, 0), "gone": (0, 1)}
@@ -0,0 +1,76 @@
+from services.catalog import extract_attributes
+from utils.config import extract_level
+from utils.records import parse_number
+
+# Itens com valores sem número em caminhos preferidos e chaves alternativas
+ITEMS = {
+    "Level None": {
+        "General Properties": {"Level": "None", "Weight": "42.50 oz"},
+        "Requirements": {"Level": "80"},
+        "Combat Properties": {"Armor": "12"},
+    },
+    "Level Vazio": {
+        "General Properties": {"Level": ""},
+        "Required Level": "Level 45",
+        "Combat Properties": {"Arm": "7", "Defense": 20},
+    },
+    "Level Inteiro": {
+        "General Properties": {"Level": 130},
+        "Combat Properties": {"Attack": "35 physical"},
+        "Trade Properties": {"Value": "1,200 gp", "Sold For": "5,000 gp"},
+    },
+    "Sem Level": {
+        "Combat Properties": {"Armor": 3},
+        "Trade Properties": {"Sell Value": "300 gp", "Bought For": "800 gp"},
+    },
+}
+
+# Campo projetado -> atributo de extract_attributes e tipo
+ATTRIBUTE_FIELDS = {
+    "armor": ("Armadura", int),
+    "attack": ("Ataque", int),
+    "defense": ("Defesa", int),
+    "weight": ("Peso", float),
+    "trade_value": ("Valor de Venda", int),
+    "buy_value": ("Valor de Compra", int),
+}
+
+
+def _populate(db):
+    for name, data in ITEMS.items():
+        db.create_item(name, "Helmets", "", data)
+
+
+def _fields(items, fields):
+    return {item["item_name"]: tuple(item[field] for field in fields) for item in items}
+
+
+def test_projected_fields_match_python_extractors(db):
+    _populate(db)
+    fields = ["level", *ATTRIBUTE_FIELDS]
+    items = db.read_all_items(fields=fields)
+    assert len(items) == len(ITEMS)
+
+    for item in items:
+        data = ITEMS[item["item_name"]]
+        assert (item["level"] or 0) == extract_level(data), item["item_name"]
+        attributes = extract_attributes(data)
+        for field, (attribute, kind) in ATTRIBUTE_FIELDS.items():
+            expected = parse_number(attributes.get(attribute), kind)
+            assert item[field] == expected, (item["item_name"], field)
+
+
+def test_level_skips_paths_without_number(db):
+    _populate(db)
+    items = db.read_items(["Level None", "Level Vazio"], fields=["level", "armor"])
+    assert _fields(items, ["level", "armor"]) == {"Level None": (80, 12), "Level Vazio": (45, 7)}
+
+
+def test_projection_parses_thousands_separators(db):
+    db.create_item("Golden Armor", "Armors", "", {
+        "General Properties": {"Weight": "1,050.00 oz"},
+        "Combat Properties": {"Armor": "1,000"},
+        "Trade Properties": {"Value": "2,300 gp"},
+    })
+    items = db.read_items(["Golden Armor"], fields=["trade_value", "weight", "armor"])
+    assert _fields(items, ["trade_value", "weight", "armor"]) == {"Golden Armor": (2300, 1050.0, 1000)}
@@ -0,0 +1,70 @@
+from utils.postings import item_postings
+from utils.vocation import ALL_VOCATIONS_MASK, VOCATION_BITS
+
+KNIGHTS = VOCATION_BITS["knights"]
+MAGES = VOCATION_BITS["sorcerers"] | VOCATION_BITS["druids"]
+
+
+def _item(attributes=None, resists=None):
+    combat = {}
+    if attributes is not None:
+        combat["Attributes"] = attributes
+    if resists is not None:
+        combat["Resists"] = resists
+    return {"Combat Properties": combat}
+
+
+def _populate(db):
+    db.create_item("Hat of the Mad", "Helmets", "", _item("magic level +2", {"earth": 5}), vocation_mask=MAGES)
+    db.create_item("Ferumbras Hat", "Helmets", "", _item("magic level +5"), vocation_mask=MAGES)
+    db.create_item("Yalahari Mask", "Helmets", "", _item({"magic level": 3}), vocation_mask=MAGES)
+    db.create_item("Crown Helmet", "Helmets", "", _item(resists={"earth": 3}), vocation_mask=KNIGHTS)
+    db.create_item("Spellbook of Dark Mysteries", "Spellbooks", "",
+                   _item(["magic level +3", "death +10%"]), vocation_mask=MAGES)
+    db.create_item("Mystic Turban", "Helmets", "", _item("magic level"), vocation_mask=ALL_VOCATIONS_MASK)
+
+
+def _top(db, term, **filters):
+    return [(row["item_name"], row["value"]) for row in db.read_top_items_for_term(term, **filters)]
+
+
+def test_item_postings_terms_and_values():
+    assert dict(item_postings(_item("distance fighting +3, magic level -1", {"Earth": "8%"}))) == {
+        "attr:distance fighting": 3.0,
+        "attr:magic level": -1.0,
+        "res:earth": 8.0,
+    }
+    assert item_postings({"Combat Properties": "?"}) == []
+
+
+def test_top_items_ordered_by_value_with_limit(db):
+    _populate(db)
+    top = _top(db, "attr:magic level", limit=3)
+    assert [value for _, value in top] == [5.0, 3.0, 3.0]
+    assert top[0][0] == "Ferumbras Hat"
+    # Empates sem ordem definida
+    assert {name for name, _ in top[1:]} == {"Yalahari Mask", "Spellbook of Dark Mysteries"}
+    # Sem valor numérico vai para o fim
+    assert _top(db, "attr:magic level")[-1] == ("Mystic Turban", None)
+
+
+def test_top_items_category_and_vocation_filters(db):
+    _populate(db)
+    helmets = [name for name, _ in _top(db, "attr:magic level", category="Helmets")]
+    assert helmets == ["Ferumbras Hat", "Yalahari Mask", "Hat of the Mad", "Mystic Turban"]
+    assert _top(db, "res:earth", vocation="knights") == [("Crown Helmet", 3.0)]
+    assert _top(db, "res:earth", vocation="druids") == [("Hat of the Mad", 5.0)]
+    assert _top(db, "attr:magic level", category="Spellbooks", vocation="knights") == []
+
+
+def test_postings_follow_updates_and_deletes(db):
+    _populate(db)
+    db.update_item("Crown Helmet", data_dict=_item("magic level +1"))
+    assert _top(db, "res:earth") == [("Hat of the Mad", 5.0)]
+    assert ("Crown Helmet", 1.0) in _top(db, "attr:magic level")
+
+    db.delete_item("Ferumbras Hat")
+    db.delete_items_by_category("Spellbooks")
+    names = [name for name, _ in _top(db, "attr:magic level")]
+    assert "Ferumbras Hat" not in names and "Spellbook of Dark Mysteries" not in names
+    assert dict(db.read_posting_terms()) == {"attr:magic level": 4, "res:earth": 1}
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.item_query import compile_item_query, query_columns, run_item_query
+from utils.level_index import build_level_index
+from utils.vocation import VOCATION_BITS
+
+KNIGHTS = VOCATION_BITS["knights"]
+MAGES = VOCATION_BITS["sorcerers"] | VOCATION_BITS["druids"]
+
+# Catálogo mínimo: (nome, categoria, level, vocation_mask, armor, weight)
+CATALOG = [
+    ("Leather Helmet", "Helmets", None, KNIGHTS | MAGES, 1, 22.0),
+    ("Crown Helmet", "Helmets", 10, KNIGHTS, 7, 29.5),
+    ("Hat of the Mad", "Helmets", 10, MAGES, 2, None),
+    ("Royal Helmet", "Helmets", 50, KNIGHTS, 9, 48.0),
+    ("Yalahari Mask", "Helmets", 80, MAGES, 5, 35.0),
+    ("Crown Armor", "Armors", 30, KNIGHTS, 13, 99.0),
+    ("Focus Cape", "Armors", 50, MAGES, None, 22.0),
+    ("Master Archer's Armor", "Armors", 100, KNIGHTS, 15, 58.0),
+]
+
+
+@pytest.fixture
+def catalog():
+    df = pd.DataFrame(
+        CATALOG, columns=["name", "category", "level", "vocation_mask", "armor", "weight"]
+    )
+    df["level"] = df["level"].astype("Int64")
+    df["armor"] = df["armor"].astype("Int64")
+    return df
+
+
+def _names(catalog, query):
+    positions, _ = run_item_query(query, build_level_index(catalog), query_columns(catalog))
+    return list(catalog["name"].iloc[positions])
+
+
+@pytest.mark.parametrize("operator, value, level_range", [
+    (">", 10, (11, None)),
+    (">=", 10, (10, None)),
+    ("<", 50, (0, 49)),
+    ("<=", 50, (0, 50)),
+    ("=", 30, (30, 30)),
+    (">", 9.5, (10, None)),
+    ("<", 50.5, (0, 50)),
+    ("=", 30.5, (31, 30)),
+])
+def test_level_predicates_become_inclusive_range(operator, value, level_range):
+    min_level, max_level = compile_item_query([("level", operator, value)])["level_range"]
+    assert min_level == level_range[0]
+    if level_range[1] is not None:
+        assert max_level == level_range[1]
+    else:
+        assert max_level == np.iinfo(np.int64).max
+
+
+def test_level_bounds_are_strict(catalog):
+    query = compile_item_query([("level", ">", 10), ("level", "<", 80)])
+    assert _names(catalog, query) == ["Crown Armor", "Royal Helmet", "Focus Cape"]
+
+    query = compile_item_query([("level", ">=", 10), ("level", "<=", 80)])
+    assert _names(catalog, query) == [
+        "Crown Helmet", "Hat of the Mad", "Crown Armor", "Royal Helmet", "Focus Cape", "Yalahari Mask",
+    ]
+
+    # Faixa vazia não consulta o índice
+    assert _names(catalog, compile_item_query([("level", "=", 30.5)])) == []
+
+
+def test_filters_with_vocation_and_category(catalog):
+    query = compile_item_query([("armor", ">=", 7)], vocation="knights", category="Helmets")
+    assert _names(catalog, query) == ["Crown Helmet", "Royal Helmet"]
+
+    query = compile_item_query([("weight", "<", 40)], vocation="druids")
+    # Item sem peso (NaN) não passa em nenhuma comparação
+    assert _names(catalog, query) == ["Leather Helmet", "Focus Cape", "Yalahari Mask"]
+
+
+def test_sort_puts_missing_values_last(catalog):
+    query = compile_item_query([], vocation="sorcerers", sort_by="armor")
+    assert _names(catalog, query) == ["Leather Helmet", "Hat of the Mad", "Yalahari Mask", "Focus Cape"]
+
+    query = compile_item_query([], vocation="sorcerers", sort_by="armor", descending=True)
+    assert _names(catalog, query) == ["Yalahari Mask", "Hat of the Mad", "Leather Helmet", "Focus Cape"]
+
+
+def test_sort_ties_keep_level_order(catalog):
+    # Leather Helmet (sem level = 0) e Focus Cape (50) pesam 22
+    query = compile_item_query([], sort_by="weight")
+    assert _names(catalog, query)[:2] == ["Leather Helmet", "Focus Cape"]
+    query = compile_item_query([], sort_by="weight", descending=True)
+    assert _names(catalog, query)[-3:] == ["Leather Helmet", "Focus Cape", "Hat of the Mad"]
+
+
+def test_level_order_without_sort(catalog):
+    query = compile_item_query([("level", ">=", 50)], category="Armors", descending=True)
+    assert _names(catalog, query) == ["Master Archer's Armor", "Focus Cape"]
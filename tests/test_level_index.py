@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from services.catalog import apply_item_changes, build_item_catalog
+from utils.level_index import build_level_index, update_level_index
+from utils.vocation import VOCATION_BITS
+
+KNIGHTS = VOCATION_BITS["knights"]
+MAGES = VOCATION_BITS["sorcerers"] | VOCATION_BITS["druids"]
+
+
+def assert_same_index(patched, rebuilt):
+    assert set(patched) == set(rebuilt)
+    for key, (levels, positions) in rebuilt.items():
+        np.testing.assert_array_equal(patched[key][0], levels, err_msg=str(key))
+        np.testing.assert_array_equal(patched[key][1], positions, err_msg=str(key))
+
+
+def _catalog(rows):
+    df = pd.DataFrame(rows, columns=["item_name", "category", "level", "vocation_mask"])
+    df["level"] = df["level"].astype("Int16")
+    df["category"] = df["category"].astype("category")
+    return df
+
+
+def test_update_matches_rebuild_on_random_changes():
+    rng = np.random.default_rng(7)
+    categories = ["Helmets", "Armors", "Legs", "Boots"]
+    rows = [
+        (f"item {i}", categories[i % 3], None if i % 11 == 0 else int(rng.integers(0, 60)),
+         int(rng.integers(1, 32)))
+        for i in range(300)
+    ]
+    df = _catalog(rows)
+    index = build_level_index(df)
+
+    for _ in range(5):
+        removed = np.sort(rng.choice(len(df), size=25, replace=False))
+        kept = df.drop(index=df.index[removed])
+        # Linhas alteradas voltam no fim (algumas somem); "Boots" só aparece aqui
+        added = _catalog([
+            (name, categories[int(rng.integers(0, 4))], int(rng.integers(0, 60)), int(rng.integers(1, 32)))
+            for name in df["item_name"].iloc[removed[:20]]
+        ])
+        new_df = pd.concat([kept, added], ignore_index=True)
+        new_df["category"] = new_df["category"].astype("category")
+
+        index = update_level_index(index, removed, new_df, np.arange(len(kept), len(new_df)))
+        df = new_df
+        assert_same_index(index, build_level_index(df))
+
+
+def test_emptied_category_leaves_index():
+    df = _catalog([("a", "Helmets", 10, KNIGHTS), ("b", "Shields", 20, KNIGHTS), ("c", "Helmets", 5, MAGES)])
+    new_df = _catalog([("a", "Helmets", 10, KNIGHTS), ("c", "Helmets", 5, MAGES)])
+
+    index = update_level_index(build_level_index(df), [1], new_df, [])
+    assert (None, "Shields") not in index
+    assert_same_index(index, build_level_index(new_df))
+
+
+def test_apply_item_changes_patches_index(db):
+    helmet = {"Requirements": {"Level": "20"}, "Combat Properties": {"Armor": "7"}}
+    db.create_item("Crown Helmet", "Helmets", "", helmet, vocation_mask=KNIGHTS)
+    db.create_item("Royal Helmet", "Helmets", "", {"Requirements": {"Level": "50"}}, vocation_mask=KNIGHTS)
+    db.create_item("Hat of the Mad", "Helmets", "", {"Requirements": {"Level": "20"}}, vocation_mask=MAGES)
+    db.create_item("Crown Shield", "Shields", "", {"Requirements": {"Level": "30"}}, vocation_mask=KNIGHTS)
+    db.create_item("Focus Cape", "Armors", "", {}, vocation_mask=MAGES)
+    df = build_item_catalog()
+    index = build_level_index(df)
+
+    # Level, categoria e vocação alterados, um item novo e uma categoria esvaziada
+    db.update_item("Crown Helmet", data_dict={"Requirements": {"Level": "5"}})
+    db.update_item("Focus Cape", category="Robes", vocation_mask=KNIGHTS | MAGES)
+    db.create_item("Yalahari Mask", "Helmets", "", {"Requirements": {"Level": "20"}}, vocation_mask=MAGES)
+    db.delete_items_by_category("Shields")
+    changed = ["Crown Helmet", "Focus Cape", "Yalahari Mask", "Crown Shield"]
+
+    df, index = apply_item_changes(df, index, changed)
+    assert sorted(df["item_name"]) == [
+        "Crown Helmet", "Focus Cape", "Hat of the Mad", "Royal Helmet", "Yalahari Mask",
+    ]
+    assert_same_index(index, build_level_index(df))
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from utils.records import creature_record_from_row, creature_record_to_data
+
+ROWS = [
+    # HP e Exp numéricos saem de 'extra' e voltam no mesmo lugar
+    {"Name": "Rat", "Section": "Rodents", "HP": "20", "Exp": "5", "Speed": "134", "Armor": "1"},
+    {"Name": "Dragon", "Section": "Dragons", "Speed": "172", "Exp": "700", "Armor": "25", "HP": "1000"},
+    # Valores que não voltam idênticos com str() ficam em 'extra'
+    {"Name": "Demon", "Section": "Demons", "HP": "8,200", "Exp": "6,000", "Speed": "218"},
+    {"Section": "Bosses", "Exp": "?", "Name": "Ferumbras", "HP": "90000"},
+]
+
+
+@pytest.mark.parametrize("data", ROWS, ids=[row["Name"] for row in ROWS])
+def test_creature_record_round_trip_keeps_data_json(data):
+    record = creature_record_from_row(data["Name"], "Criaturas", "Sub", data["Section"], data)
+    assert json.dumps(creature_record_to_data(record), ensure_ascii=False) == json.dumps(data, ensure_ascii=False)
+
+
+def test_rows_from_the_same_table_share_the_key_order():
+    first = creature_record_from_row("Rat", "Criaturas", "Sub", "Rodents", dict(ROWS[0]))
+    second = creature_record_from_row("Cave Rat", "Criaturas", "Sub", "Rodents", {**ROWS[0], "Name": "Cave Rat"})
+    assert first.keys is second.keys
@@ -0,0 +1,56 @@
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from utils import thumbnails
+
+
+@pytest.fixture
+def thumbs(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnails, "SPRITE_THUMB_DIR", str(tmp_path / "thumbs"))
+    monkeypatch.setattr(thumbnails, "_last_used", {})
+    sources = []
+    for color in ("red", "blue"):
+        path = tmp_path / f"{color}.png"
+        Image.new("RGBA", (64, 64), color).save(path)
+        sources.append(str(path))
+    return sources
+
+
+def _age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+    thumbnails._last_used[path] = past
+
+
+def test_cache_hit_does_not_touch_the_file(thumbs):
+    target = thumbnails.get_thumbnail(thumbs[0], 32)
+    past = time.time() - 3600
+    os.utime(target, (past, past))
+
+    assert thumbnails.get_thumbnail(thumbs[0], 32) == target
+    assert os.path.getmtime(target) == pytest.approx(past)
+
+
+def test_eviction_keeps_thumbnails_in_use(thumbs):
+    targets = [thumbnails.get_thumbnail(source, 32) for source in thumbs]
+    assert thumbnails.evict_thumbnails(max_bytes=0) == 0
+    assert all(os.path.exists(target) for target in targets)
+
+
+def test_eviction_follows_in_memory_recency(thumbs, monkeypatch):
+    monkeypatch.setattr(thumbnails, "IN_USE_WINDOW", 60)
+    red, blue = (thumbnails.get_thumbnail(source, 32) for source in thumbs)
+    _age(red, 3600)
+    _age(blue, 7200)
+    # Usada agora só em memória (mtime continua antigo): passa a ser a mais recente
+    assert thumbnails.get_thumbnail(thumbs[1], 32) == blue
+
+    assert thumbnails.evict_thumbnails(max_bytes=os.path.getsize(blue)) == 1
+    assert not os.path.exists(red) and os.path.exists(blue)
+
+    # Pedida de novo depois da limpeza: gerada outra vez
+    assert thumbnails.get_thumbnail(thumbs[0], 32) == red
+    assert os.path.exists(red)
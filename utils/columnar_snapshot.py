@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    # Sem pyarrow os snapshots ficam desligados: as páginas montam os
+    # catálogos a partir do SQLite, como antes
+    pa = None
+
+from utils.config import CATALOG_SNAPSHOT_DIR
+
+# Snapshots colunares dos catálogos (arquivos Arrow IPC, sem compressão),
+# publicados depois de cada scraping. A leitura mapeia o arquivo e evita o
+# SQLite e o enriquecimento (parsing de level, vocações, proteções...), mas
+# não é zero-copy: to_pandas() copia as colunas para o pandas e o catálogo
+# de itens ainda refaz o data_dict com um json.loads por linha.
+#
+# Os dtypes do pandas (categórica, Int16 nulo...) voltam pelos metadados que
+# o pyarrow grava junto; metadados próprios (ex.: a geração do catálogo)
+# ficam em uma chave separada do schema.
+
+_METADATA_KEY = b"tibia_analytics"
+
+
+def snapshots_enabled():
+    """True se o pyarrow está disponível para ler/gravar snapshots."""
+    return pa is not None
+
+
+def snapshot_path(name):
+    """Caminho do snapshot 'name' (ex.: "items" -> .../items.arrow)."""
+    return os.path.join(CATALOG_SNAPSHOT_DIR, f"{name}.arrow")
+
+
+def snapshot_mtime(name):
+    """Data de modificação do snapshot (chave de cache), ou None se não existe."""
+    try:
+        return os.path.getmtime(snapshot_path(name))
+    except OSError:
+        return None
+
+
+def write_snapshot(name, df, metadata=None):
+    """
+    Grava o DataFrame como snapshot 'name'. O arquivo é escrito à parte e
+    trocado de uma vez (os.replace): quem está lendo continua com a versão
+    anterior mapeada. Retorna o caminho gravado, ou None sem pyarrow.
+    """
+    if pa is None:
+        return None
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[_METADATA_KEY] = json.dumps(metadata or {}).encode()
+    table = table.replace_schema_metadata(schema_metadata)
+
+    path = snapshot_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+def read_snapshot(name):
+    """
+    Lê o snapshot 'name' via memory-mapping.
+
+    Returns:
+        tuple: (DataFrame, metadados) ou None se o arquivo não existe, está
+        corrompido ou o pyarrow não está disponível.
+    """
+    if pa is None:
+        return None
+    path = snapshot_path(name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = ipc.open_file(source).read_all()
+            metadata = json.loads((table.schema.metadata or {}).get(_METADATA_KEY, b"{}"))
+            df = table.to_pandas()
+    except (pa.ArrowInvalid, OSError, ValueError) as e:
+        print(f"[DEBUG SNAPSHOT] Erro ao ler o snapshot {path}: {e}")
+        return None
+    return df, metadata
@@ -9,6 +9,49 @@ if env_file:
 # Ambiente padrão é 'production' a menos que seja explicitamente definido como 'development'
 ENVIRONMENT = os.getenv('ENVIRONMENT', 'production')
 
+# Download de imagens: tempo de espera pela fonte preferida antes de disparar
+# as alternativas e tempo máximo total por sprite (em segundos)
+IMAGE_HEDGE_DELAY = float(os.getenv('IMAGE_HEDGE_DELAY', '0.25'))
+IMAGE_FETCH_DEADLINE = float(os.getenv('IMAGE_FETCH_DEADLINE', '0.9'))
+# Timeout usado quando só existe uma fonte para a imagem (itens)
+IMAGE_FETCH_TIMEOUT = float(os.getenv('IMAGE_FETCH_TIMEOUT', '10'))
+
+# Modo de imagens sob demanda: o scraping só guarda a URL de origem e o
+# sprite é baixado na primeira vez em que uma página o exibe. Com o
+# prefetch em segundo plano ligado, os sprites que faltam também são
+# baixados aos poucos, um a cada IMAGE_PREFETCH_DELAY segundos.
+LAZY_IMAGES = os.getenv('LAZY_IMAGES', 'false').lower() in ('1', 'true', 'yes')
+IMAGE_BACKGROUND_PREFETCH = os.getenv('IMAGE_BACKGROUND_PREFETCH', 'false').lower() in ('1', 'true', 'yes')
+IMAGE_PREFETCH_DELAY = float(os.getenv('IMAGE_PREFETCH_DELAY', '1.0'))
+
+# Cache negativo de URLs: espera inicial após uma falha (dobra a cada nova
+# falha consecutiva) e espera máxima, em segundos
+NEGATIVE_CACHE_BASE_TTL = float(os.getenv('NEGATIVE_CACHE_BASE_TTL', str(60 * 60)))
+NEGATIVE_CACHE_MAX_TTL = float(os.getenv('NEGATIVE_CACHE_MAX_TTL', str(7 * 24 * 60 * 60)))
+
+# Store de sprites endereçado por conteúdo (arquivos nomeados pelo hash).
+# Fica sob static/ para poder ser servido diretamente como arquivo estático.
+SPRITE_STORE_DIR = os.getenv('SPRITE_STORE_DIR', 'static/sprites')
+
+# Atlas de sprites (folhas PNG com vários sprites + mapa de posições)
+SPRITE_ATLAS_DIR = os.getenv('SPRITE_ATLAS_DIR', 'static/atlas')
+
+# Miniaturas geradas a partir dos sprites (por tamanho) e limite de espaço
+# em disco do cache; ao passar do limite, as menos usadas são apagadas
+SPRITE_THUMB_DIR = os.getenv('SPRITE_THUMB_DIR', 'static/thumbs')
+SPRITE_THUMB_CACHE_MAX_BYTES = int(os.getenv('SPRITE_THUMB_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Cache em memória das data URLs geradas por utils.core (limite em bytes)
+DATA_URL_CACHE_MAX_BYTES = int(os.getenv('DATA_URL_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+
+# Cache em memória dos resultados de filtros das páginas de itens (número
+# máximo de combinações guardadas, compartilhadas entre as sessões)
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '256'))
+
+# Snapshots colunares (Arrow) dos catálogos de itens e criaturas, publicados
+# após cada scraping e lidos pelas páginas na partida do processo
+CATALOG_SNAPSHOT_DIR = os.getenv('CATALOG_SNAPSHOT_DIR', 'data/catalog')
+
 
 def is_development():
     """Verifica se está em ambiente de desenvolvimento."""
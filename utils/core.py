@@ -1,13 +1,83 @@
 import os
 import base64
+import hashlib
+import threading
+from collections import OrderedDict
 
+from utils.config import DATA_URL_CACHE_MAX_BYTES
+
+# Cache LRU das data URLs já geradas, limitado pelo tamanho total das strings.
+# Chaves: (caminho, mtime_ns, tamanho) para arquivos e (extensão, hash) para
+# conteúdo binário; arquivo alterado gera chave nova e a antiga sai por LRU.
+_data_url_cache = OrderedDict()
+_data_url_cache_bytes = 0
+_data_url_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_data_url_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _data_url_lock:
+        value = _data_url_cache.get(key)
+        if value is None:
+            _data_url_stats["misses"] += 1
+            return None
+        _data_url_cache.move_to_end(key)
+        _data_url_stats["hits"] += 1
+        return value
+
+
+def _cache_put(key, value):
+    global _data_url_cache_bytes
+    size = len(value)
+    if size > DATA_URL_CACHE_MAX_BYTES:
+        return
+    with _data_url_lock:
+        if key in _data_url_cache:
+            return
+        _data_url_cache[key] = value
+        _data_url_cache_bytes += size
+        while _data_url_cache_bytes > DATA_URL_CACHE_MAX_BYTES:
+            _old_key, old_value = _data_url_cache.popitem(last=False)
+            _data_url_cache_bytes -= len(old_value)
+            _data_url_stats["evictions"] += 1
+
+
+def data_url_cache_stats():
+    """Contadores do cache de data URLs (acertos, falhas, remoções, ocupação)."""
+    with _data_url_lock:
+        return {
+            **_data_url_stats,
+            "entries": len(_data_url_cache),
+            "bytes": _data_url_cache_bytes,
+            "max_bytes": DATA_URL_CACHE_MAX_BYTES,
+        }
 
-def to_data_url(file_path: str) -> str:
-    """Lê um arquivo local de imagem e retorna uma data URL (Base64 embutido)."""
 
-    if not os.path.exists(file_path):
+def clear_data_url_cache():
+    """Esvazia o cache de data URLs e zera os contadores."""
+    global _data_url_cache_bytes
+    with _data_url_lock:
+        _data_url_cache.clear()
+        _data_url_cache_bytes = 0
+        for counter in _data_url_stats:
+            _data_url_stats[counter] = 0
+
+
+def to_data_url(file_path: str) -> str:
+    """
+    Lê um arquivo local de imagem e retorna uma data URL (Base64 embutido).
+    O resultado fica em cache enquanto o arquivo não mudar (mtime e tamanho).
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
         return f"Arquivo não encontrado: {file_path}"
 
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
     # Descobre o formato da imagem pelo sufixo (ex.: .gif, .png, .jpg, etc.)
     ext = os.path.splitext(file_path)[1].lower().replace('.', '')
 
@@ -19,7 +89,9 @@ def to_data_url(file_path: str) -> str:
     base64_str = base64.b64encode(data).decode("utf-8")
 
     # Monta o data URL completo
-    return f"data:image/{ext};base64,{base64_str}"
+    data_url = f"data:image/{ext};base64,{base64_str}"
+    _cache_put(key, data_url)
+    return data_url
 
 
 def binary_to_data_url(data: bytes, file_ext: str) -> str:
@@ -35,9 +107,68 @@ def binary_to_data_url(data: bytes, file_ext: str) -> str:
     """
     # Normaliza a extensão (remove o ponto se existir)
     ext = file_ext.lower().replace('.', '')
+
+    key = (ext, hashlib.blake2b(data, digest_size=16).digest())
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
     
     # Converte para base64
     base64_str = base64.b64encode(data).decode("utf-8")
     
     # Monta o data URL completo
-    return f"data:image/{ext};base64,{base64_str}"
\ No newline at end of file
+    data_url = f"data:image/{ext};base64,{base64_str}"
+    _cache_put(key, data_url)
+    return data_url
+
+
+def data_url_to_binary(data_url: str):
+    """
+    Operação inversa de binary_to_data_url.
+
+    Returns:
+        tuple: (conteúdo binário, extensão com ponto), ou (None, None) se não
+        for uma data URL base64 válida.
+    """
+    try:
+        header, encoded = data_url.split(",", 1)
+    except (AttributeError, ValueError):
+        return None, None
+    if not header.startswith("data:image/") or ";base64" not in header:
+        return None, None
+
+    ext = "." + header[len("data:image/"):].split(";", 1)[0]
+    try:
+        return base64.b64decode(encoded), ext
+    except ValueError:
+        return None, None
+
+
+# Pasta servida pelo Streamlit em app/static (server.enableStaticServing)
+STATIC_ROOT = "static"
+
+
+def image_url(image_path: str) -> str:
+    """
+    Converte o image_path salvo no banco numa URL que o navegador carrega.
+
+    - Arquivos dentro de static/ viram "app/static/..." com ?v=<versão>, o que
+      faz o Streamlit responder com cache de longa duração. Os sprites do store
+      têm o hash no nome, então a URL muda sempre que o conteúdo muda.
+    - Data URLs e URLs http(s) são usadas como estão.
+    - Outros caminhos locais (ainda não migrados) caem no data URL antigo.
+    """
+    if not isinstance(image_path, str) or not image_path:
+        return ""
+    if image_path.startswith(("data:", "http://", "https://", "app/static/")):
+        return image_path
+
+    normalized = os.path.normpath(image_path)
+    if normalized.startswith(STATIC_ROOT + os.sep):
+        relative = os.path.relpath(normalized, STATIC_ROOT).replace(os.sep, "/")
+        version = os.path.splitext(os.path.basename(normalized))[0][:16]
+        return f"app/static/{relative}?v={version}"
+
+    if os.path.exists(image_path):
+        return to_data_url(image_path)
+    return ""
@@ -0,0 +1,127 @@
+import json
+
+# Mapa de campos dos itens (tabela field_stats): um registro por caminho
+# ("Combat Properties.Armor", "Trade Properties.Value"...) com tipo, alguns
+# exemplos e em quantos itens de cada categoria (e de cada tipo) o campo
+# aparece. É mantido
+# pelo caminho de escrita dos itens (mydb): cada item gravado soma os seus
+# campos e cada item alterado/removido desconta os antigos, então a página
+# de itens lê o mapa pronto em vez de percorrer todos os itens.
+
+COMBAT_PROPERTIES = 'Combat Properties'
+
+# Exemplos guardados por campo
+MAX_EXAMPLES = 5
+
+
+def _field_type(value):
+    """Tipo do campo como exibido no mapa ('dict', 'list', 'str', 'int'...)."""
+    if isinstance(value, dict):
+        return 'dict'
+    if isinstance(value, list):
+        return 'list'
+    return type(value).__name__
+
+
+def _main_type(types):
+    """Tipo com mais itens ({tipo: itens}); empate fica com o menor nome."""
+    return max(sorted(types), key=types.get)
+
+
+def item_fields(data, path="", depth=1):
+    """
+    Campos de um item, incluindo subcampos de dicionários aninhados (listas
+    não são exploradas).
+
+    Returns:
+        dict: {caminho: (tipo, profundidade, exemplo)}; o exemplo é o valor
+        em texto (None para dicionários).
+    """
+    fields = {}
+    if not isinstance(data, dict):
+        return fields
+    for key, value in data.items():
+        field_path = f"{path}.{key}" if path else str(key)
+        example = None if isinstance(value, dict) else str(value)
+        fields[field_path] = (_field_type(value), depth, example)
+        if isinstance(value, dict):
+            fields.update(item_fields(value, field_path, depth + 1))
+    return fields
+
+
+def apply_item_fields(stats, category, data, delta):
+    """
+    Soma (delta=1) ou desconta (delta=-1) os campos de um item em 'stats'
+    ({caminho: {"type", "depth", "examples", "categories", "types", "items"}}).
+    O tipo do campo é o de mais itens (ver _main_type), então não depende da
+    ordem em que os itens foram gravados. Campos que ficam sem itens saem do
+    mapa; exemplos só entram (até MAX_EXAMPLES) e não são removidos junto
+    com o item.
+
+    Returns:
+        set: caminhos alterados
+    """
+    category = str(category)
+    touched = set()
+    for field_path, (field_type, depth, example) in item_fields(data).items():
+        entry = stats.get(field_path)
+        if entry is None:
+            if delta < 0:
+                continue
+            entry = stats[field_path] = {
+                "type": field_type, "depth": depth, "examples": [], "categories": {}, "types": {}, "items": 0,
+            }
+        count = entry["categories"].get(category, 0) + delta
+        if count > 0:
+            entry["categories"][category] = count
+        else:
+            entry["categories"].pop(category, None)
+        count = entry["types"].get(field_type, 0) + delta
+        if count > 0:
+            entry["types"][field_type] = count
+        else:
+            entry["types"].pop(field_type, None)
+        entry["items"] += delta
+        if delta > 0 and example is not None and example not in entry["examples"] \
+                and len(entry["examples"]) < MAX_EXAMPLES:
+            entry["examples"].append(example)
+        if entry["items"] <= 0:
+            del stats[field_path]
+        elif entry["types"]:
+            entry["type"] = _main_type(entry["types"])
+        touched.add(field_path)
+    return touched
+
+
+def stats_row(field_path, entry):
+    """Linha de field_stats (path, type, depth, examples, category_counts, items, type_counts)."""
+    return (
+        field_path,
+        entry["type"],
+        entry["depth"],
+        json.dumps(entry["examples"], ensure_ascii=False),
+        json.dumps(entry["categories"], ensure_ascii=False),
+        entry["items"],
+        json.dumps(entry["types"], ensure_ascii=False),
+    )
+
+
+def stats_entry(row):
+    """Inverso de stats_row: (path, type, ..., items, type_counts) -> (caminho, entrada)."""
+    field_path, field_type, depth, examples, category_counts, items, type_counts = row
+    return field_path, {
+        "type": field_type,
+        "depth": depth,
+        "examples": json.loads(examples) if examples else [],
+        "categories": json.loads(category_counts) if category_counts else {},
+        "types": json.loads(type_counts) if type_counts else {field_type: items},
+        "items": items,
+    }
+
+
+def combat_property_name(field_path, depth):
+    """Nome da propriedade de combate ("Combat Properties.Armor" -> "Armor"), ou None."""
+    prefix = COMBAT_PROPERTIES + '.'
+    if depth == 2 and field_path.startswith(prefix):
+        return field_path[len(prefix):]
+    return None
@@ -0,0 +1,145 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+# Assinaturas (magic bytes) dos formatos de imagem aceitos
+IMAGE_SIGNATURES = (
+    b"GIF87a",
+    b"GIF89a",
+    b"\x89PNG\r\n\x1a\n",
+    b"\xff\xd8\xff",
+)
+
+# Respostas que indicam que a URL não existe mais (as demais, como 5xx e
+# 429, são tratadas como falhas transitórias)
+PERMANENT_FAILURE_STATUSES = (404, 410)
+
+# Pool compartilhado: as requisições perdedoras de uma corrida continuam
+# em segundo plano sem bloquear quem pediu a imagem
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="img-fetch")
+
+
+def is_valid_image(content: bytes) -> bool:
+    """Verifica se o conteúdo baixado é de fato uma imagem (e não uma página HTML)."""
+    if not content:
+        return False
+    # WEBP é um contêiner RIFF (como WAV e AVI): confere também o tipo
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return True
+    return any(content.startswith(sig) for sig in IMAGE_SIGNATURES)
+
+
+def fetch_image(url: str, timeout: float):
+    """
+    Baixa uma única URL de imagem.
+
+    Returns:
+        tuple: (conteúdo da imagem, status HTTP); o conteúdo é None se a
+        resposta não for uma imagem válida.
+    """
+    resp = requests.get(url, timeout=timeout)
+    if resp.status_code != 200:
+        print(f"[DEBUG DOWNLOAD] Status {resp.status_code} ao tentar {url}")
+        return None, resp.status_code
+    if not is_valid_image(resp.content):
+        print(f"[DEBUG DOWNLOAD] Conteúdo inválido (não é imagem) em {url}")
+        return None, resp.status_code
+    return resp.content, resp.status_code
+
+
+def hedged_fetch(candidates, hedge_delay: float, deadline: float):
+    """
+    Baixa uma imagem de várias fontes alternativas usando "hedging".
+
+    Começa pela fonte preferida; se ela não responder em `hedge_delay`
+    segundos (ou falhar antes disso), dispara as demais em paralelo e
+    fica com a primeira imagem válida. Nada espera mais que `deadline`.
+
+    Args:
+        candidates (list): Lista de tuplas (fonte, url) em ordem de preferência.
+        hedge_delay (float): Espera pela fonte preferida antes de disparar as outras.
+        deadline (float): Tempo máximo total em segundos.
+
+    Returns:
+        tuple: (fonte, url, conteúdo, resultados, status), onde resultados é
+        um dicionário com as fontes que terminaram a tentativa: True para
+        sucesso, False para falha definitiva (404/410, conteúdo inválido) e
+        None para falhas transitórias (timeout, 5xx, 429, erro de conexão e
+        fontes que estouraram o prazo). Fontes que ainda estavam baixando
+        quando outra venceu ficam de fora. status traz o status HTTP das
+        fontes que responderam. Fonte, url e conteúdo são None se nenhuma
+        fonte respondeu a tempo.
+    """
+    start = time.monotonic()
+    pending = {}
+    results = {}
+    statuses = {}
+    queue = list(candidates)
+
+    def launch(count=None):
+        launched = 0
+        while queue and (count is None or launched < count):
+            source, url = queue.pop(0)
+            print(f"[DEBUG DOWNLOAD] Tentando URL ({source}): {url}")
+            future = _EXECUTOR.submit(fetch_image, url, deadline)
+            pending[future] = (source, url)
+            launched += 1
+
+    launch(1)
+    hedged = False
+
+    while pending:
+        elapsed = time.monotonic() - start
+        remaining = deadline - elapsed
+        if remaining <= 0:
+            break
+
+        # Enquanto não disparou as alternativas, espera só até o hedge_delay
+        timeout = remaining if hedged else min(remaining, max(hedge_delay - elapsed, 0))
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        if not done and not hedged:
+            # A fonte preferida demorou demais: corre com as alternativas
+            hedged = True
+            launch()
+            continue
+
+        for future in done:
+            source, url = pending.pop(future)
+            try:
+                content, status = future.result()
+            except requests.exceptions.Timeout:
+                # Timeout é transitório, não indica que a URL está morta
+                print(f"[DEBUG DOWNLOAD] Timeout ao tentar {url}")
+                results[source] = None
+                continue
+            except Exception as e:
+                # Erro de conexão etc.: também transitório
+                print(f"[DEBUG DOWNLOAD] Erro: {e} ao tentar {url}")
+                results[source] = None
+                continue
+
+            statuses[source] = status
+            if content:
+                results[source] = True
+                # Quem ainda não respondeu perdeu a corrida: não entra nos
+                # resultados (não falhou, só foi mais lenta desta vez)
+                return source, url, content, results, statuses
+
+            # 200 sem imagem (conteúdo inválido) ou URL inexistente: definitiva
+            if status == 200 or status in PERMANENT_FAILURE_STATUSES:
+                results[source] = False
+            else:
+                results[source] = None
+
+        # Uma falha antecipa a corrida com as fontes restantes
+        if not hedged:
+            hedged = True
+            launch()
+
+    # Fontes que não responderam dentro do prazo
+    for source, _url in pending.values():
+        results[source] = None
+
+    return None, None, None, results, statuses
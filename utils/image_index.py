@@ -0,0 +1,110 @@
+import os
+import threading
+
+# Pastas de sprites conhecidas
+IMAGE_ROOT = "utils/img"
+ITEM_IMAGE_ROOT = "utils/img/itens"
+CREATURE_IMAGE_ROOT = "utils/img/creatures"
+LEGACY_CREATURE_IMAGE_ROOT = "utils/creature_img"
+
+IMAGE_EXTENSIONS = {'.gif', '.png', '.jpg', '.jpeg', '.webp'}
+
+# Índice em memória: pasta -> {nome normalizado: caminho}
+# Cada pasta é listada uma única vez por execução e depois só é atualizada
+# pelos arquivos gravados via register_image.
+_folder_index = {}
+_lock = threading.Lock()
+
+
+def normalize_image_name(name):
+    """Normaliza um nome de item/criatura ou de arquivo (sem extensão) para comparação."""
+    return name.replace(" ", "_").lower()
+
+
+def _scan_folder(folder):
+    """Lista os arquivos de imagem de uma pasta e monta o índice dela."""
+    index = {}
+    if not os.path.isdir(folder):
+        return index
+
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            name, ext = os.path.splitext(entry.name)
+            if ext.lower() not in IMAGE_EXTENSIONS:
+                continue
+            # Em caso de nomes repetidos, mantém o primeiro encontrado
+            index.setdefault(normalize_image_name(name), os.path.join(folder, entry.name))
+    return index
+
+
+def get_folder_index(folder):
+    """Retorna o índice da pasta, construindo-o na primeira chamada."""
+    folder = os.path.normpath(folder)
+    with _lock:
+        index = _folder_index.get(folder)
+        if index is None:
+            index = _scan_folder(folder)
+            _folder_index[folder] = index
+        return index
+
+
+def item_image_folders(category=None):
+    """
+    Pastas onde procurar a imagem de um item.
+    Com categoria: a pasta da categoria e a pasta antiga (utils/img).
+    Sem categoria: a pasta antiga e todas as pastas de categoria.
+    """
+    if category:
+        return [os.path.join(ITEM_IMAGE_ROOT, category), IMAGE_ROOT]
+
+    folders = [IMAGE_ROOT]
+    if os.path.isdir(ITEM_IMAGE_ROOT):
+        with os.scandir(ITEM_IMAGE_ROOT) as entries:
+            folders.extend(
+                os.path.join(ITEM_IMAGE_ROOT, entry.name)
+                for entry in entries if entry.is_dir()
+            )
+    return folders
+
+
+def creature_image_folders():
+    """Pastas onde procurar a imagem de uma criatura (a atual e a antiga)."""
+    return [CREATURE_IMAGE_ROOT, LEGACY_CREATURE_IMAGE_ROOT]
+
+
+def find_image(name, folders):
+    """
+    Procura a imagem de 'name' nas pastas informadas, em ordem.
+    Retorna o caminho do arquivo ou None. Cada consulta é O(1) por pasta.
+    """
+    key = normalize_image_name(name)
+    for folder in folders:
+        path = get_folder_index(folder).get(key)
+        if path:
+            return path
+    return None
+
+
+def register_image(path):
+    """
+    Adiciona ao índice um arquivo recém-gravado.
+    Se a pasta ainda não foi indexada, não faz nada: a primeira listagem
+    dela já vai incluir o arquivo.
+    """
+    folder = os.path.normpath(os.path.dirname(path))
+    name = os.path.splitext(os.path.basename(path))[0]
+    with _lock:
+        index = _folder_index.get(folder)
+        if index is not None:
+            index[normalize_image_name(name)] = path
+
+
+def invalidate_image_index(folder=None):
+    """Descarta o índice de uma pasta (ou de todas), forçando nova listagem."""
+    with _lock:
+        if folder is None:
+            _folder_index.clear()
+        else:
+            _folder_index.pop(os.path.normpath(folder), None)
@@ -0,0 +1,157 @@
+import time
+
+import numpy as np
+
+from utils.level_index import items_in_level_range
+
+# Consultas do filtro avançado de itens: predicados sobre as colunas
+# numéricas do catálogo, compilados em uma fatia do índice de level
+# (vocação + categoria + faixa de level) seguida de comparações vetorizadas
+# (NumPy) só sobre as posições que sobraram.
+
+# Campos filtráveis/ordenáveis: coluna do catálogo -> rótulo
+QUERY_FIELDS = {
+    'level': 'Level',
+    'armor': 'Armadura',
+    'attack': 'Ataque',
+    'defense': 'Defesa',
+    'weight': 'Peso',
+    'res_physical': 'Proteção Física (%)',
+    'res_earth': 'Proteção Terra (%)',
+    'res_fire': 'Proteção Fogo (%)',
+    'res_energy': 'Proteção Energia (%)',
+    'res_ice': 'Proteção Gelo (%)',
+    'res_holy': 'Proteção Sagrado (%)',
+    'res_death': 'Proteção Morte (%)',
+    'trade_value': 'Valor de Venda',
+    'buy_value': 'Valor de Compra',
+}
+
+# Operadores aceitos nos predicados
+OPERATORS = {
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '=': np.equal,
+    '>': np.greater,
+    '<': np.less,
+}
+
+# Faixa de level sem limite (levels do catálogo são inteiros >= 0)
+_MIN_LEVEL, _MAX_LEVEL = 0, np.iinfo(np.int64).max
+
+
+def query_columns(catalog):
+    """
+    Colunas de QUERY_FIELDS como arrays float64 (NaN = item sem o valor),
+    na ordem das linhas do catálogo (posições de df.iloc).
+    """
+    return {
+        column: catalog[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        for column in QUERY_FIELDS if column in catalog.columns
+    }
+
+
+def compile_item_query(predicates, vocation=None, category=None, sort_by=None, descending=False):
+    """
+    Compila a consulta. Predicados de level viram a faixa do índice; os
+    demais ficam como filtros vetorizados, na ordem em que vieram.
+
+    Args:
+        predicates (list): [(campo, operador, valor)] com campo de
+            QUERY_FIELDS e operador de OPERATORS
+        vocation (str, optional): vocação (None = todas)
+        category (str, optional): categoria (None = todas)
+        sort_by (str, optional): campo de ordenação (None = por level)
+        descending (bool): ordem decrescente
+
+    Returns:
+        dict: {"vocation", "category", "level_range", "filters", "sort",
+        "descending"}
+    """
+    min_level, max_level = _MIN_LEVEL, _MAX_LEVEL
+    filters = []
+    for field, operator, value in predicates:
+        if field not in QUERY_FIELDS:
+            raise ValueError(f"Campo desconhecido: {field}")
+        if operator not in OPERATORS:
+            raise ValueError(f"Operador desconhecido: {operator}")
+        if field != 'level':
+            filters.append((field, operator, value))
+            continue
+        # Levels são inteiros: > e < viram limites inclusivos
+        if operator in ('>=', '>', '='):
+            low = int(np.floor(value)) + 1 if operator == '>' else int(np.ceil(value))
+            min_level = max(min_level, low)
+        if operator in ('<=', '<', '='):
+            high = int(np.ceil(value)) - 1 if operator == '<' else int(np.floor(value))
+            max_level = min(max_level, high)
+
+    return {
+        "vocation": vocation,
+        "category": category,
+        "level_range": (min_level, max_level),
+        "filters": filters,
+        "sort": (sort_by, descending) if sort_by and sort_by != 'level' else None,
+        "descending": descending,
+    }
+
+
+def describe_item_query(query):
+    """Plano da consulta em texto (uma etapa por linha)."""
+    min_level, max_level = query["level_range"]
+    max_text = "∞" if max_level == _MAX_LEVEL else str(max_level)
+    lines = [
+        f"ÍNDICE level[{query['vocation'] or '*'}, {query['category'] or '*'}] "
+        f"FAIXA {min_level} .. {max_text}"
+    ]
+    for field, operator, value in query["filters"]:
+        lines.append(f"FILTRO {field} {operator} {value:g}")
+    if query["sort"]:
+        field, descending = query["sort"]
+        lines.append(f"ORDENA {field} {'DESC' if descending else 'ASC'} (sem valor por último)")
+    else:
+        lines.append(f"ORDEM do índice (level {'DESC' if query['descending'] else 'ASC'})")
+    return "\n".join(lines)
+
+
+def run_item_query(query, level_index, columns):
+    """
+    Executa a consulta compilada.
+
+    Args:
+        query (dict): resultado de compile_item_query
+        level_index (dict): índice de level do catálogo (utils.level_index)
+        columns (dict): arrays de query_columns do mesmo catálogo
+
+    Returns:
+        tuple: (posições df.iloc do resultado, etapas [(descrição, linhas, ms)])
+    """
+    steps = []
+    start = time.perf_counter()
+    min_level, max_level = query["level_range"]
+    if min_level > max_level:
+        positions = np.empty(0, dtype=np.int64)
+    else:
+        positions = items_in_level_range(
+            level_index, min_level, max_level,
+            vocation=query["vocation"], category=query["category"]
+        )
+    steps.append(("índice de level", len(positions), (time.perf_counter() - start) * 1000))
+
+    for field, operator, value in query["filters"]:
+        start = time.perf_counter()
+        keep = OPERATORS[operator](columns[field][positions], value)
+        positions = positions[keep]
+        steps.append((f"{field} {operator} {value:g}", len(positions), (time.perf_counter() - start) * 1000))
+
+    start = time.perf_counter()
+    if query["sort"]:
+        field, descending = query["sort"]
+        values = columns[field][positions]
+        # Estável: empates ficam na ordem de level; NaN vai para o fim
+        order = np.argsort(-values if descending else values, kind="stable")
+        positions = positions[order]
+        steps.append((f"ordenação por {field}", len(positions), (time.perf_counter() - start) * 1000))
+    elif query["descending"]:
+        positions = positions[::-1]
+    return positions, steps
@@ -0,0 +1,136 @@
+import numpy as np
+
+from utils.vocation import VOCATION_BITS
+
+# Índice de level do catálogo de itens: para cada recorte (vocação, categoria)
+# guarda as posições das linhas ordenadas pelo level exigido. Uma faixa de
+# levels vira duas buscas binárias (searchsorted) e uma fatia do array.
+#
+# Chaves: (None, None) = todos os itens, (vocação, None), (None, categoria)
+# e (vocação, categoria). Valores: (levels ordenados, posições no DataFrame).
+
+
+def _sorted_entry(levels, positions):
+    """(levels ordenados, posições) de um recorte; ordenação estável."""
+    order = np.argsort(levels[positions], kind="stable")
+    positions = positions[order]
+    return levels[positions], positions
+
+
+def build_level_index(df):
+    """
+    Monta o índice de level a partir do catálogo (colunas level,
+    vocation_mask e category). As posições são de df.iloc.
+    """
+    levels = df['level'].fillna(0).to_numpy(dtype=np.int64)
+    masks = df['vocation_mask'].to_numpy(dtype=np.int64)
+    categories = df['category'].to_numpy(dtype=object)
+    all_positions = np.arange(len(df))
+
+    index = {(None, None): _sorted_entry(levels, all_positions)}
+
+    category_positions = {}
+    for category in df['category'].dropna().unique():
+        category_positions[category] = np.flatnonzero(categories == category)
+        index[(None, category)] = _sorted_entry(levels, category_positions[category])
+
+    for vocation, bit in VOCATION_BITS.items():
+        allowed = (masks & bit) != 0
+        index[(vocation, None)] = _sorted_entry(levels, np.flatnonzero(allowed))
+        for category, positions in category_positions.items():
+            index[(vocation, category)] = _sorted_entry(levels, positions[allowed[positions]])
+
+    return index
+
+
+def update_level_index(index, removed, df, added):
+    """
+    Índice de df a partir do índice da versão anterior do catálogo, sem
+    reordenar tudo: as linhas removidas saem de cada recorte e as novas
+    entram com searchsorted. O resultado é igual ao de build_level_index(df).
+
+    Args:
+        index (dict): índice da versão anterior (não é alterado)
+        removed (array): posições, na versão anterior, das linhas que saíram
+        df (DataFrame): catálogo novo: as linhas mantidas, na mesma ordem,
+            seguidas das linhas novas
+        added (array): posições (df.iloc) das linhas novas
+    """
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    gone = np.zeros(len(index[(None, None)][1]), dtype=bool)
+    gone[np.asarray(removed, dtype=np.int64)] = True
+    # Posição nova de uma linha mantida = antiga - linhas removidas antes dela
+    shift = np.cumsum(gone)
+
+    added = np.asarray(added, dtype=np.int64)
+    rows = df.iloc[added]
+    levels = rows['level'].fillna(0).to_numpy(dtype=np.int64)
+    masks = rows['vocation_mask'].to_numpy(dtype=np.int64)
+    categories = rows['category'].to_numpy(dtype=object)
+
+    keys = set(index)
+    for category in rows['category'].dropna().unique():
+        keys.add((None, category))
+        keys.update((vocation, category) for vocation in VOCATION_BITS)
+
+    patched = {}
+    for key in keys:
+        old_levels, old_positions = index.get(key, empty)
+        keep = ~gone[old_positions]
+        kept_levels = old_levels[keep]
+        kept_positions = old_positions[keep]
+        kept_positions = kept_positions - shift[kept_positions]
+
+        vocation, category = key
+        select = np.ones(len(added), dtype=bool)
+        if vocation is not None:
+            select &= (masks & VOCATION_BITS[vocation]) != 0
+        if category is not None:
+            select &= categories == category
+        order = np.argsort(levels[select], kind="stable")
+        new_levels = levels[select][order]
+        # side="right": as linhas novas ficam depois das mantidas de mesmo
+        # level, como na ordenação estável de build_level_index
+        at = np.searchsorted(kept_levels, new_levels, side="right")
+        patched[key] = (
+            np.insert(kept_levels, at, new_levels),
+            np.insert(kept_positions, at, added[select][order]),
+        )
+
+    # Categorias que ficaram sem itens saem do índice
+    emptied = {category for vocation, category in patched
+               if vocation is None and category is not None and not len(patched[(None, category)][1])}
+    return {key: entry for key, entry in patched.items() if key[1] not in emptied}
+
+
+def _entry(index, vocation, category):
+    """Recorte do índice; vazio se a combinação não existe."""
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    return index.get((vocation, category), empty)
+
+
+def items_in(index, vocation=None, category=None):
+    """Posições (df.iloc) de todos os itens do recorte, ordenadas por level."""
+    return _entry(index, vocation, category)[1]
+
+
+def items_in_level_range(index, min_level, max_level, vocation=None, category=None):
+    """
+    Posições (df.iloc) dos itens com min_level <= level <= max_level,
+    ordenadas por level. vocation/category None = sem esse filtro.
+    """
+    levels, positions = _entry(index, vocation, category)
+    start = np.searchsorted(levels, min_level, side="left")
+    end = np.searchsorted(levels, max_level, side="right")
+    return positions[start:end]
+
+
+def items_unlocked_between(index, from_level, to_level, vocation=None, category=None):
+    """
+    Posições dos itens liberados ao subir de from_level para to_level
+    (from_level < level <= to_level), ordenadas por level.
+    """
+    levels, positions = _entry(index, vocation, category)
+    start = np.searchsorted(levels, from_level, side="right")
+    end = np.searchsorted(levels, to_level, side="right")
+    return positions[start:end]
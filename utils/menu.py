@@ -1,5 +1,7 @@
 import streamlit as st
+import time
 from utils.config import is_development
+from utils.query_cache import query_cache_stats
 
 
 def center_content(content):
@@ -10,6 +12,36 @@ def center_content(content):
     """
 
 
+def catalog_status_text():
+    """
+    Texto com a idade dos dados de itens em memória (geração do catálogo),
+    ou None se nenhuma página de itens carregou o catálogo ainda.
+    """
+    # Importado aqui: utils não depende de services no carregamento
+    from services.catalog import item_catalog_status
+
+    status = item_catalog_status()
+    if status is None:
+        # Quem carrega o catálogo são as páginas de itens
+        # (get_item_catalog_snapshot), não o menu
+        return None
+
+    minutes = int((time.time() - status["refreshed_at"]) // 60)
+    age = "agora" if minutes < 1 else f"há {minutes} min"
+    text = f"Dados atualizados {age} (geração {status['seq']})"
+    if status["refreshing"]:
+        text += " · atualizando..."
+    return text
+
+
+def query_cache_status_text():
+    """Texto com a taxa de acertos do cache de filtros das páginas de itens."""
+    stats = query_cache_stats()
+    lookups = stats["hits"] + stats["misses"]
+    return (f"Cache de filtros: {stats['hit_rate']:.0%} de acertos "
+            f"({stats['hits']}/{lookups}, {stats['entries']}/{stats['max_entries']} entradas)")
+
+
 def menu():
     """Exibe o menu de navegação lateral sem requisito de login."""
     is_dev = is_development()
@@ -25,7 +57,13 @@ def menu():
     st.sidebar.caption('Itens')
     st.sidebar.page_link("pages/itens_por_level.py", label="Itens por Level")
     st.sidebar.page_link("pages/comparador.py", label="Comparador de Itens")
+    st.sidebar.page_link("pages/filtro_itens.py", label="Filtro Avançado")
     st.sidebar.page_link("pages/detalhes_item.py", label="Detalhes do Item")
+    status_text = catalog_status_text()
+    if status_text:
+        st.sidebar.caption(status_text)
+    if is_dev:
+        st.sidebar.caption(query_cache_status_text())
 
     # Exp, custos de boost e etc
     st.sidebar.caption('Exp, custos de boost e etc')
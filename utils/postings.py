@@ -0,0 +1,85 @@
+import re
+
+from utils.records import parse_number
+
+# Índice invertido de atributos e proteções dos itens ("quais itens dão X"):
+# cada item gera um termo por atributo/elemento com o valor correspondente.
+# Termos: "attr:<atributo>" (ex.: "attr:magic level") e "res:<elemento>"
+# (ex.: "res:earth"), sempre normalizados (minúsculas, espaços simples).
+
+ATTRIBUTE_PREFIX = "attr:"
+RESIST_PREFIX = "res:"
+
+# Nome dos elementos nas telas
+ELEMENT_LABELS = {
+    'physical': 'Físico',
+    'earth': 'Terra',
+    'fire': 'Fogo',
+    'energy': 'Energia',
+    'ice': 'Gelo',
+    'holy': 'Sagrado',
+    'death': 'Morte',
+}
+
+# "distance fighting +3", "magic level -1"
+_ATTRIBUTE_TEXT_RE = re.compile(r'^(.*?)\s*([+-]?\d+(?:\.\d+)?)%?$')
+
+
+def normalize_key(key):
+    """Chave normalizada: minúsculas, '_' vira espaço, espaços simples."""
+    return ' '.join(str(key).lower().replace('_', ' ').split())
+
+
+def _attribute_entries(attributes):
+    """(nome, valor) dos atributos no formato salvo pelo scraping (dict, lista ou texto)."""
+    if isinstance(attributes, dict):
+        return list(attributes.items())
+    if isinstance(attributes, str):
+        attributes = attributes.split(',')
+    if not isinstance(attributes, list):
+        return []
+    entries = []
+    for part in attributes:
+        if isinstance(part, dict):
+            entries.extend(part.items())
+        elif isinstance(part, str):
+            match = _ATTRIBUTE_TEXT_RE.match(part.strip())
+            if match and match.group(1):
+                entries.append((match.group(1), match.group(2)))
+            elif part.strip():
+                entries.append((part, None))
+    return entries
+
+
+def item_postings(data):
+    """
+    Termos do índice invertido de um item: lista de (termo, valor) com o
+    valor numérico do atributo/proteção (None se não houver número).
+    """
+    combat = data.get('Combat Properties') if isinstance(data, dict) else None
+    if not isinstance(combat, dict):
+        return []
+
+    postings = {}
+    for name, value in _attribute_entries(combat.get('Attributes')):
+        key = normalize_key(name)
+        if key:
+            postings[ATTRIBUTE_PREFIX + key] = parse_number(value, float)
+
+    resists = combat.get('Resists')
+    if isinstance(resists, dict):
+        for element, value in resists.items():
+            key = normalize_key(element)
+            if key:
+                postings[RESIST_PREFIX + key] = parse_number(value, float)
+    return list(postings.items())
+
+
+def term_label(term):
+    """Rótulo de exibição de um termo ("attr:magic level" -> "Magic Level")."""
+    if term.startswith(RESIST_PREFIX):
+        element = term[len(RESIST_PREFIX):]
+        return f"Proteção {ELEMENT_LABELS.get(element, element.capitalize())}"
+    if term.startswith(ATTRIBUTE_PREFIX):
+        term = term[len(ATTRIBUTE_PREFIX):]
+    return ' '.join(word.capitalize() for word in term.split())
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+
+from utils.config import QUERY_CACHE_MAX_ENTRIES
+
+# Cache LRU dos resultados de filtros das páginas de itens (linhas filtradas,
+# quadros prontos para exibição), compartilhado entre as sessões do processo.
+# Chaves: (geração do catálogo, página, parâmetros do filtro). Quando entra
+# uma geração nova, as entradas das anteriores são descartadas: nunca mais
+# seriam usadas.
+_query_cache = OrderedDict()
+_query_cache_generation = None
+_query_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_query_lock = threading.Lock()
+
+
+def cached_query(generation, key, compute):
+    """
+    Resultado de compute() para (generation, key), calculado uma vez e
+    reaproveitado pelas próximas chamadas (de qualquer sessão).
+
+    O valor devolvido é compartilhado: não deve ser alterado no lugar.
+
+    Args:
+        generation (int): geração do catálogo usada no cálculo
+        key (tuple): página e parâmetros do filtro (precisa ser hashable)
+        compute (callable): função sem argumentos que calcula o resultado
+    """
+    global _query_cache_generation
+    cache_key = (generation, key)
+    with _query_lock:
+        if cache_key in _query_cache:
+            _query_cache.move_to_end(cache_key)
+            _query_stats["hits"] += 1
+            return _query_cache[cache_key]
+        _query_stats["misses"] += 1
+
+    # Calculado fora do lock: duas sessões podem calcular a mesma chave ao
+    # mesmo tempo, mas nenhuma espera pela outra
+    value = compute()
+
+    with _query_lock:
+        if _query_cache_generation is None or generation > _query_cache_generation:
+            # Catálogo novo: resultados das gerações anteriores não valem mais
+            stale = [k for k in _query_cache if k[0] != generation]
+            for k in stale:
+                del _query_cache[k]
+            _query_stats["evictions"] += len(stale)
+            _query_cache_generation = generation
+        elif generation < _query_cache_generation:
+            # Sessão ainda com o catálogo anterior: não guarda
+            return value
+        _query_cache[cache_key] = value
+        _query_cache.move_to_end(cache_key)
+        while len(_query_cache) > QUERY_CACHE_MAX_ENTRIES:
+            _query_cache.popitem(last=False)
+            _query_stats["evictions"] += 1
+    return value
+
+
+def query_cache_stats():
+    """Contadores do cache de filtros (acertos, falhas, remoções, ocupação)."""
+    with _query_lock:
+        lookups = _query_stats["hits"] + _query_stats["misses"]
+        return {
+            **_query_stats,
+            "hit_rate": _query_stats["hits"] / lookups if lookups else 0.0,
+            "entries": len(_query_cache),
+            "max_entries": QUERY_CACHE_MAX_ENTRIES,
+            "generation": _query_cache_generation,
+        }
+
+
+def clear_query_cache():
+    """Esvazia o cache de filtros e zera os contadores."""
+    global _query_cache_generation
+    with _query_lock:
+        _query_cache.clear()
+        _query_cache_generation = None
+        for counter in _query_stats:
+            _query_stats[counter] = 0
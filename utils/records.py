@@ -0,0 +1,246 @@
+import re
+from array import array
+from dataclasses import dataclass
+
+from utils.vocation import item_vocation_mask
+
+# Registros tipados do pipeline de scraping/armazenamento. Os campos mais
+# usados ficam em slots (sem __dict__ por registro); o resto do infobox fica
+# no dicionário lateral 'extra', no mesmo formato do data_json do banco.
+#
+# Os conversores fazem ida e volta exata com o formato atual: um campo só sai
+# do dicionário lateral quando o valor já tem o tipo do slot; caso contrário
+# o valor original fica em 'extra' e o slot guarda só a versão interpretada.
+
+# Ordem fixa dos elementos no array de resistências (percentuais)
+RESISTANCE_ELEMENTS = ('physical', 'earth', 'fire', 'energy', 'ice', 'holy', 'death')
+
+# Campos quentes dos itens: (slot, seção do infobox, chave, tipo do slot)
+ITEM_HOT_FIELDS = (
+    ('level', 'General Properties', 'Level', int),
+    ('weight', 'General Properties', 'Weight', float),
+    ('armor', 'Combat Properties', 'Armor', int),
+    ('attack', 'Combat Properties', 'Attack', int),
+    ('defense', 'Combat Properties', 'Defense', int),
+    ('value', 'Trade Properties', 'Value', int),
+)
+# Bit de cada campo quente em 'lifted' (campos retirados de 'extra')
+_RESISTANCES_BIT = 1 << len(ITEM_HOT_FIELDS)
+
+
+@dataclass
+class ItemRecord:
+    """Item do pipeline: campos quentes tipados + restante do infobox em 'extra'."""
+    __slots__ = (
+        'name', 'category', 'level', 'vocation_mask', 'armor', 'attack', 'defense',
+        'resistances', 'weight', 'value', 'image', 'extra', 'lifted',
+    )
+    name: str
+    category: str
+    level: int
+    vocation_mask: int
+    armor: int
+    attack: int
+    defense: int
+    resistances: array   # array('h') na ordem de RESISTANCE_ELEMENTS (0 = sem proteção)
+    weight: float
+    value: int
+    image: str           # caminho no store ou URL de origem do sprite
+    extra: dict          # infobox sem os campos quentes retirados
+    lifted: int          # bits dos campos quentes retirados de 'extra'
+
+
+@dataclass
+class CreatureRecord:
+    """Criatura do pipeline: campos quentes tipados + restante dos dados em 'extra'."""
+    __slots__ = ('name', 'category', 'subcategory', 'section', 'hp', 'exp', 'image', 'extra', 'keys')
+    name: str
+    category: str
+    subcategory: str
+    section: str
+    hp: int              # None se a tabela não trouxer um número
+    exp: int
+    image: str           # URL de origem do sprite
+    extra: dict          # dados sem Name/Section e sem HP/Exp numéricos
+    keys: tuple          # ordem original das chaves dos dados (ver _key_order)
+
+
+# Primeiro número de um texto ("108.00 oz", "53,076 gp", "-5%")
+_NUMBER_RE = re.compile(r'[-+]?\d[\d,]*(?:\.\d+)?')
+
+
+def _is_type(value, kind):
+    """Valor exatamente do tipo do slot (bool não conta como int)."""
+    return type(value) is kind
+
+
+def parse_number(value, kind):
+    """Versão numérica de um valor do infobox ("2,300 gp" -> 2300), ou None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return kind(value)
+    if isinstance(value, str):
+        match = _NUMBER_RE.search(value)
+        if match:
+            number = float(match.group().replace(',', ''))
+            return kind(number)
+    return None
+
+
+def _resistances_array(resists):
+    """
+    Array de resistências a partir de {"fire": 5, ...}, ou None se o
+    dicionário não couber exatamente no array (chave desconhecida, valor não
+    inteiro ou zero explícito).
+    """
+    if not isinstance(resists, dict) or not resists:
+        return None
+    values = array('h', bytes(2 * len(RESISTANCE_ELEMENTS)))
+    for element, value in resists.items():
+        if element not in RESISTANCE_ELEMENTS or not _is_type(value, int) or value == 0:
+            return None
+        if not -32768 <= value <= 32767:
+            return None
+        values[RESISTANCE_ELEMENTS.index(element)] = value
+    return values
+
+
+def item_record_from_data(item_name, category, data, image="", vocation_mask=None):
+    """
+    Converte o dicionário do infobox (formato do data_json) em ItemRecord.
+    O dicionário recebido não é alterado. vocation_mask pode vir pronta (do
+    banco); se None, é calculada a partir dos dados.
+    """
+    data = data if isinstance(data, dict) else {}
+    extra = dict(data)
+    copied = set()
+    slots = {}
+    lifted = 0
+
+    for bit, (slot, section, key, kind) in enumerate(ITEM_HOT_FIELDS):
+        group = extra.get(section)
+        if not isinstance(group, dict) or key not in group:
+            slots[slot] = None
+            continue
+        value = group[key]
+        if _is_type(value, kind):
+            # Copia a seção antes de tirar a chave (o original fica intacto)
+            if section not in copied:
+                group = extra[section] = dict(group)
+                copied.add(section)
+            del group[key]
+            lifted |= 1 << bit
+            slots[slot] = value
+        else:
+            slots[slot] = parse_number(value, kind)
+
+    resistances = None
+    combat = extra.get('Combat Properties')
+    if isinstance(combat, dict):
+        resistances = _resistances_array(combat.get('Resists'))
+        if resistances is not None:
+            if 'Combat Properties' not in copied:
+                extra['Combat Properties'] = dict(combat)
+            del extra['Combat Properties']['Resists']
+            lifted |= _RESISTANCES_BIT
+    if resistances is None:
+        resistances = array('h', bytes(2 * len(RESISTANCE_ELEMENTS)))
+
+    return ItemRecord(
+        name=item_name,
+        category=category,
+        level=slots['level'],
+        vocation_mask=(
+            item_vocation_mask(item_name, category, data) if vocation_mask is None else vocation_mask
+        ),
+        armor=slots['armor'],
+        attack=slots['attack'],
+        defense=slots['defense'],
+        resistances=resistances,
+        weight=slots['weight'],
+        value=slots['value'],
+        image=image,
+        extra=extra,
+        lifted=lifted,
+    )
+
+
+def item_record_to_data(record):
+    """Dicionário no formato do data_json (inverso de item_record_from_data)."""
+    data = dict(record.extra)
+    copied = set()
+
+    def section(name):
+        if name not in copied:
+            data[name] = dict(data.get(name) or {})
+            copied.add(name)
+        return data[name]
+
+    for bit, (slot, section_name, key, _kind) in enumerate(ITEM_HOT_FIELDS):
+        if record.lifted & (1 << bit):
+            section(section_name)[key] = getattr(record, slot)
+    if record.lifted & _RESISTANCES_BIT:
+        section('Combat Properties')['Resists'] = {
+            element: value
+            for element, value in zip(RESISTANCE_ELEMENTS, record.resistances) if value
+        }
+    return data
+
+
+def item_resistances(record):
+    """Resistências de um ItemRecord como dicionário {elemento: percentual}."""
+    return {
+        element: value for element, value in zip(RESISTANCE_ELEMENTS, record.resistances) if value
+    }
+
+
+def _int_text(value):
+    """Inteiro de um texto que volta idêntico com str() ("120" sim, "1,200" não)."""
+    if isinstance(value, str) and value.isdigit() and str(int(value)) == value:
+        return int(value)
+    return None
+
+
+# Ordens de chaves já vistas: as linhas de uma mesma tabela compartilham a tupla
+_KEY_ORDERS = {}
+
+
+def _key_order(data):
+    """Tupla com a ordem das chaves de 'data' (a mesma para dados com as mesmas chaves)."""
+    keys = tuple(data)
+    return _KEY_ORDERS.setdefault(keys, keys)
+
+
+def creature_record_from_row(name, category, subcategory, section, data, image=None):
+    """
+    Converte os dados de uma linha de tabela de criaturas (Name, Section e
+    colunas da tabela) em CreatureRecord. O dicionário recebido não é alterado.
+    """
+    extra = {key: value for key, value in data.items() if key not in ('Name', 'Section')}
+    hp = _int_text(extra.get('HP'))
+    exp = _int_text(extra.get('Exp'))
+    if hp is not None:
+        del extra['HP']
+    if exp is not None:
+        del extra['Exp']
+    return CreatureRecord(
+        name=name, category=category, subcategory=subcategory, section=section,
+        hp=hp, exp=exp, image=image, extra=extra, keys=_key_order(data),
+    )
+
+
+def creature_record_to_data(record):
+    """
+    Dicionário no formato do data_json (inverso de creature_record_from_row),
+    com as chaves na ordem original, para o data_json gravado não mudar.
+    """
+    values = {"Name": record.name, "Section": record.section}
+    values.update(record.extra)
+    if record.hp is not None:
+        values['HP'] = str(record.hp)
+    if record.exp is not None:
+        values['Exp'] = str(record.exp)
+    data = {key: values.pop(key) for key in record.keys if key in values}
+    data.update(values)
+    return data
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+from utils.config import SPRITE_STORE_DIR
+
+# Extensão padrão quando não dá para descobrir o formato
+DEFAULT_EXT = ".gif"
+
+# Assinaturas usadas para descobrir a extensão a partir do conteúdo
+_EXT_BY_SIGNATURE = (
+    (b"GIF8", ".gif"),
+    (b"\x89PNG", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"RIFF", ".webp"),
+)
+
+
+def content_hash(data: bytes) -> str:
+    """Hash (SHA-256, hexadecimal) do conteúdo de uma imagem."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """Hash (SHA-256, hexadecimal) de um arquivo em disco."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def guess_ext(data: bytes, fallback: str = DEFAULT_EXT) -> str:
+    """Descobre a extensão da imagem pelos primeiros bytes do conteúdo."""
+    for signature, ext in _EXT_BY_SIGNATURE:
+        if data.startswith(signature):
+            return ext
+    return fallback
+
+
+def store_path(digest: str, ext: str) -> str:
+    """
+    Caminho do arquivo no store para um hash.
+    Ex.: static/sprites/3f/3fa2...e9.gif (subpasta com os 2 primeiros caracteres).
+    """
+    ext = ext if ext.startswith(".") else f".{ext}"
+    return os.path.join(SPRITE_STORE_DIR, digest[:2], f"{digest}{ext.lower()}")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Grava o arquivo de forma atômica (arquivo temporário + rename)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def link_or_copy(src: str, dst: str) -> bool:
+    """
+    Cria 'dst' como hard link de 'src'; se não for possível (ex.: outro
+    sistema de arquivos), copia. Retorna True se criou um hard link.
+    """
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        shutil.copy2(src, dst)
+        return False
+
+
+def put_bytes(data: bytes, ext: str = None):
+    """
+    Guarda o conteúdo no store (se ainda não estiver lá).
+    Retorna (hash, caminho no store).
+    """
+    digest = content_hash(data)
+    path = store_path(digest, ext or guess_ext(data))
+    if not os.path.exists(path):
+        _atomic_write(path, data)
+    return digest, path
+
+
+def put_file(src: str, digest: str = None):
+    """
+    Guarda um arquivo existente no store, usando hard link quando possível
+    para não duplicar o espaço em disco.
+    Retorna (hash, caminho no store).
+    """
+    digest = digest or file_hash(src)
+    path = store_path(digest, os.path.splitext(src)[1] or DEFAULT_EXT)
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        link_or_copy(src, tmp)
+        os.replace(tmp, path)
+    return digest, path
+
+
+def dedupe_into_store(src: str, path: str) -> bool:
+    """
+    Substitui 'src' por um hard link para o arquivo 'path' do store, para
+    que cópias idênticas ocupem espaço uma única vez.
+    Retorna True se 'src' passou a compartilhar o arquivo do store.
+    """
+    try:
+        if os.path.samefile(src, path):
+            return True
+    except OSError:
+        return False
+
+    tmp = f"{src}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.link(path, tmp)
+    except OSError:
+        return False
+    os.replace(tmp, src)
+    return True
+
+
+def verify_file(path: str, digest: str) -> str:
+    """
+    Confere a integridade de um arquivo do store.
+    Retorna "ok", "missing" ou "corrupt".
+    """
+    if not os.path.exists(path):
+        return "missing"
+    return "ok" if file_hash(path) == digest else "corrupt"
+
+
+def iter_store_files():
+    """Percorre todos os arquivos do store, devolvendo (hash, caminho)."""
+    if not os.path.isdir(SPRITE_STORE_DIR):
+        return
+    for prefix in os.listdir(SPRITE_STORE_DIR):
+        folder = os.path.join(SPRITE_STORE_DIR, prefix)
+        if not os.path.isdir(folder):
+            continue
+        for filename in os.listdir(folder):
+            digest, ext = os.path.splitext(filename)
+            if ext == ".tmp":
+                continue
+            yield digest, os.path.join(folder, filename)
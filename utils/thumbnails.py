@@ -0,0 +1,175 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageSequence
+
+from utils.config import SPRITE_THUMB_DIR, SPRITE_THUMB_CACHE_MAX_BYTES
+from utils.core import image_url
+from utils.sprite_store import file_hash
+
+# Nomes de arquivo do store são o próprio hash (não precisa reler o arquivo)
+_STORE_NAME = re.compile(r"^[0-9a-f]{64}$")
+
+# Intervalo mínimo entre duas varreduras de limpeza do cache (segundos)
+EVICTION_INTERVAL = 60
+
+# Miniaturas entregues há menos que isso (segundos) não são apagadas: a
+# página que recebeu a URL ainda pode estar carregando a imagem
+IN_USE_WINDOW = 600
+
+_last_eviction = 0.0
+_eviction_lock = threading.Lock()
+
+# Último uso de cada miniatura neste processo (time.time()); a ordem da
+# limpeza vem daqui, sem gravar no disco a cada célula exibida. Miniaturas
+# que o processo ainda não usou contam pelo mtime (hora em que foram geradas)
+_last_used = {}
+
+
+def _source_hash(source_path):
+    """Hash do sprite de origem: o nome do arquivo, se vier do store; senão, o conteúdo."""
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return stem if _STORE_NAME.match(stem) else file_hash(source_path)
+
+
+def thumbnail_path(digest, size, animated=False):
+    """Caminho da miniatura de um sprite (hash) em um tamanho."""
+    ext = "webp" if animated else "png"
+    suffix = "a" if animated else ""
+    return os.path.join(SPRITE_THUMB_DIR, digest[:2], f"{digest}_{size}{suffix}.{ext}")
+
+
+def _resize(frame, size):
+    """Reduz mantendo a proporção (nunca amplia: o navegador faz isso de graça)."""
+    frame = frame.convert("RGBA")
+    scale = min(1, size / max(frame.width, frame.height))
+    if scale == 1:
+        return frame
+    new_size = (max(1, round(frame.width * scale)), max(1, round(frame.height * scale)))
+    return frame.resize(new_size, Image.LANCZOS)
+
+
+def _render(source_path, target, size, animated):
+    """Gera a miniatura em disco (gravação atômica)."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.{threading.get_ident()}.tmp"
+
+    with Image.open(source_path) as img:
+        if animated and getattr(img, "n_frames", 1) > 1:
+            frames, durations = [], []
+            for frame in ImageSequence.Iterator(img):
+                frames.append(_resize(frame, size))
+                durations.append(frame.info.get("duration", img.info.get("duration", 100)))
+            frames[0].save(
+                tmp, format="WEBP", save_all=True, append_images=frames[1:],
+                duration=durations, loop=0, lossless=True, method=6,
+            )
+        elif animated:
+            _resize(img, size).save(tmp, format="WEBP", lossless=True, method=6)
+        else:
+            # Só o primeiro quadro: suficiente para células de tabela
+            img.seek(0)
+            _resize(img, size).save(tmp, format="PNG", optimize=True)
+
+    os.replace(tmp, target)
+
+
+def get_thumbnail(source_path, size, animated=False):
+    """
+    Retorna o caminho da miniatura de 'source_path' com 'size' pixels no maior
+    lado, gerando-a na primeira vez.
+    - animated=False: PNG só com o primeiro quadro.
+    - animated=True: WebP animado (todos os quadros, sem perdas). Se o
+      sprite já é menor que 'size', o próprio original é devolvido.
+    Retorna None se o sprite não puder ser lido.
+    """
+    try:
+        target = thumbnail_path(_source_hash(source_path), size, animated)
+        if os.path.exists(target):
+            # Marca como usada agora (a limpeza apaga as menos usadas)
+            _last_used[target] = time.time()
+            return target
+        if animated:
+            with Image.open(source_path) as img:
+                if max(img.size) <= size:
+                    return source_path
+        _render(source_path, target, size, animated)
+        _last_used[target] = time.time()
+    except OSError as e:
+        print(f"[DEBUG THUMB] Não foi possível gerar miniatura de {source_path}: {e}")
+        return None
+
+    maybe_evict_thumbnails()
+    return target
+
+
+def thumbnail_url(image_path, size, animated=False):
+    """
+    URL da miniatura do image_path salvo no banco. Se não for um arquivo local
+    (data URL, URL remota) ou a miniatura falhar, usa a imagem original.
+    """
+    if isinstance(image_path, str) and image_path and os.path.isfile(image_path):
+        thumb = get_thumbnail(image_path, size, animated)
+        if thumb:
+            return image_url(thumb)
+    return image_url(image_path)
+
+
+def generate_thumbnails(source_paths, sizes, animated=False, workers=8):
+    """Gera em paralelo as miniaturas de vários sprites em vários tamanhos."""
+    jobs = [(path, size) for path in source_paths for size in sizes]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda job: get_thumbnail(job[0], job[1], animated), jobs))
+    evict_thumbnails()
+    return sum(1 for r in results if r)
+
+
+def evict_thumbnails(max_bytes=SPRITE_THUMB_CACHE_MAX_BYTES):
+    """
+    Apaga as miniaturas usadas há mais tempo até o cache caber em max_bytes.
+    As entregues nos últimos IN_USE_WINDOW segundos ficam, mesmo que o
+    cache passe do limite: uma URL ainda em uso nunca vira 404 (e quem
+    pedir a miniatura de novo depois disso a recebe gerada outra vez).
+    Retorna quantos arquivos foram apagados.
+    """
+    entries = []
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(SPRITE_THUMB_DIR):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((max(stat.st_mtime, _last_used.get(path, 0)), stat.st_size, path))
+            total += stat.st_size
+
+    removed = 0
+    in_use_since = time.time() - IN_USE_WINDOW
+    for last_used, file_size, path in sorted(entries):
+        if total <= max_bytes or last_used >= in_use_since:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        _last_used.pop(path, None)
+        total -= file_size
+        removed += 1
+    return removed
+
+
+def maybe_evict_thumbnails():
+    """Roda evict_thumbnails no máximo uma vez a cada EVICTION_INTERVAL segundos."""
+    global _last_eviction
+    now = time.monotonic()
+    if now - _last_eviction < EVICTION_INTERVAL:
+        return
+    with _eviction_lock:
+        if now - _last_eviction < EVICTION_INTERVAL:
+            return
+        _last_eviction = now
+    evict_thumbnails()
@@ -95,4 +95,226 @@ def extract_vocations(data_dict, verbose=False):
     if not vocations and 'Shields' in str(data_dict.get('category', '')):
         vocations = ['sorcerers', 'druids', 'knights', 'paladins', 'monks']
     
-    return vocations 
\ No newline at end of file
+    return vocations
+
+
+# Lista de todas as vocações possíveis
+ALL_VOCATIONS = ['sorcerers', 'druids', 'knights', 'paladins', 'monks']
+
+
+def extract_vocations_from_data(data):
+    """
+    Extrai vocações de um dicionário de dados.
+    Retorna uma lista de vocações padronizadas ou lista vazia se não houver restrição.
+    """
+    vocations = []
+    
+    if not isinstance(data, dict):
+        return []
+        
+    # Verificar no caminho Requirements > Vocation
+    if "Requirements" in data and isinstance(data["Requirements"], dict) and "Vocation" in data["Requirements"]:
+        vocation_data = data["Requirements"]["Vocation"]
+        
+        # Pode ser uma string ou lista
+        if isinstance(vocation_data, str):
+            # Separar vocações por vírgula ou "and"
+            vocation_str = vocation_data.lower().replace(" and ", ", ")
+            # Separar por vírgula
+            vocation_list = [v.strip() for v in vocation_str.split(",") if v.strip()]
+            # Padronizar cada vocação
+            for voc in vocation_list:
+                # Normalizar vocações para formato plural
+                normalized_voc = normalize_vocation_to_plural(voc)
+                if normalized_voc:
+                    vocations.append(normalized_voc)
+        elif isinstance(vocation_data, list):
+            # Se for lista, processar cada item
+            for voc in vocation_data:
+                if isinstance(voc, str):
+                    normalized_voc = normalize_vocation_to_plural(voc.lower())
+                    if normalized_voc:
+                        vocations.append(normalized_voc)
+    
+    # Verificar também no campo Vocations (retrocompatibilidade)
+    if not vocations and "Vocations" in data:
+        vocations_data = data["Vocations"]
+        
+        if isinstance(vocations_data, str):
+            # Separar vocações por vírgula ou "and"
+            vocations_str = vocations_data.lower().replace(" and ", ", ")
+            # Separar por vírgula
+            vocations_list = [v.strip() for v in vocations_str.split(",") if v.strip()]
+            # Padronizar cada vocação
+            for voc in vocations_list:
+                normalized_voc = normalize_vocation_to_plural(voc)
+                if normalized_voc:
+                    vocations.append(normalized_voc)
+        elif isinstance(vocations_data, list):
+            # Se for lista, processar cada item
+            for voc in vocations_data:
+                if isinstance(voc, str):
+                    normalized_voc = normalize_vocation_to_plural(voc.lower())
+                    if normalized_voc:
+                        vocations.append(normalized_voc)
+    
+    # Verificar também no campo Vocation (retrocompatibilidade)
+    if not vocations and "Vocation" in data:
+        vocation_data = data["Vocation"]
+        
+        if isinstance(vocation_data, str):
+            # Separar vocações por vírgula ou "and"
+            vocation_str = vocation_data.lower().replace(" and ", ", ")
+            # Separar por vírgula
+            vocation_list = [v.strip() for v in vocation_str.split(",") if v.strip()]
+            # Padronizar cada vocação
+            for voc in vocation_list:
+                normalized_voc = normalize_vocation_to_plural(voc)
+                if normalized_voc:
+                    vocations.append(normalized_voc)
+        elif isinstance(vocation_data, list):
+            # Se for lista, processar cada item
+            for voc in vocation_data:
+                if isinstance(voc, str):
+                    normalized_voc = normalize_vocation_to_plural(voc.lower())
+                    if normalized_voc:
+                        vocations.append(normalized_voc)
+    
+    # Garantir que as vocações estão no formato esperado (lista de strings)
+    if not isinstance(vocations, list):
+        vocations = []
+    
+    # Filtrar vocações inválidas ou None
+    vocations = [voc for voc in vocations if isinstance(voc, str) and voc in ALL_VOCATIONS]
+    
+    # Retorna a lista de vocações (pode ser vazia se não houver restrições)
+    return sorted(list(set(vocations)))
+
+
+def normalize_vocation_to_plural(voc):
+    """Normaliza vocação para formato plural padrão."""
+    voc = voc.lower().strip()
+    
+    # Se já estiver no VOCATION_MAPPING, usamos diretamente
+    if voc in VOCATION_MAPPING:
+        return VOCATION_MAPPING[voc]
+    
+    # Verificações adicionais para casos específicos
+    if voc == "sorcerer":
+        return "sorcerers"
+    elif voc == "druid":
+        return "druids"
+    elif voc == "knight":
+        return "knights"
+    elif voc == "paladin":
+        return "paladins"
+    elif voc == "monk":
+        return "monks"
+    
+    # Se já for plural, retornar como está
+    if voc.endswith("s") and voc in ALL_VOCATIONS:
+        return voc
+    
+    # Se for singular mas não estiver nos casos acima, tentar adicionar 's'
+    voc_plural = voc + "s"
+    if voc_plural in ALL_VOCATIONS:
+        return voc_plural
+    
+    # Se chegou aqui, não conseguimos normalizar
+    return None
+
+
+# Categorias de arma que só uma vocação pode usar
+CATEGORY_VOCATIONS = {
+    'Quivers': ['paladins'],
+    'Throwing_Weapons': ['paladins'],
+    'Clubs': ['knights'],
+    'Axes': ['knights'],
+    'Swords': ['knights'],
+    'Rods': ['druids'],
+    'Wands': ['sorcerers'],
+    'Fist_Fighting_Weapons': ['monks'],
+}
+
+
+# Máscara de vocações: um bit por vocação (sorcerers=1, druids=2, knights=4,
+# paladins=8, monks=16). Item sem restrição tem todos os bits ligados
+# (ALL_VOCATIONS_MASK = 31); 0 só aparece antes da resolução (= "não declarado").
+VOCATION_BITS = {voc: 1 << i for i, voc in enumerate(ALL_VOCATIONS)}
+ALL_VOCATIONS_MASK = (1 << len(ALL_VOCATIONS)) - 1
+
+
+def vocations_to_mask(vocations):
+    """Converte uma lista de vocações (plural) em máscara. Lista vazia -> 0."""
+    mask = 0
+    for voc in vocations or []:
+        mask |= VOCATION_BITS.get(voc, 0)
+    return mask
+
+
+def mask_to_vocations(mask):
+    """Converte a máscara de volta em lista de vocações (ordem de ALL_VOCATIONS)."""
+    return [voc for voc in ALL_VOCATIONS if int(mask) & VOCATION_BITS[voc]]
+
+
+# Máscara padrão de cada categoria de arma exclusiva
+CATEGORY_VOCATION_MASKS = {
+    category: vocations_to_mask(vocations) for category, vocations in CATEGORY_VOCATIONS.items()
+}
+
+
+def item_vocation_mask(item_name, category, data_dict):
+    """
+    Máscara de vocações de um item: requisito declarado nos dados ou, sem
+    ele, o padrão da categoria; sem padrão, todas as vocações.
+    """
+    mask = vocations_to_mask(extract_vocations_from_data(data_dict))
+    if mask:
+        return mask
+    # Quivers nem sempre estão na categoria certa: o nome também conta
+    if isinstance(item_name, str) and 'quiver' in item_name.lower():
+        category = 'Quivers'
+    return CATEGORY_VOCATION_MASKS.get(category, ALL_VOCATIONS_MASK)
+
+
+def resolve_vocation_masks(masks, item_names, categories):
+    """
+    Versão vetorizada de item_vocation_mask: completa, de uma vez, as máscaras
+    dos itens sem requisito declarado (0) com o padrão da categoria ou com
+    ALL_VOCATIONS_MASK.
+
+    Args:
+        masks (pd.Series): máscaras extraídas dos dados (0 = não declarado)
+        item_names (pd.Series): nomes dos itens
+        categories (pd.Series): categorias dos itens
+
+    Returns:
+        pd.Series: máscaras resolvidas, uint8 (mesmo índice)
+    """
+    is_quiver = item_names.str.contains('quiver', case=False, na=False)
+    defaults = categories.mask(is_quiver, 'Quivers').map(CATEGORY_VOCATION_MASKS)
+    defaults = defaults.fillna(ALL_VOCATIONS_MASK)
+    masks = masks.fillna(0)
+    return masks.where(masks != 0, defaults).astype('uint8')
+
+
+def vocation_mask(masks, vocation):
+    """
+    Máscara booleana dos itens que a vocação pode usar: um AND bit a bit
+    sobre a coluna de máscaras.
+
+    Args:
+        masks (pd.Series): máscaras de vocações resolvidas
+        vocation (str): vocação selecionada (plural, ex.: 'knights')
+
+    Returns:
+        pd.Series: True para os itens permitidos (mesmo índice)
+    """
+    return (masks & VOCATION_BITS[vocation]) != 0
+
+
+def format_vocation_mask(mask):
+    """Texto das vocações de uma máscara ("Todas" quando não há restrição)."""
+    if int(mask) == ALL_VOCATIONS_MASK:
+        return "Todas"
+    return ", ".join(mask_to_vocations(mask))